@@ -23,14 +23,19 @@ from PyQt5.QtWidgets import QApplication
 from src.ui.icon_manager import MainWindow
 from src.common.utils.logging import config_log, logging
 from src.common.utils.file_manager import find_root_directory
+from src.utils.log_rotation import config_log_rotation, rotate_console_log, start_log_compaction
+from src.utils.queue_logging import config_queue_logging
+from src.utils.config_store import read_config
+from src.utils.structured_log import config_structured_log
 from version import PROGRAM_VERSION
+import multiprocessing
 import sys
 import os
 
 
 # To read an INI file
 from src import config
-config.read(os.path.join(find_root_directory(), 'config.ini'))
+read_config(config)
 
 def main():
     """
@@ -40,9 +45,11 @@ def main():
     occur during the execution of the program.
 
     Steps performed:
-    1. Configures logging with a filename based on the program version.
-    2. Logs the start of the script execution.
-    3. Configures console logging.
+    1. Configures logging with a filename based on the program version, adding the
+       JSON Lines sink if `structured_log` is enabled, rotating each log once it reaches
+       `log_max_size_mb`, and moves the log writes to a background thread fed by a bounded queue.
+    2. Logs the start of the script execution and compacts the logs of past months in the background.
+    3. Configures console logging, rotating the console log first if it is too large.
     4. Determines the mode of operation (User or Developer) based on the runtime environment.
     5. Logs and prints the program version and mode.
     6. Prints copyright information.
@@ -53,10 +60,15 @@ def main():
         Exception: If an error occurs during the execution of the application.
     """
     config_log("programa_reloj_de_asistencias_" + PROGRAM_VERSION)
+    config_structured_log("programa_reloj_de_asistencias_" + PROGRAM_VERSION, config)
+    config_log_rotation(config)
+    log_listener = config_queue_logging(config)
 
     logging.debug('Script ejecutandose...')
     # logging.debug(f'ADMIN: {is_user_admin()}')
+    start_log_compaction(config, log_listener.handlers if log_listener else None)
 
+    rotate_console_log(config)
     config_log_console()
         
     MODE = 'User' if getattr(sys, 'frozen', False) else 'Developer'
@@ -144,4 +156,6 @@ It comes without warranty. See <https://www.gnu.org/licenses/> for details."""
     logging.info(copyright_text)
 
 if __name__ == '__main__':
+    # Required by the process pool of DevicesScanner in the frozen executable
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,191 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+from array import array
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, Sequence
+from src.business_logic.cro_parser import format_line
+from src.business_logic.attendance_validator import DUPLICATE, MISSING_TIMESTAMP, MISSING_USER_ID, VALID, EPOCH, ONE_SECOND, classify, to_epoch_seconds
+
+class AttendanceBatch:
+    __slots__ = ("user_codes", "timestamps", "statuses", "punches", "user_ids", "user_id_codes")
+
+    def __init__(self):
+        """
+        Initializes an empty AttendanceBatch.
+
+        The batch stores a device download as parallel typed arrays instead of one
+        `Attendance` object per record, 24 bytes per record plus each distinct user ID once.
+
+        Attributes:
+            user_codes (array): The code of the user ID of each record, its index in `user_ids`,
+                or `MISSING_USER_ID` if it is missing or blank.
+            timestamps (array): The device local time of each record, in seconds since 1970-01-01,
+                or `MISSING_TIMESTAMP` if it is not a datetime.
+            statuses (array): The verification type of each record (fingerprint, face, card...).
+            punches (array): The punch type of each record (check in, check out...).
+            user_ids (list[str]): The distinct user IDs, as written (e.g. with their leading zeros).
+            user_id_codes (dict[str, int]): The code of each distinct user ID.
+        """
+        self.user_codes: array = array('q')
+        self.timestamps: array = array('q')
+        self.statuses: array = array('i')
+        self.punches: array = array('i')
+        self.user_ids: list[str] = []
+        self.user_id_codes: dict[str, int] = {}
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def append(self, user_id, timestamp, status: int = 0, punch: int = 0):
+        """
+        Adds a record to the batch. This is the method the connection layer uses to fill
+        the batch while it decodes a download.
+
+        Args:
+            user_id (str or int): The user ID as read from the device.
+            timestamp (datetime or int): The record time, as a datetime or as epoch seconds.
+            status (int, optional): The verification type. Defaults to 0.
+            punch (int, optional): The punch type. Defaults to 0.
+        """
+        key = str(user_id).strip() if user_id is not None else ""
+        if not key:
+            self.user_codes.append(MISSING_USER_ID)
+        else:
+            code = self.user_id_codes.get(key)
+            if code is None:
+                code = self.user_id_codes[key] = len(self.user_ids)
+                self.user_ids.append(key)
+            self.user_codes.append(code)
+        if type(timestamp) is datetime and timestamp.tzinfo is None:
+            self.timestamps.append((timestamp - EPOCH) // ONE_SECOND)
+        else:
+            self.timestamps.append(timestamp if isinstance(timestamp, int) else to_epoch_seconds(timestamp))
+        self.statuses.append(status or 0)
+        self.punches.append(punch or 0)
+
+    @classmethod
+    def from_attendances(cls, attendances: Iterable):
+        """
+        Builds a batch from `Attendance` objects.
+
+        Args:
+            attendances (Iterable[Attendance]): Objects with `user_id`, `timestamp`, `status` and `punch` attributes.
+
+        Returns:
+            (AttendanceBatch): The batch with one record per attendance.
+        """
+        batch = cls()
+        for attendance in attendances:
+            batch.append(
+                getattr(attendance, "user_id", None),
+                getattr(attendance, "timestamp", None),
+                getattr(attendance, "status", 0),
+                getattr(attendance, "punch", 0)
+            )
+        return batch
+
+    def user_id_at(self, index: int):
+        """
+        Returns the user ID of one record.
+
+        Args:
+            index (int): The record index.
+
+        Returns:
+            (str or None): The user ID as written, or None if it was missing.
+        """
+        code = self.user_codes[index]
+        return self.user_ids[code] if code != MISSING_USER_ID else None
+
+    def timestamp_at(self, index: int):
+        """
+        Returns the timestamp of one record as a datetime.
+
+        Args:
+            index (int): The record index.
+
+        Returns:
+            (datetime or None): The timestamp, or None if it was malformed.
+        """
+        timestamp = self.timestamps[index]
+        if timestamp == MISSING_TIMESTAMP:
+            return None
+        return EPOCH + timedelta(seconds=timestamp)
+
+    def validate(self, now: datetime = None):
+        """
+        Classifies every record of the batch (see `attendance_validator.classify`).
+
+        Args:
+            now (datetime, optional): The reference time. Defaults to `datetime.now()`.
+
+        Returns:
+            (array): The reason code of each record.
+        """
+        return classify(self.timestamps, self.user_codes, now)
+
+    def select(self, indexes: Sequence[int]):
+        """
+        Builds a new batch with the given records, copying only the column values.
+        The distinct user IDs are shared with this batch.
+
+        Args:
+            indexes (Sequence[int]): The indexes of the records to keep, in order.
+
+        Returns:
+            (AttendanceBatch): The new batch.
+        """
+        batch = AttendanceBatch()
+        batch.user_codes = array('q', (self.user_codes[index] for index in indexes))
+        batch.timestamps = array('q', (self.timestamps[index] for index in indexes))
+        batch.statuses = array('i', (self.statuses[index] for index in indexes))
+        batch.punches = array('i', (self.punches[index] for index in indexes))
+        batch.user_ids = self.user_ids
+        batch.user_id_codes = self.user_id_codes
+        return batch
+
+    def partition(self, now: datetime = None):
+        """
+        Separates the valid records from the records with errors. Records repeated within
+        the batch are in neither list, so they are written once and not reported.
+
+        Args:
+            now (datetime, optional): The reference time. Defaults to `datetime.now()`.
+
+        Returns:
+            (tuple[list[int], list[int]]): The indexes of the valid records and of the records with errors.
+        """
+        codes = self.validate(now)
+        valid_indexes = [index for index, code in enumerate(codes) if code == VALID]
+        error_indexes = [index for index, code in enumerate(codes) if code != VALID and code != DUPLICATE]
+        return valid_indexes, error_indexes
+
+    def iter_lines(self, indexes: Iterable[int] = None) -> Iterator[str]:
+        """
+        Encodes records as `.cro` lines, with their line break (see `cro_parser.format_line`).
+        The status and punch are written as the remaining fields.
+
+        Args:
+            indexes (Iterable[int], optional): The indexes of the records to encode, in order. Defaults to all.
+
+        Yields:
+            (str): The line of each record.
+        """
+        for index in range(len(self)) if indexes is None else indexes:
+            yield format_line(self.user_id_at(index), self.timestamps[index], f"{self.statuses[index]} {self.punches[index]}") + "\n"
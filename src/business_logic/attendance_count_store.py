@@ -0,0 +1,185 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import json
+import logging
+import os
+import threading
+import time
+from datetime import date, datetime, timedelta
+from src.common.utils.errors import BaseError
+from src.common.utils.file_manager import find_root_directory
+
+MAX_CHECKED_DAYS = 31  # Counts older than this are not checked against the files, only forgotten
+
+class AttendanceCountStore:
+    def __init__(self, file_path: str = None):
+        """
+        Initializes the AttendanceCountStore instance.
+
+        The store keeps, for each device IP, the number of records that were left on the
+        device after the last download, so the next run can compare it with the count the
+        device reports and skip the bulk transfer when nothing changed. Each count is kept
+        with the time it was recorded and the folder of the device in `devices/`, so it can
+        be invalidated when another process, such as the service, downloaded the device since
+        (see `forget_changed_elsewhere`).
+
+        Args:
+            file_path (str, optional): The JSON file where the counts are persisted.
+                Defaults to `attendance_counts.json` in the root directory.
+        """
+        self.file_path: str = file_path or os.path.join(find_root_directory(), 'attendance_counts.json')
+        self.lock = threading.Lock()
+        self.counts: dict[str, dict] = {}
+        self.load()
+
+    def load(self):
+        """
+        Loads the persisted counts. A missing or unreadable file is treated as empty,
+        which only means the next run downloads every device.
+        """
+        try:
+            with open(self.file_path, 'r', encoding='utf-8') as file:
+                self.counts = {}
+                for ip, entry in json.load(file).items():
+                    if isinstance(entry, dict):
+                        self.counts[ip] = {"count": int(entry["count"]), "time": float(entry.get("time", 0)),
+                                           "folder": entry.get("folder")}
+                    else:
+                        # Counts written by older versions have no time nor folder, so they cannot be checked
+                        self.counts[ip] = {"count": int(entry), "time": 0.0, "folder": None}
+        except FileNotFoundError:
+            self.counts = {}
+        except Exception as e:
+            logging.warning(f'No se pudo leer {self.file_path}: {e}')
+            self.counts = {}
+
+    def get(self, ip: str):
+        """
+        Returns the last persisted count of a device.
+
+        Args:
+            ip (str): The device IP.
+
+        Returns:
+            (int or None): The count, or None if the device was never downloaded.
+        """
+        with self.lock:
+            entry = self.counts.get(ip)
+            return entry["count"] if entry else None
+
+    def get_folder(self, ip: str):
+        """
+        Returns the folder of `devices/` where the attendances of a device were last written.
+
+        Args:
+            ip (str): The device IP.
+
+        Returns:
+            (str or None): The folder, or None if it is not known.
+        """
+        with self.lock:
+            entry = self.counts.get(ip)
+            return entry["folder"] if entry else None
+
+    def set(self, ip: str, count: int, folder: str = None):
+        """
+        Records the count left on a device, once its attendances were written. Call `save` to persist it.
+
+        Args:
+            ip (str): The device IP.
+            count (int): The number of records on the device after the download.
+            folder (str, optional): The folder of `devices/` where its attendances are written.
+                Defaults to the one already known.
+        """
+        with self.lock:
+            previous = self.counts.get(ip) or {}
+            self.counts[ip] = {"count": count, "time": time.time(), "folder": folder or previous.get("folder")}
+
+    def forget(self, ip: str):
+        """
+        Removes the count of a device, so the next run downloads it unconditionally.
+
+        Args:
+            ip (str): The device IP.
+        """
+        with self.lock:
+            self.counts.pop(ip, None)
+
+    def forget_changed_elsewhere(self, today: date = None):
+        """
+        Forgets the counts that may no longer match the devices: those whose device files were
+        written after the count was recorded, i.e. by another process such as the service, which
+        may also have cleared the device; and those that cannot be checked, because their folder
+        is not known or they are older than `MAX_CHECKED_DAYS`.
+
+        Args:
+            today (date, optional): The current date. Defaults to today.
+        """
+        today = today or date.today()
+        with self.lock:
+            entries = list(self.counts.items())
+        for ip, entry in entries:
+            if not self.is_unchanged_since(ip, entry, today):
+                logging.debug(f'{ip} - Cantidad de marcaciones desactualizada, se descargará de nuevo')
+                self.forget(ip)
+
+    @staticmethod
+    def is_unchanged_since(ip: str, entry: dict, today: date):
+        """
+        Checks that no file of a device was written after its count was recorded.
+
+        Args:
+            ip (str): The device IP.
+            entry (dict): The persisted entry of the device.
+            today (date): The current date.
+
+        Returns:
+            (bool): True if the count can be trusted, False otherwise.
+        """
+        folder = entry.get("folder")
+        if not folder or not entry.get("time"):
+            return False
+        recorded_day = datetime.fromtimestamp(entry["time"]).date()
+        if (today - recorded_day).days > MAX_CHECKED_DAYS:
+            return False
+        day = recorded_day
+        while day <= today:
+            try:
+                if os.path.getmtime(os.path.join(folder, f"{ip}_{day:%Y-%m-%d}_file.cro")) > entry["time"]:
+                    return False
+            except FileNotFoundError:
+                pass
+            except OSError:
+                return False
+            day += timedelta(days=1)
+        return True
+
+    def save(self):
+        """
+        Writes the counts atomically (temporary file plus rename).
+        """
+        try:
+            with self.lock:
+                counts = {ip: dict(entry) for ip, entry in self.counts.items()}
+            temp_path = self.file_path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8') as file:
+                json.dump(counts, file, indent=4)
+            os.replace(temp_path, self.file_path)
+        except Exception as e:
+            BaseError(3001, str(e))
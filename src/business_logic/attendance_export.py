@@ -0,0 +1,189 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import argparse
+import csv
+import json
+import logging
+import os
+import sys
+from datetime import date
+from typing import Iterable, Iterator, TextIO
+from src.business_logic.cro_parser import format_timestamp, iter_file_records
+from src.business_logic.devices_scanner import CroFileFilter, DevicesScanner
+from src.common.utils.errors import BaseError
+from src.common.utils.file_manager import find_root_directory
+
+EXPORT_FIELDS = ["district", "model", "point", "ip", "file_date", "user_id", "timestamp", "extra"]
+
+class AttendanceExporter:
+    def __init__(self, devices_path: str = None):
+        """
+        Initializes the AttendanceExporter instance.
+
+        Args:
+            devices_path (str, optional): The root of the `devices/{distrito}/{modelo}-{punto}/` tree.
+                Defaults to the `devices` folder of the root directory.
+        """
+        self.devices_path: str = devices_path or os.path.join(find_root_directory(), "devices")
+        self.skipped_lines: int = 0
+
+    def iter_files(self, start_date: date = None, end_date: date = None, districts: Iterable[str] = None, ips: Iterable[str] = None):
+        """
+        Yields the `.cro` files that match the filters, without opening them.
+
+        Districts are matched against the folder names and IPs and dates against the
+        `ip_YYYY-MM-DD_file.cro` file names, so folders and files outside the selection
+        are never read. Large trees are listed in parallel (see `DevicesScanner`).
+
+        Args:
+            start_date (date, optional): The first file date to include. Defaults to no lower bound.
+            end_date (date, optional): The last file date to include. Defaults to no upper bound.
+            districts (Iterable[str], optional): The districts to include (case insensitive). Defaults to all.
+            ips (Iterable[str], optional): The device IPs to include. Defaults to all.
+
+        Yields:
+            (tuple[str, str, str, str, str, str]): The district, model, point, IP, file date
+                (YYYY-MM-DD) and path of each matching file, sorted by district, device and date.
+        """
+        file_filter = CroFileFilter(
+            start_date=start_date.isoformat() if start_date else None,
+            end_date=end_date.isoformat() if end_date else None,
+            ips=ips
+        )
+
+        if not os.path.isdir(self.devices_path):
+            raise BaseError(3001, f"No se encontró la carpeta '{self.devices_path}'", level="warning")
+
+        # The device folders are listed across the scanner processes; only the matching paths come back
+        files = []
+        for file_path, _ in DevicesScanner(self.devices_path).scan(None, file_filter, districts):
+            device_path, file_name = os.path.split(file_path)
+            district_path, device_folder = os.path.split(device_path)
+            files.append((os.path.basename(district_path), device_folder, file_name, file_path))
+
+        for district, device_folder, file_name, file_path in sorted(files):
+            model, _, point = device_folder.partition("-")
+            ip, file_date = file_filter.match(file_name)
+            yield district, model, point, ip, file_date, file_path
+
+    def iter_records(self, start_date: date = None, end_date: date = None, districts: Iterable[str] = None, ips: Iterable[str] = None):
+        """
+        Yields the attendances stored in the matching `.cro` files one at a time.
+
+        Each file is decoded in chunks of lines (see `cro_parser.iter_file_records`) and its records are
+        yielded one at a time, so memory does not depend on the size of the files or of the export.
+        Malformed lines are skipped and counted in `skipped_lines`.
+
+        Args:
+            start_date (date, optional): The first file date to include. Defaults to no lower bound.
+            end_date (date, optional): The last file date to include. Defaults to no upper bound.
+            districts (Iterable[str], optional): The districts to include. Defaults to all.
+            ips (Iterable[str], optional): The device IPs to include. Defaults to all.
+
+        Yields:
+            (dict[str, str]): A record with the keys listed in `EXPORT_FIELDS`.
+        """
+        self.skipped_lines = 0
+        for district, model, point, ip, file_date, file_path in self.iter_files(start_date, end_date, districts, ips):
+            for records in iter_file_records(file_path):
+                self.skipped_lines += len(records.malformed)
+                for user_id, timestamp, extra in zip(records.user_ids, records.timestamps, records.extras):
+                    yield {
+                        "district": district,
+                        "model": model,
+                        "point": point,
+                        "ip": ip,
+                        "file_date": file_date,
+                        "user_id": user_id,
+                        "timestamp": format_timestamp(timestamp),
+                        "extra": extra
+                    }
+
+    def export(self, output: TextIO, output_format: str = "csv", **filters):
+        """
+        Streams the matching attendances into a CSV or JSON Lines output.
+
+        Args:
+            output (TextIO): The text stream to write to.
+            output_format (str, optional): Either "csv" or "jsonl". Defaults to "csv".
+            **filters: The filters accepted by `iter_records`.
+
+        Returns:
+            (int): The number of exported attendances.
+
+        Raises:
+            ValueError: If the output format is not supported.
+        """
+        records: Iterator[dict[str, str]] = self.iter_records(**filters)
+        exported = 0
+        if output_format == "csv":
+            writer = csv.DictWriter(output, fieldnames=EXPORT_FIELDS)
+            writer.writeheader()
+            for record in records:
+                writer.writerow(record)
+                exported += 1
+        elif output_format == "jsonl":
+            for record in records:
+                output.write(json.dumps(record, ensure_ascii=False) + "\n")
+                exported += 1
+        else:
+            raise ValueError(f"Formato de exportación no soportado: {output_format}")
+
+        if self.skipped_lines:
+            logging.warning(f"Se omitieron {self.skipped_lines} líneas con formato incorrecto durante la exportación")
+        logging.info(f"Se exportaron {exported} marcaciones")
+        return exported
+
+def parse_args(argv: list[str] = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m src.business_logic.attendance_export",
+        description="Exporta las marcaciones de devices/ a CSV o JSON Lines."
+    )
+    parser.add_argument("--desde", dest="start_date", type=date.fromisoformat, help="Primera fecha de archivo (YYYY-MM-DD)")
+    parser.add_argument("--hasta", dest="end_date", type=date.fromisoformat, help="Última fecha de archivo (YYYY-MM-DD)")
+    parser.add_argument("--distrito", dest="districts", action="append", help="Distrito a incluir (se puede repetir)")
+    parser.add_argument("--ip", dest="ips", action="append", help="IP del dispositivo a incluir (se puede repetir)")
+    parser.add_argument("--formato", dest="output_format", choices=["csv", "jsonl"], default="csv")
+    parser.add_argument("--salida", dest="output", help="Archivo de salida (por defecto, la salida estándar)")
+    parser.add_argument("--devices", dest="devices_path", help="Carpeta devices/ (por defecto, la del directorio raíz)")
+    return parser.parse_args(argv)
+
+def main(argv: list[str] = None):
+    """
+    Command line entry point of the attendance export.
+
+    Args:
+        argv (list[str], optional): The command line arguments. Defaults to `sys.argv[1:]`.
+    """
+    args = parse_args(argv)
+    exporter = AttendanceExporter(args.devices_path)
+    filters = {
+        "start_date": args.start_date,
+        "end_date": args.end_date,
+        "districts": args.districts,
+        "ips": args.ips
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as output:
+            exporter.export(output, args.output_format, **filters)
+    else:
+        exporter.export(sys.stdout, args.output_format, **filters)
+
+if __name__ == "__main__":
+    main()
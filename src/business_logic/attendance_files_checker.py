@@ -0,0 +1,142 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import functools
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Callable
+from src.business_logic.attendance_scan_index import AttendanceScanIndex, read_new_lines
+from src.business_logic.attendance_validator import FUTURE, OUT_OF_RANGE, classify, encode_user_ids
+from src.business_logic.cro_parser import parse_file_name, parse_lines
+from src.business_logic.devices_scanner import CroFileFilter, DevicesScanner
+from src.business_logic.reported_errors_store import ReportedErrorsStore, device_file_identity, format_file_uri, remove_legacy_reported_files
+from src.common.utils.errors import BaseError
+from src.common.utils.file_manager import find_root_directory
+
+class AttendanceFilesChecker:
+    def check_attendance_files(self, emit_progress: Callable = None, emit_device_results: Callable = None,
+                               cancel_event: threading.Event = None):
+        """
+        Checks today's attendance files in the "devices" directory for attendances older than
+        three months or in the future, e.g. written by the service or by older versions.
+        Each already reported incorrect check‑in is kept in a `ReportedErrorsStore`,
+        so that new ones are only reported once, even on later days. For reporting, information is grouped by file,
+        displaying each error only once (by file_path).
+        Only the lines appended to each file since the previous check are read (see `AttendanceScanIndex`).
+
+        This method does not touch the UI, so it runs in a worker thread (see `OperationThread`).
+
+        Args:
+            emit_progress (Callable, optional): A callable function to emit progress updates,
+                once per group of device folders (see `DevicesScanner.scan`). Defaults to None.
+            emit_device_results (Callable, optional): Not used; accepted so the check runs in an `OperationThread`.
+            cancel_event (threading.Event, optional): An event that stops the check when set.
+                The files already checked are still reported. Defaults to None.
+
+        Returns:
+            (dict): A dictionary with the keys:
+
+                - "devices_with_error" (list[dict[str, str]]): One entry per file with new errors,
+                  with its "ip", "date" and "file_path" (as a file URI).
+                - "cancelled" (bool): Whether the check was cancelled before checking every folder.
+
+        Raises:
+            BaseError: if the 'devices' folder is not found.
+        """
+        cancel_event = cancel_event or threading.Event()
+        today_str = datetime.now().strftime("%Y-%m-%d")
+        devices_path = os.path.join(find_root_directory(), "devices")
+        remove_legacy_reported_files()
+
+        # Errors already reported, on this or previous days
+        reported_errors = ReportedErrorsStore()
+
+        new_reported = 0                # Number of newly found errors
+        files_with_new_errors = {}      # Grouped by file: key = file.path, value = info for report
+        scan_index = AttendanceScanIndex()
+        scanned_files = []              # Today's files, the only ones kept in the scan index
+
+        if not os.path.isdir(devices_path):
+            raise BaseError(3000, "No se encontró la carpeta 'devices'", level="warning")
+
+        # The files are read and validated in parallel by the scanner processes
+        file_task = functools.partial(find_incorrect_lines, scan_entries=scan_index.snapshot(), now=datetime.now())
+        scanner = DevicesScanner(devices_path)
+        for file_path, (entry, incorrect_lines) in scanner.scan(file_task, CroFileFilter(start_date=today_str, end_date=today_str),
+                                                               cancel_event=cancel_event, emit_progress=emit_progress):
+            scanned_files.append(file_path)
+            scan_index.update(file_path, entry)
+            file_has_new_error = False  # Flag for new errors in this file
+            device_file = device_file_identity(devices_path, file_path)
+            for line in incorrect_lines:
+                # Create a unique identifier for this error line
+                error_id = ReportedErrorsStore.make_key(device_file, line)
+                if error_id in reported_errors:
+                    continue  # This error was already reported
+
+                # New error found
+                reported_errors.add(error_id)
+                new_reported += 1
+                file_has_new_error = True
+
+            if file_has_new_error and file_path not in files_with_new_errors:
+                # Add one entry per file
+                ip, file_date = parse_file_name(os.path.basename(file_path))
+                files_with_new_errors[file_path] = {
+                    "ip": ip,
+                    "date": file_date,
+                    "file_path": format_file_uri(file_path)
+                }
+
+        cancelled = cancel_event.is_set()
+        if cancelled:
+            logging.info("Se canceló la verificación de los archivos de marcaciones")
+
+        # A cancelled check keeps the entries of the folders it did not reach
+        scan_index.save(keep=None if cancelled else scanned_files)
+
+        # Persist the newly found errors
+        if new_reported:
+            reported_errors.save()
+
+        return {
+            "devices_with_error": list(files_with_new_errors.values()),
+            "cancelled": cancelled
+        }
+
+def find_incorrect_lines(file_path: str, scan_entries: dict[str, dict[str, int]], now: datetime):
+    """
+    Finds the lines of a `.cro` file, appended since its last scan, whose attendance is
+    older than three months or in the future. This is the task each scanning process runs
+    (see `DevicesScanner.scan`).
+
+    Args:
+        file_path (str): The `.cro` file to check.
+        scan_entries (dict[str, dict[str, int]]): The scan index entries by file path.
+        now (datetime): The reference time, the same for every file of a check.
+
+    Returns:
+        (tuple[dict[str, int], list[str]]): The updated scan index entry of the file and its incorrect lines.
+    """
+    lines, entry = read_new_lines(file_path, scan_entries.get(file_path))
+    # Check every new line at once, without one Attendance object per line
+    records = parse_lines(lines)
+    codes = classify(records.timestamps, encode_user_ids(records.user_ids), now)
+    return entry, [lines[index] for index, code in zip(records.line_indexes, codes) if code in (OUT_OF_RANGE, FUTURE)]
@@ -0,0 +1,159 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Iterable
+from src.common.utils.errors import BaseError
+
+class AttendanceScanIndex:
+    def __init__(self, file_path: str = None):
+        """
+        Initializes the AttendanceScanIndex instance.
+
+        The index remembers, for each scanned `.cro` file, its size, modification time and
+        the byte offset up to which it was already read, so each check only reads the bytes
+        appended since the previous one.
+
+        Args:
+            file_path (str, optional): The JSON file where the index is persisted.
+                Defaults to `attendance_scan_index.json` in the temporary directory.
+        """
+        self.file_path: str = file_path or os.path.join(tempfile.gettempdir(), "attendance_scan_index.json")
+        self.lock = threading.Lock()
+        self.entries: dict[str, dict[str, int]] = {}
+        self.load()
+
+    def load(self):
+        """
+        Loads the persisted index. A missing or unreadable index only means the files
+        are read again from the beginning.
+        """
+        try:
+            with open(self.file_path, "r", encoding="utf-8") as file:
+                self.entries = json.load(file)
+        except FileNotFoundError:
+            self.entries = {}
+        except Exception as e:
+            logging.warning(f"No se pudo leer el índice de marcaciones {self.file_path}: {e}")
+            self.entries = {}
+
+    def read_new_lines(self, file_path: str):
+        """
+        Reads the complete lines appended to a file since it was last scanned
+        and records the new offset (see `read_new_lines`).
+
+        Args:
+            file_path (str): The `.cro` file to read.
+
+        Returns:
+            (list[str]): The new lines, without line breaks.
+        """
+        lines, entry = read_new_lines(file_path, self.get(file_path))
+        self.update(file_path, entry)
+        return lines
+
+    def get(self, file_path: str):
+        """
+        Returns the entry of a file.
+
+        Args:
+            file_path (str): The path of the file.
+
+        Returns:
+            (dict[str, int] or None): The size, modification time and offset of the file, or None if it was never scanned.
+        """
+        with self.lock:
+            return self.entries.get(file_path)
+
+    def snapshot(self):
+        """
+        Returns a copy of every entry, e.g. to send it to the scanning processes.
+
+        Returns:
+            (dict[str, dict[str, int]]): The entries by file path.
+        """
+        with self.lock:
+            return dict(self.entries)
+
+    def update(self, file_path: str, entry: dict[str, int]):
+        """
+        Records the entry of a scanned file.
+
+        Args:
+            file_path (str): The path of the file.
+            entry (dict[str, int]): The size, modification time and offset of the file.
+        """
+        with self.lock:
+            self.entries[file_path] = entry
+
+    def save(self, keep: Iterable[str] = None):
+        """
+        Writes the index atomically (temporary file plus rename).
+
+        Args:
+            keep (Iterable[str], optional): The files to keep in the index; entries of other
+                files (e.g. previous days) are dropped. Defaults to keeping every entry.
+        """
+        try:
+            with self.lock:
+                if keep is not None:
+                    keep = set(keep)
+                    self.entries = {path: entry for path, entry in self.entries.items() if path in keep}
+                entries = dict(self.entries)
+            temp_path = self.file_path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(entries, file)
+            os.replace(temp_path, self.file_path)
+        except Exception as e:
+            BaseError(3001, str(e))
+
+def read_new_lines(file_path: str, entry: dict[str, int] = None):
+    """
+    Reads the complete lines appended to a file after the offset of its index entry.
+
+    A trailing line without a line break is left for the next scan, since the file may
+    still be being written. If the file shrank, it was replaced and is read again from
+    the beginning. If its size and modification time did not change, it is not opened.
+
+    Args:
+        file_path (str): The `.cro` file to read.
+        entry (dict[str, int], optional): The entry of the previous scan. Defaults to reading the whole file.
+
+    Returns:
+        (tuple[list[str], dict[str, int]]): The new lines, without line breaks, and the updated entry.
+    """
+    stat = os.stat(file_path)
+    if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+        return [], entry
+
+    offset = entry["offset"] if entry and entry["offset"] <= stat.st_size else 0
+    with open(file_path, "rb") as file:
+        file.seek(offset)
+        data = file.read(stat.st_size - offset)
+
+    end = data.rfind(b"\n") + 1
+    new_entry = {
+        "size": offset + len(data),
+        "mtime_ns": stat.st_mtime_ns,
+        "offset": offset + end
+    }
+    return data[:end].decode("utf-8", errors="replace").splitlines(), new_entry
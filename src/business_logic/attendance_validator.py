@@ -0,0 +1,295 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import time
+from array import array
+from datetime import datetime, timedelta
+from typing import Iterable, Sequence
+from dateutil.relativedelta import relativedelta
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Reason codes, in order of precedence when a record has more than one problem
+VALID = 0
+MALFORMED = 1
+OUT_OF_RANGE = 2
+FUTURE = 3
+DUPLICATE = 4
+REASONS = {
+    MALFORMED: "malformed",
+    OUT_OF_RANGE: "out of range",
+    FUTURE: "future",
+    DUPLICATE: "duplicate"
+}
+
+# Sentinels used when a field cannot be converted
+MISSING_TIMESTAMP = -(2 ** 63)
+MISSING_USER_ID = -1
+
+EPOCH = datetime(1970, 1, 1)
+ONE_SECOND = timedelta(seconds=1)
+
+def to_epoch_seconds(timestamp: datetime):
+    """
+    Converts a naive datetime (device local time) to seconds since 1970-01-01,
+    without applying any time zone.
+
+    Args:
+        timestamp (datetime): The timestamp to convert.
+
+    Returns:
+        (int): The seconds since the epoch, or `MISSING_TIMESTAMP` if the value is not a datetime.
+    """
+    if not isinstance(timestamp, datetime):
+        return MISSING_TIMESTAMP
+    return (timestamp.replace(tzinfo=None) - EPOCH) // ONE_SECOND
+
+def encode_user_ids(user_ids: Iterable):
+    """
+    Numbers the distinct user IDs of a download in order of appearance, so they can be compared as integers.
+
+    User IDs are compared as written: alphanumeric IDs are valid and `0123` and `123` are different users.
+
+    Args:
+        user_ids (Iterable[str or int]): The user IDs as read from the device.
+
+    Returns:
+        (array): The code of each user ID, or `MISSING_USER_ID` if it is missing or blank.
+    """
+    codes: dict[str, int] = {}
+    column = array('q')
+    for user_id in user_ids:
+        key = str(user_id).strip() if user_id is not None else ""
+        column.append(codes.setdefault(key, len(codes)) if key else MISSING_USER_ID)
+    return column
+
+def columns_from_attendances(attendances: Iterable):
+    """
+    Builds the timestamp and user ID columns of a download made of `Attendance` objects.
+
+    Args:
+        attendances (Iterable[Attendance]): The attendances, with `timestamp` and `user_id` attributes.
+
+    Returns:
+        (tuple[array, array]): The epoch seconds and the user ID codes (see `encode_user_ids`), as typed arrays.
+    """
+    timestamps = array('q')
+    user_ids = []
+    append_timestamp, append_user_id = timestamps.append, user_ids.append
+    for attendance in attendances:
+        timestamp = getattr(attendance, 'timestamp', None)
+        # Naive datetimes, as the devices report them, take the fast path
+        if type(timestamp) is datetime and timestamp.tzinfo is None:
+            append_timestamp((timestamp - EPOCH) // ONE_SECOND)
+        else:
+            append_timestamp(to_epoch_seconds(timestamp))
+        append_user_id(getattr(attendance, 'user_id', None))
+    return timestamps, encode_user_ids(user_ids)
+
+def validity_window(now: datetime = None):
+    """
+    Computes the range of accepted timestamps: no older than three months and not in the future.
+
+    Args:
+        now (datetime, optional): The reference time. Defaults to `datetime.now()`.
+
+    Returns:
+        (tuple[int, int]): The oldest and newest accepted epoch seconds.
+    """
+    now = now or datetime.now()
+    return to_epoch_seconds(now - relativedelta(months=3)), to_epoch_seconds(now)
+
+def classify(timestamps: Sequence[int], user_ids: Sequence[int], now: datetime = None, use_numpy: bool = True):
+    """
+    Classifies every record of a device download in a single pass.
+
+    A record is malformed when its timestamp or user ID could not be converted, out of
+    range when it is older than three months, future when it is later than `now` and
+    duplicate when the same user and timestamp already appeared earlier in the download.
+    Only the first reason, in that order, is reported for each record.
+
+    Args:
+        timestamps (Sequence[int]): The epoch seconds of each record (see `to_epoch_seconds`).
+        user_ids (Sequence[int]): The user ID code of each record (see `encode_user_ids`).
+        now (datetime, optional): The reference time. Defaults to `datetime.now()`.
+        use_numpy (bool, optional): Whether to use NumPy when it is installed. Defaults to True.
+
+    Returns:
+        (array): The reason code of each record (`VALID`, `MALFORMED`, `OUT_OF_RANGE`, `FUTURE` or `DUPLICATE`).
+
+    Raises:
+        ValueError: If both columns do not have the same length.
+    """
+    if len(timestamps) != len(user_ids):
+        raise ValueError("Las columnas de marcaciones no tienen la misma longitud")
+    oldest, newest = validity_window(now)
+    if use_numpy and np is not None:
+        return array('B', _classify_numpy(timestamps, user_ids, oldest, newest).tobytes())
+    return _classify_pure(timestamps, user_ids, oldest, newest)
+
+def _classify_numpy(timestamps, user_ids, oldest: int, newest: int):
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    user_ids = np.asarray(user_ids, dtype=np.int64)
+    malformed = (timestamps == MISSING_TIMESTAMP) | (user_ids == MISSING_USER_ID)
+
+    # A stable sort keeps the first occurrence of each (user, timestamp) pair first
+    order = np.lexsort((timestamps, user_ids))
+    sorted_timestamps = timestamps[order]
+    sorted_user_ids = user_ids[order]
+    repeated = np.zeros(len(order), dtype=bool)
+    repeated[1:] = (sorted_timestamps[1:] == sorted_timestamps[:-1]) & (sorted_user_ids[1:] == sorted_user_ids[:-1])
+    duplicate = np.empty_like(repeated)
+    duplicate[order] = repeated
+
+    codes = np.zeros(len(timestamps), dtype=np.uint8)
+    # Assign from the lowest to the highest precedence so the highest one wins
+    codes[duplicate] = DUPLICATE
+    codes[timestamps > newest] = FUTURE
+    codes[timestamps < oldest] = OUT_OF_RANGE
+    codes[malformed] = MALFORMED
+    return codes
+
+def _classify_pure(timestamps, user_ids, oldest: int, newest: int):
+    codes = array('B', bytes(len(timestamps)))
+    seen = set()
+    for index, (timestamp, user_id) in enumerate(zip(timestamps, user_ids)):
+        if timestamp == MISSING_TIMESTAMP or user_id == MISSING_USER_ID:
+            codes[index] = MALFORMED
+            continue
+        key = (user_id, timestamp)
+        if timestamp < oldest:
+            codes[index] = OUT_OF_RANGE
+        elif timestamp > newest:
+            codes[index] = FUTURE
+        elif key in seen:
+            codes[index] = DUPLICATE
+        seen.add(key)
+    return codes
+
+def partition(codes: Sequence[int]):
+    """
+    Splits the result of `classify` into valid records and records with errors.
+
+    Args:
+        codes (Sequence[int]): The reason code of each record.
+
+    Returns:
+        (tuple[list[int], dict[int, str]]): The indexes of the valid records and the reason
+            of each record with errors, by index.
+    """
+    valid_indexes = []
+    errors = {}
+    for index, code in enumerate(codes):
+        if code == VALID:
+            valid_indexes.append(index)
+        else:
+            errors[index] = REASONS[code]
+    return valid_indexes, errors
+
+def benchmark(records: int = 100_000, repeat: int = 5):
+    """
+    Compares the per-object checks with the batch validator on a synthetic download.
+
+    The download has 1% malformed, 1% out of range, 1% future and 1% duplicate records.
+    The baseline mimics the current flow: one object per record whose age and future checks
+    each compute their own reference time. The validator is timed from the same objects,
+    including the conversion to columns (see `columns_from_attendances`), and must split
+    them into the same valid and error records.
+
+    Args:
+        records (int, optional): The number of records. Defaults to 100000.
+        repeat (int, optional): The number of runs; the best one is reported. Defaults to 5.
+
+    Returns:
+        (dict[str, float]): The best time in seconds of each implementation.
+    """
+    import random
+    now = datetime.now().replace(microsecond=0)
+    rng = random.Random(0)
+
+    class PerObjectAttendance:
+        __slots__ = ("user_id", "timestamp")
+
+        def __init__(self, user_id, timestamp):
+            self.user_id = user_id
+            self.timestamp = timestamp
+
+        def is_three_months_old(self):
+            return self.timestamp < datetime.now() - relativedelta(months=3)
+
+        def is_in_the_future(self):
+            return self.timestamp > datetime.now()
+
+    download = []
+    for index in range(records):
+        kind = index % 100
+        if kind == 3 and index > 0:
+            previous = download[-1]
+            download.append(PerObjectAttendance(previous.user_id, previous.timestamp))
+            continue
+        if kind == 0:
+            timestamp = None
+        elif kind == 1:
+            timestamp = now - timedelta(days=200)
+        elif kind == 2:
+            timestamp = now + timedelta(days=1)
+        else:
+            timestamp = now - timedelta(seconds=rng.randrange(60 * 86400))
+        download.append(PerObjectAttendance(str(rng.randrange(5000)), timestamp))
+
+    def per_object():
+        valid, with_error, seen = [], [], set()
+        for index, attendance in enumerate(download):
+            key = (attendance.user_id, attendance.timestamp)
+            if attendance.timestamp is None or attendance.is_three_months_old() or attendance.is_in_the_future() or key in seen:
+                with_error.append(index)
+            else:
+                valid.append(index)
+            seen.add(key)
+        return valid, with_error
+
+    def batch(use_numpy: bool):
+        timestamps, user_ids = columns_from_attendances(download)
+        valid, errors = partition(classify(timestamps, user_ids, now, use_numpy=use_numpy))
+        return valid, sorted(errors)
+
+    implementations = {
+        "per-object": per_object,
+        "pure": lambda: batch(False)
+    }
+    if np is not None:
+        implementations["numpy"] = lambda: batch(True)
+
+    results = {}
+    for name, implementation in implementations.items():
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            implementation()
+            best = min(best, time.perf_counter() - start)
+        results[name] = best
+    for name, implementation in implementations.items():
+        assert implementation() == per_object(), f"{name} no separa las marcaciones igual que la validación por objeto"
+    return results
+
+if __name__ == "__main__":
+    for name, seconds in benchmark().items():
+        print(f"{name:>10}: {seconds * 1000:8.2f} ms")
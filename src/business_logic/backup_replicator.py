@@ -0,0 +1,324 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import errno
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sys
+import time
+from datetime import datetime
+from src.business_logic.cro_parser import parse_file_name
+from src.common.utils.errors import BaseError
+from src.common.utils.file_manager import find_root_directory
+from src.utils.threads import native_threading, start_native_thread
+
+MANIFEST_FILE_NAME = ".replication_manifest.json"
+VERIFIED_FILE_NAME = ".replication_verified"  # Its modification time is that of the last full verification
+VERIFY_INTERVAL = 7 * 24 * 3600  # Seconds between full verifications of the backup
+HASH_CHUNK_SIZE = 1024 * 1024
+FICLONE = 0x40049409  # Linux ioctl for copy-on-write clones (btrfs, xfs, ...)
+
+class BackupReplicator:
+    _lock = native_threading.Lock()
+    _running: bool = False
+    _pending: bool = False
+
+    def __init__(self, source_dir: str, backup_dir: str, use_hardlinks: bool = False):
+        """
+        Initializes the BackupReplicator instance.
+
+        Args:
+            source_dir (str): The directory whose files are mirrored (usually `devices/`).
+            backup_dir (str): The directory where the mirror is kept.
+            use_hardlinks (bool, optional): Whether to hardlink the attendance files of past days
+                instead of copying them. Hardlinked copies share their content with the source, so
+                only those files, which are no longer appended, are linked (see `is_appended`). Defaults to False.
+        """
+        self.source_dir: str = source_dir
+        self.backup_dir: str = backup_dir
+        self.use_hardlinks: bool = use_hardlinks
+        self.manifest_path: str = os.path.join(backup_dir, MANIFEST_FILE_NAME)
+        self.verified_path: str = os.path.join(backup_dir, VERIFIED_FILE_NAME)
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Builds a replicator for the `devices/` folder using the settings in `config.ini`.
+
+        Args:
+            config (ConfigParser): The already read configuration.
+
+        Returns:
+            (BackupReplicator): The configured replicator.
+        """
+        default_backup_dir = os.path.join(os.environ.get('PROGRAMDATA', find_root_directory()), 'Programa Reloj de Asistencias', 'Backup')
+        backup_dir = config.get('Program_config', 'backup_directory', fallback=default_backup_dir)
+        use_hardlinks = config.getboolean('Program_config', 'backup_use_hardlinks', fallback=False)
+        return cls(
+            os.path.join(find_root_directory(), 'devices'),
+            os.path.join(backup_dir, 'devices'),
+            use_hardlinks=use_hardlinks
+        )
+
+    def replicate_in_background(self):
+        """
+        Runs `replicate` in a background OS thread.
+
+        Only one replication runs at a time. If a replication is requested while another
+        one is running, a single extra pass is scheduled once the current one finishes,
+        so files written in the meantime are not missed.
+        """
+        with BackupReplicator._lock:
+            if BackupReplicator._running:
+                BackupReplicator._pending = True
+                return
+            BackupReplicator._running = True
+        start_native_thread(self.__run_pending_replications, name='backup_replicator')
+
+    def __run_pending_replications(self):
+        while True:
+            try:
+                self.replicate(verify_all=self.needs_full_verification())
+            except Exception as e:
+                BaseError(3001, f'Error replicando la copia de seguridad: {str(e)}')
+            with BackupReplicator._lock:
+                if not BackupReplicator._pending:
+                    BackupReplicator._running = False
+                    return
+                BackupReplicator._pending = False
+
+    def replicate(self, verify_all: bool = False):
+        """
+        Mirrors every changed file of the source directory into the backup directory.
+
+        A file is considered unchanged when its size and modification time match the manifest,
+        in which case it is not read at all. Otherwise its SHA-256 is computed and compared with
+        the hash recorded in the manifest, or with that of the backup file; only files whose backup
+        does not hold the same content are copied.
+        Every copied file is hashed again to verify it.
+
+        This is the only writer of the backup: the download writes each attendance file once,
+        under the source directory. The attendance files of the current day change between runs,
+        so their size or modification time differ from the manifest and they are copied again
+        after each run. A file appended while it is copied fails the verification and is copied
+        on the next run.
+
+        Args:
+            verify_all (bool, optional): Whether to also re-hash every backup file, not only the
+                copied ones, and repair the ones that differ, as done every `VERIFY_INTERVAL` seconds
+                (see `needs_full_verification`). Defaults to False.
+
+        Returns:
+            (int): The number of files copied.
+        """
+        if not os.path.isdir(self.source_dir):
+            return 0
+
+        manifest: dict[str, dict] = self.load_manifest()
+        copied_files: int = 0
+        today: str = datetime.now().strftime("%Y-%m-%d")
+
+        for relative_path in self.__walk_source():
+            source_path = os.path.join(self.source_dir, relative_path)
+            backup_path = os.path.join(self.backup_dir, relative_path)
+            try:
+                stat = os.stat(source_path)
+                entry = manifest.get(relative_path)
+                backup_is_present = os.path.isfile(backup_path) and os.path.getsize(backup_path) == stat.st_size
+
+                if entry and backup_is_present and entry['size'] == stat.st_size and entry['mtime_ns'] == stat.st_mtime_ns:
+                    if not verify_all or self.hash_file(backup_path) == entry['sha256']:
+                        continue
+                    logging.warning(f'Copia de seguridad corrupta, se vuelve a copiar: {backup_path}')
+                    backup_is_present = False
+
+                digest = self.hash_file(source_path)
+                # The backup may already hold the content, e.g. copied before the manifest was lost
+                backup_matches = backup_is_present and (
+                    (entry and entry['sha256'] == digest) or self.hash_file(backup_path) == digest
+                )
+                if not backup_matches:
+                    # The attendance files of past days are no longer appended, so they may be hardlinked
+                    self.copy_verified(source_path, backup_path, digest, link=self.is_appended(relative_path, today) is False)
+                    copied_files += 1
+
+                manifest[relative_path] = {
+                    'size': stat.st_size,
+                    'mtime_ns': stat.st_mtime_ns,
+                    'sha256': digest
+                }
+            except Exception as e:
+                BaseError(3001, f'Error replicando {source_path}: {str(e)}')
+
+        self.save_manifest(manifest)
+        if verify_all:
+            self.mark_verified()
+        logging.debug(f'Copia de seguridad actualizada: {copied_files} archivos copiados')
+        return copied_files
+
+    @staticmethod
+    def is_appended(relative_path: str, today: str):
+        """
+        Checks whether an attendance file may still be appended: those of the current day
+        (or later, if the clock was moved back).
+
+        Args:
+            relative_path (str): The path of the file, relative to the source directory.
+            today (str): The current date (YYYY-MM-DD).
+
+        Returns:
+            (bool or None): Whether the attendance file may still be appended, or None if it is not an attendance file.
+        """
+        parsed = parse_file_name(os.path.basename(relative_path))
+        return parsed[1] >= today if parsed else None
+
+    def needs_full_verification(self):
+        """
+        Checks whether the last full verification of the backup is older than `VERIFY_INTERVAL`.
+
+        Returns:
+            (bool): True if `replicate` must verify every backup file.
+        """
+        try:
+            return time.time() - os.path.getmtime(self.verified_path) >= VERIFY_INTERVAL
+        except OSError:
+            return True
+
+    def mark_verified(self):
+        """
+        Records that every backup file was just verified.
+        """
+        with open(self.verified_path, 'w', encoding='utf-8') as verified_file:
+            verified_file.write(datetime.now().isoformat(timespec='seconds'))
+
+    def __walk_source(self):
+        for root, _, files in os.walk(self.source_dir):
+            for file_name in files:
+                yield os.path.relpath(os.path.join(root, file_name), self.source_dir)
+
+    def copy_verified(self, source_path: str, backup_path: str, digest: str, link: bool = False):
+        """
+        Copies a file to the backup and checks that the copy has the expected hash.
+
+        The file is written next to its destination and then renamed over it, so a
+        failed or interrupted copy never leaves a truncated backup behind. The copy is
+        retried once if the verification fails.
+
+        Args:
+            source_path (str): The file to copy.
+            backup_path (str): The destination of the copy.
+            digest (str): The SHA-256 of the source content.
+            link (bool, optional): Whether the file may be hardlinked, if `use_hardlinks` is enabled,
+                because it is no longer appended. Defaults to False.
+
+        Raises:
+            OSError: If the copy does not match the source after the retry.
+        """
+        os.makedirs(os.path.dirname(backup_path), exist_ok=True)
+        for _ in range(2):
+            temp_path = backup_path + '.tmp'
+            self.__link_or_copy(source_path, temp_path, link)
+            if self.hash_file(temp_path) == digest:
+                os.replace(temp_path, backup_path)
+                return
+            os.remove(temp_path)
+        raise OSError(errno.EIO, f'La copia no coincide con el original: {backup_path}')
+
+    def __link_or_copy(self, source_path: str, destination_path: str, link: bool):
+        if os.path.exists(destination_path):
+            os.remove(destination_path)
+        if self.use_hardlinks and link:
+            try:
+                os.link(source_path, destination_path)
+                return
+            except OSError:
+                pass
+        if self.__clone_file(source_path, destination_path):
+            return
+        shutil.copy2(source_path, destination_path)
+
+    def __clone_file(self, source_path: str, destination_path: str):
+        """
+        Tries to create a copy-on-write clone of a file, which shares blocks with the
+        source until either of them is modified.
+
+        Returns:
+            (bool): True if the clone was created, False if the filesystem does not support it.
+        """
+        if not sys.platform.startswith('linux'):
+            return False
+        import fcntl
+        try:
+            with open(source_path, 'rb') as source, open(destination_path, 'wb') as destination:
+                fcntl.ioctl(destination.fileno(), FICLONE, source.fileno())
+            shutil.copystat(source_path, destination_path)
+            return True
+        except OSError:
+            if os.path.exists(destination_path):
+                os.remove(destination_path)
+            return False
+
+    @staticmethod
+    def hash_file(file_path: str):
+        """
+        Computes the SHA-256 of a file, reading it in chunks.
+
+        Args:
+            file_path (str): The file to hash.
+
+        Returns:
+            (str): The hexadecimal digest.
+        """
+        sha256 = hashlib.sha256()
+        with open(file_path, 'rb') as file:
+            for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b''):
+                sha256.update(chunk)
+        return sha256.hexdigest()
+
+    def load_manifest(self):
+        """
+        Loads the manifest of already replicated files.
+
+        Returns:
+            (dict[str, dict]): The manifest entries by relative path, or an empty dictionary
+                if the manifest does not exist or cannot be read.
+        """
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as manifest_file:
+                return json.load(manifest_file)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logging.warning(f'No se pudo leer el manifiesto de la copia de seguridad: {e}')
+            return {}
+
+    def save_manifest(self, manifest: dict[str, dict]):
+        """
+        Writes the manifest atomically (temporary file plus rename).
+
+        Args:
+            manifest (dict[str, dict]): The manifest entries by relative path.
+        """
+        os.makedirs(self.backup_dir, exist_ok=True)
+        temp_path = self.manifest_path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as manifest_file:
+            json.dump(manifest, manifest_file)
+        os.replace(temp_path, self.manifest_path)
@@ -0,0 +1,315 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import calendar
+import functools
+import itertools
+import re
+import time
+from array import array
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator
+
+# `ip_YYYY-MM-DD_file.cro`, as written in `devices/{distrito}/{modelo}-{punto}/`
+CRO_FILE_NAME_PATTERN = re.compile(r"^(\d+\.\d+\.\d+\.\d+)_(\d{4}-\d{2}-\d{2})_file\.cro$")
+
+DATE_FORMAT = "%d/%m/%Y"
+TIME_FORMAT = "%H:%M"
+SECONDS_PER_DAY = 86400
+EPOCH = datetime(1970, 1, 1)
+
+class CroRecords:
+    __slots__ = ("user_ids", "timestamps", "extras", "line_indexes", "malformed")
+
+    def __init__(self):
+        """
+        Initializes an empty set of decoded `.cro` lines.
+
+        A line holds the user ID, the date (`%d/%m/%Y`), the time (`%H:%M`) and the remaining fields of an
+        attendance, separated by spaces. Blank lines are ignored and malformed lines are not decoded
+        but listed in `malformed`, so every consumer handles them the same way.
+
+        Attributes:
+            user_ids (list[str]): The user ID of each record, as written.
+            timestamps (array): The device local time of each record, in seconds since 1970-01-01.
+            extras (list[str]): The remaining fields of each record, joined by a space.
+            line_indexes (array): The index of the line of each record.
+            malformed (array): The indexes of the lines that could not be decoded.
+        """
+        self.user_ids: list[str] = []
+        self.timestamps: array = array('q')
+        self.extras: list[str] = []
+        self.line_indexes: array = array('L')
+        self.malformed: array = array('L')
+
+    def __len__(self):
+        return len(self.timestamps)
+
+@functools.lru_cache(maxsize=8192)
+def parse_date(date_str: str):
+    """
+    Parses a `%d/%m/%Y` date. Files hold few distinct dates, so each one is parsed once.
+
+    Args:
+        date_str (str): The date as written in the file.
+
+    Returns:
+        (int or None): The seconds since 1970-01-01 of its midnight, or None if it is not a valid date.
+    """
+    try:
+        return calendar.timegm(time.strptime(date_str, DATE_FORMAT))
+    except ValueError:
+        return None
+
+@functools.lru_cache(maxsize=2048)
+def parse_time(time_str: str):
+    """
+    Parses a `%H:%M` time. There are at most 1440 distinct valid times, so each one is parsed once.
+
+    Args:
+        time_str (str): The time as written in the file.
+
+    Returns:
+        (int or None): The seconds since midnight, or None if it is not a valid time.
+    """
+    try:
+        parsed = time.strptime(time_str, TIME_FORMAT)
+    except ValueError:
+        return None
+    return parsed.tm_hour * 3600 + parsed.tm_min * 60
+
+def parse_lines(lines: Iterable[str], start: int = 0):
+    """
+    Decodes `.cro` lines into compact records.
+
+    Args:
+        lines (Iterable[str]): The lines, with or without their line breaks.
+        start (int, optional): The index of the first line, e.g. when a file is decoded in chunks. Defaults to 0.
+
+    Returns:
+        (CroRecords): The records and the indexes of the malformed lines.
+    """
+    records = CroRecords()
+    user_ids, timestamps, extras = records.user_ids, records.timestamps, records.extras
+    line_indexes, malformed = records.line_indexes, records.malformed
+    for index, line in enumerate(lines, start):
+        parts = line.split()
+        if not parts:
+            continue
+        if len(parts) >= 3:
+            day = parse_date(parts[1])
+            seconds = parse_time(parts[2])
+            if day is not None and seconds is not None:
+                user_ids.append(parts[0])
+                timestamps.append(day + seconds)
+                extras.append(" ".join(parts[3:]) if len(parts) > 3 else "")
+                line_indexes.append(index)
+                continue
+        malformed.append(index)
+    return records
+
+def parse_buffer(data: bytes, encoding: str = "utf-8"):
+    """
+    Decodes a whole `.cro` buffer at once. Undecodable bytes are replaced, so they only
+    make their line malformed.
+
+    Args:
+        data (bytes): The content of the file, or part of it made of complete lines.
+        encoding (str, optional): The text encoding. Defaults to "utf-8".
+
+    Returns:
+        (CroRecords): The records and the indexes of the malformed lines.
+    """
+    return parse_lines(data.decode(encoding, errors="replace").splitlines())
+
+def iter_file_records(file_path: str, chunk_lines: int = 4096) -> Iterator[CroRecords]:
+    """
+    Reads and decodes a `.cro` file in chunks of lines, so memory does not depend on its size.
+    Undecodable bytes are replaced, so they only make their line malformed.
+
+    Args:
+        file_path (str): The path of the file.
+        chunk_lines (int, optional): The number of lines decoded at once. Defaults to 4096.
+
+    Yields:
+        (CroRecords): The records and the indexes of the malformed lines of each chunk,
+            with line indexes counted from the start of the file.
+    """
+    with open(file_path, "r", encoding="utf-8", errors="replace") as file:
+        start = 0
+        while True:
+            lines = list(itertools.islice(file, chunk_lines))
+            if not lines:
+                return
+            yield parse_lines(lines, start)
+            start += len(lines)
+
+def parse_file_name(file_name: str):
+    """
+    Extracts the IP and date from a `ip_YYYY-MM-DD_file.cro` file name.
+
+    Args:
+        file_name (str): The file name, without its folder.
+
+    Returns:
+        (tuple[str, str] or None): The IP and the date (YYYY-MM-DD), or None if the name does not match.
+    """
+    match = CRO_FILE_NAME_PATTERN.match(file_name)
+    return match.groups() if match else None
+
+def to_datetime(timestamp: int):
+    """
+    Converts epoch seconds back to a naive datetime (device local time).
+
+    Args:
+        timestamp (int): The seconds since 1970-01-01.
+
+    Returns:
+        (datetime): The timestamp.
+    """
+    return EPOCH + timedelta(seconds=timestamp)
+
+@functools.lru_cache(maxsize=8192)
+def format_day(day: int):
+    """
+    Formats a day as an ISO date, once per distinct day.
+
+    Args:
+        day (int): The days since 1970-01-01.
+
+    Returns:
+        (str): The date (YYYY-MM-DD).
+    """
+    return (EPOCH + timedelta(days=day)).strftime("%Y-%m-%d")
+
+def from_datetime(timestamp: datetime):
+    """
+    Converts a naive datetime (device local time) to epoch seconds, without applying any time zone.
+    Seconds and microseconds are dropped, as in the files.
+
+    Args:
+        timestamp (datetime): The timestamp.
+
+    Returns:
+        (int): The seconds since 1970-01-01.
+    """
+    return calendar.timegm(timestamp.timetuple()) - timestamp.second
+
+@functools.lru_cache(maxsize=8192)
+def format_date(day: int):
+    """
+    Formats a day as it is written in the files, once per distinct day.
+
+    Args:
+        day (int): The days since 1970-01-01.
+
+    Returns:
+        (str): The date (`%d/%m/%Y`).
+    """
+    return (EPOCH + timedelta(days=day)).strftime(DATE_FORMAT)
+
+def format_line(user_id, timestamp, extra: str = ""):
+    """
+    Encodes an attendance as a `.cro` line, without its line break. `parse_lines` decodes it back.
+
+    Args:
+        user_id (str or int): The user ID, written as is.
+        timestamp (int or datetime): The epoch seconds (see `from_datetime`) or the datetime of the attendance.
+        extra (str, optional): The remaining fields, already joined by a space. Defaults to none.
+
+    Returns:
+        (str): The line, e.g. `1234 05/03/2024 08:15 1 0`.
+    """
+    if isinstance(timestamp, datetime):
+        timestamp = from_datetime(timestamp)
+    day, seconds = divmod(timestamp, SECONDS_PER_DAY)
+    line = f"{user_id} {format_date(day)} {seconds // 3600:02d}:{seconds % 3600 // 60:02d}"
+    return f"{line} {extra}" if extra else line
+
+def format_timestamp(timestamp: int):
+    """
+    Formats epoch seconds as an ISO timestamp with minutes precision.
+
+    Args:
+        timestamp (int): The seconds since 1970-01-01.
+
+    Returns:
+        (str): The timestamp (YYYY-MM-DDTHH:MM).
+    """
+    day, seconds = divmod(timestamp, SECONDS_PER_DAY)
+    return f"{format_day(day)}T{seconds // 3600:02d}:{seconds % 3600 // 60:02d}"
+
+def benchmark(lines: int = 100_000, repeat: int = 5):
+    """
+    Compares the line by line `strptime` parsing used so far with `parse_buffer` on a synthetic file.
+
+    The file spans 60 days, with 1% malformed lines.
+
+    Args:
+        lines (int, optional): The number of lines. Defaults to 100000.
+        repeat (int, optional): The number of runs; the best one is reported. Defaults to 5.
+
+    Returns:
+        (dict[str, float]): The best time in seconds of each implementation.
+    """
+    import random
+    rng = random.Random(0)
+    start_day = datetime(2024, 1, 1)
+    text_lines = []
+    for index in range(lines):
+        if index % 100 == 0:
+            text_lines.append(f"{rng.randrange(5000)} 31/02/2024 25:00 1 0")
+            continue
+        timestamp = start_day + timedelta(days=rng.randrange(60), minutes=rng.randrange(1440))
+        text_lines.append(f"{rng.randrange(5000)} {timestamp:%d/%m/%Y %H:%M} {rng.randrange(3)} {rng.randrange(2)}")
+    data = ("\n".join(text_lines) + "\n").encode("utf-8")
+
+    def per_line():
+        records = []
+        for line in data.decode("utf-8", errors="replace").splitlines():
+            parts = line.split()
+            if not parts:
+                continue
+            try:
+                timestamp = datetime.strptime(f"{parts[1]} {parts[2]}", f"{DATE_FORMAT} {TIME_FORMAT}")
+            except (IndexError, ValueError):
+                continue
+            records.append((parts[0], timestamp, " ".join(parts[3:])))
+        return records
+
+    def cached():
+        parse_date.cache_clear()
+        parse_time.cache_clear()
+        return parse_buffer(data)
+
+    results = {}
+    for name, implementation in {"strptime": per_line, "cro_parser": cached}.items():
+        best = float("inf")
+        for _ in range(repeat):
+            start = time.perf_counter()
+            implementation()
+            best = min(best, time.perf_counter() - start)
+        results[name] = best
+    records = cached()
+    assert [(user_id, timestamp) for user_id, timestamp, _ in per_line()] == \
+        [(user_id, to_datetime(timestamp)) for user_id, timestamp in zip(records.user_ids, records.timestamps)]
+    return results
+
+if __name__ == "__main__":
+    for name, seconds in benchmark().items():
+        print(f"{name:>10}: {seconds * 1000:8.2f} ms")
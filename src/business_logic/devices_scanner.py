@@ -0,0 +1,252 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import logging
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Callable, Iterable, Iterator
+from src.business_logic.cro_parser import parse_file_name
+from src.common.utils.file_manager import find_root_directory
+
+
+def iter_device_folders(devices_path: str, districts: Iterable[str] = None):
+    """
+    Yields the `devices/{distrito}/{modelo}-{punto}/` folders, sorted by district and device.
+
+    Args:
+        devices_path (str): The path of the `devices` folder.
+        districts (Iterable[str], optional): The districts to include (case insensitive). Defaults to all.
+
+    Yields:
+        (tuple[str, str, str]): The district, the device folder name and the device folder path.
+    """
+    districts = {district.lower() for district in districts} if districts else None
+    for district in sorted(os.listdir(devices_path)):
+        district_path = os.path.join(devices_path, district)
+        if not os.path.isdir(district_path) or (districts and district.lower() not in districts):
+            continue
+        for device_folder in sorted(os.listdir(district_path)):
+            device_path = os.path.join(district_path, device_folder)
+            if os.path.isdir(device_path):
+                yield district, device_folder, device_path
+
+def attendance_file_path(devices_path: str, district: str, model_name: str, point: str, ip: str, date: str):
+    """
+    Builds the path of the file where the attendances of a device are written on a date.
+
+    Args:
+        devices_path (str): The path of the `devices` folder.
+        district (str): The district of the device.
+        model_name (str): The model name of the device.
+        point (str): The attendance point of the device.
+        ip (str): The IP of the device.
+        date (str): The date of the file (YYYY-MM-DD).
+
+    Returns:
+        (str): The path `devices/{distrito}/{modelo}-{punto}/ip_YYYY-MM-DD_file.cro`.
+    """
+    return os.path.join(devices_path, district, f"{model_name}-{point}", f"{ip}_{date}_file.cro")
+
+def read_device_districts(devices_file_path: str):
+    """
+    Reads the district of each device from the devices file, whose lines are
+    `distrito - modelo - punto - ip - id - comunicación - batería - activo`.
+
+    Args:
+        devices_file_path (str): The path of `info_devices.txt`.
+
+    Returns:
+        (dict[str, str]): The district of each device, by IP. Empty if the file cannot be read.
+    """
+    districts = {}
+    try:
+        with open(devices_file_path, "r") as file:
+            for line in file:
+                parts = line.strip().split(" - ")
+                if len(parts) == 8:
+                    districts[parts[3]] = parts[0]
+    except OSError as e:
+        logging.warning(f"No se pudo leer {devices_file_path}: {e}")
+    return districts
+
+def find_attendance_file(devices_path: str, ip: str, date: str, folder: str = None):
+    """
+    Finds the file where the attendances of a device were written on a date, looking first in
+    the folder where they were written before, if known, and then in every device folder.
+
+    Args:
+        devices_path (str): The path of the `devices` folder.
+        ip (str): The IP of the device.
+        date (str): The date of the file (YYYY-MM-DD).
+        folder (str, optional): The folder where the file is expected. Defaults to None.
+
+    Returns:
+        (str or None): The path of the `ip_YYYY-MM-DD_file.cro` file, or None if it does not exist.
+    """
+    file_name = f"{ip}_{date}_file.cro"
+    if folder and os.path.isfile(os.path.join(folder, file_name)):
+        return os.path.join(folder, file_name)
+    if not os.path.isdir(devices_path):
+        return None
+    for _, _, device_path in iter_device_folders(devices_path):
+        file_path = os.path.join(device_path, file_name)
+        if os.path.isfile(file_path):
+            return file_path
+    return None
+
+class CroFileFilter:
+    def __init__(self, start_date: str = None, end_date: str = None, ips: Iterable[str] = None):
+        """
+        Initializes a picklable filter of `ip_YYYY-MM-DD_file.cro` file names, so it can be
+        sent to the scanning processes.
+
+        Args:
+            start_date (str, optional): The first file date to include (YYYY-MM-DD). Defaults to no lower bound.
+            end_date (str, optional): The last file date to include (YYYY-MM-DD). Defaults to no upper bound.
+            ips (Iterable[str], optional): The device IPs to include. Defaults to all.
+        """
+        self.start_date: str = start_date
+        self.end_date: str = end_date
+        self.ips: set[str] = set(ips) if ips else None
+
+    def match(self, file_name: str):
+        """
+        Matches a file name against the filter.
+
+        Args:
+            file_name (str): The name of the file.
+
+        Returns:
+            (tuple[str, str] or None): The IP and date of the file if it matches, otherwise None.
+        """
+        parsed = parse_file_name(file_name)
+        if not parsed:
+            return None
+        ip, file_date = parsed
+        if self.ips and ip not in self.ips:
+            return None
+        # ISO dates compare correctly as strings
+        if (self.start_date and file_date < self.start_date) or (self.end_date and file_date > self.end_date):
+            return None
+        return ip, file_date
+
+    def __call__(self, file_name: str):
+        return self.match(file_name) is not None
+
+def scan_folders(folders: list[str], file_task: Callable[[str], Any], file_filter: Callable[[str], bool]):
+    """
+    Runs a task over the matching files of a group of device folders. This is the unit of
+    work of a scanning process.
+
+    Args:
+        folders (list[str]): The device folders to scan.
+        file_task (Callable[[str], Any]): A picklable function called with the path of each matching file,
+            or None to only list the files.
+        file_filter (Callable[[str], bool]): A picklable function that selects files by name.
+
+    Returns:
+        (list[tuple[str, Any]]): The path and task result of each matching file.
+    """
+    results = []
+    for folder in folders:
+        with os.scandir(folder) as files:
+            for file in files:
+                if file_filter(file.name) and file.is_file():
+                    results.append((file.path, file_task(file.path) if file_task else None))
+    return results
+
+class DevicesScanner:
+    def __init__(self, devices_path: str = None, max_workers: int = None, folders_per_task: int = 16, min_parallel_folders: int = 64):
+        """
+        Initializes the DevicesScanner instance.
+
+        The scanner spreads the device folders of the `devices` tree across a process pool,
+        so the work scales with the number of cores. Trees smaller than `min_parallel_folders`
+        are scanned in the current process, where starting the pool would cost more than it saves.
+
+        Args:
+            devices_path (str, optional): The path of the `devices` folder. Defaults to the one in the root directory.
+            max_workers (int, optional): The number of scanning processes. Defaults to the number of CPUs.
+            folders_per_task (int, optional): The number of device folders sent to a process at once. Defaults to 16.
+            min_parallel_folders (int, optional): The minimum number of folders to use the process pool. Defaults to 64.
+        """
+        self.devices_path: str = devices_path or os.path.join(find_root_directory(), "devices")
+        self.max_workers: int = max_workers or os.cpu_count() or 1
+        self.folders_per_task: int = folders_per_task
+        self.min_parallel_folders: int = min_parallel_folders
+
+    def scan(self, file_task: Callable[[str], Any], file_filter: Callable[[str], bool], districts: Iterable[str] = None,
+             cancel_event: threading.Event = None, emit_progress: Callable = None) -> Iterator[tuple[str, Any]]:
+        """
+        Runs a task over every matching file of the `devices` tree and yields the results as the
+        groups of folders finish, in no particular order.
+
+        `file_task` and `file_filter` run in other processes, so they must be picklable: top-level
+        functions, `functools.partial` objects of them or instances of top-level classes.
+
+        Args:
+            file_task (Callable[[str], Any]): The function called with the path of each matching file,
+                or None to only list the files.
+            file_filter (Callable[[str], bool]): The function that selects files by name (e.g. `CroFileFilter`).
+            districts (Iterable[str], optional): The districts to scan. Defaults to all.
+            cancel_event (threading.Event, optional): An event that stops the scan when set; the groups
+                already sent to the processes are discarded. Defaults to None.
+            emit_progress (Callable, optional): A callable function to emit progress updates,
+                once per finished group of folders. Defaults to None.
+
+        Yields:
+            (tuple[str, Any]): The path of each matching file and the result of `file_task` (None without a task).
+        """
+        folders = [path for _, _, path in iter_device_folders(self.devices_path, districts)]
+        chunks = [folders[index:index + self.folders_per_task] for index in range(0, len(folders), self.folders_per_task)]
+        processed_folders = 0
+
+        def report(chunk: list[str]):
+            nonlocal processed_folders
+            processed_folders += len(chunk)
+            if emit_progress:
+                emit_progress(
+                    percent_progress=int(processed_folders * 100 / len(folders)),
+                    device_progress=os.path.basename(chunk[-1]),
+                    processed_devices=processed_folders,
+                    total_devices=len(folders)
+                )
+
+        if len(folders) < self.min_parallel_folders or self.max_workers == 1:
+            for chunk in chunks:
+                if cancel_event and cancel_event.is_set():
+                    return
+                yield from scan_folders(chunk, file_task, file_filter)
+                report(chunk)
+            return
+
+        logging.debug(f"Escaneando {len(folders)} carpetas de dispositivos con {self.max_workers} procesos")
+        executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        try:
+            pending = {executor.submit(scan_folders, chunk, file_task, file_filter): chunk for chunk in chunks}
+            while pending:
+                done, _ = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                if cancel_event and cancel_event.is_set():
+                    return
+                for future in done:
+                    chunk = pending.pop(future)
+                    yield from future.result()
+                    report(chunk)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
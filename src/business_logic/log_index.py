@@ -0,0 +1,365 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import gzip
+import logging
+import os
+import re
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Iterable
+from src.common.utils.errors import BaseError
+
+# Captures the date, time and error code of a log entry
+ERROR_LOG_PATTERN = re.compile(rb"(\d{4})-(\d{2})-(\d{2}) (\d{2}):(\d{2}):(\d{2}),(\d{3}) - \w+ - \[(\d{4})\]")
+
+INDEX_SUFFIX = ".idx"
+HEADER = struct.Struct("<4sQ")  # Format marker, offset of the log up to which it is indexed
+RECORD = struct.Struct("<QLqHL")  # Line offset, line length, sortable timestamp, error code, timestamp column
+MAGIC = b"LGX2"
+COMPRESSED_SUFFIX = ".gz"  # Rotated segments (see `rotate_file`)
+
+def open_log(log_path: str):
+    """
+    Opens a log file or a compressed segment for reading in binary mode.
+
+    A compressed segment is decompressed as it is read, without keeping it in memory. Its
+    entries are always read in ascending offset order (the index, the text index and the
+    queries read them so), so seeking forward only decompresses the bytes in between and
+    each reader goes through a segment once, whatever the number of segments being merged.
+
+    Args:
+        log_path (str): The path of the log file.
+
+    Returns:
+        (BinaryIO): The opened file, whose offsets are those of the uncompressed log.
+    """
+    if log_path.endswith(COMPRESSED_SUFFIX):
+        return gzip.open(log_path, "rb")
+    return open(log_path, "rb")
+
+def starts_with_timestamp(line: str, timestamp: int, column: int = 0):
+    """
+    Checks whether a line read at the offset of an indexed entry still holds its timestamp where
+    it was found, which is no longer the case if the log was rotated or replaced after it was indexed.
+
+    Args:
+        line (str): The line read (see `read_ranges`).
+        timestamp (int): The indexed timestamp, as `YYYYMMDDHHMMSSmmm`.
+        column (int, optional): The position of the timestamp in the line, as indexed. Defaults to 0.
+
+    Returns:
+        (bool): True if the line is the indexed entry.
+    """
+    return re.sub(r"\D", "", line[column:column + 23]) == str(timestamp)
+
+def timestamp_column(data: bytes, line_start: int, match_start: int):
+    """
+    Returns the position of a timestamp found after the start of a line, in characters of the
+    line as `read_ranges` returns it.
+
+    Args:
+        data (bytes): The bytes read from the log.
+        line_start (int): The offset of the line in `data`.
+        match_start (int): The offset of the timestamp in `data`.
+
+    Returns:
+        (int): The position of the timestamp in the line.
+    """
+    if match_start == line_start:
+        return 0
+    return len(data[line_start:match_start].decode("utf-8", errors="replace").lstrip())
+
+def read_ranges(log_path: str, ranges: Iterable[tuple[int, int]]):
+    """
+    Reads lines of a log file by their offset and length, opening it once.
+
+    Args:
+        log_path (str): The path of the log file.
+        ranges (Iterable[tuple[int, int]]): The offset and length of each line.
+
+    Yields:
+        (str): Each line, without its line break.
+    """
+    with open_log(log_path) as file:
+        for offset, length in ranges:
+            file.seek(offset)
+            yield file.read(length).decode("utf-8", errors="replace").strip()
+
+def log_size(log_path: str):
+    """
+    Returns the size of a log file or, for a compressed segment, of its uncompressed content,
+    as recorded at the end of the gzip stream, without decompressing it.
+
+    Args:
+        log_path (str): The path of the log file.
+
+    Returns:
+        (int): The size in bytes.
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    if not log_path.endswith(COMPRESSED_SUFFIX):
+        return os.path.getsize(log_path)
+    with open(log_path, "rb") as file:
+        file.seek(-4, os.SEEK_END)
+        return struct.unpack("<I", file.read(4))[0]
+
+def date_key(date_str: str, end_of_day: bool = False):
+    """
+    Converts a date to the bounds of the sortable timestamps of that day.
+
+    Args:
+        date_str (str): The date (YYYY-MM-DD).
+        end_of_day (bool, optional): Whether to return the last instant of the day instead of the first. Defaults to False.
+
+    Returns:
+        (int): The sortable timestamp, as `YYYYMMDDHHMMSSmmm`.
+    """
+    return int(date_str.replace("-", "")) * 1_000_000_000 + (999_999_999 if end_of_day else 0)
+
+class LogIndex:
+    def __init__(self, log_path: str, source: str):
+        """
+        Initializes the LogIndex instance of one `*_error.log` file or of one of its rotated,
+        possibly compressed, segments.
+
+        The index is kept in a sidecar file (`{log_path}.idx`) with the offset, length, timestamp
+        and error code of each entry, and is brought up to date by reading only the bytes appended
+        to the log since the last indexed offset. Filtering by date and code is then done on the
+        index, and only the matching lines are read from the log.
+
+        Args:
+            log_path (str): The path of the log file.
+            source (str): The source of the log ("programa", "icono" or "servicio").
+
+        Attributes:
+            offsets (array): The byte offset of each entry in the log.
+            lengths (array): The length in bytes of each entry line.
+            timestamps (array): The timestamp of each entry, as `YYYYMMDDHHMMSSmmm` so they sort as numbers.
+            codes (array): The error code of each entry.
+            columns (array): The position of the timestamp in each entry line, which is not 0 if the
+                line starts with other text (see `starts_with_timestamp`).
+            indexed_offset (int): The offset of the log up to which it is indexed.
+        """
+        self.log_path: str = log_path
+        self.index_path: str = log_path + INDEX_SUFFIX
+        self.source: str = source
+        self.file_id: tuple[int, int] = None
+        self.resets: int = 0  # Times the index was emptied, so the indexes built on it know it changed
+        self.reset()
+        self.load()
+
+    def reset(self):
+        """
+        Empties the index, so the log is indexed again from the beginning.
+        """
+        self.offsets: array = array('Q')
+        self.lengths: array = array('L')
+        self.timestamps: array = array('q')
+        self.codes: array = array('H')
+        self.columns: array = array('L')
+        self.indexed_offset: int = 0
+        self.saved_entries: int = 0
+        self.resets += 1
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def load(self):
+        """
+        Loads the sidecar file. Entries written after its header, by an update that did not
+        finish, are discarded. A missing or unreadable sidecar only means the log is indexed again.
+        """
+        try:
+            with open(self.index_path, "rb") as file:
+                data = file.read()
+            magic, indexed_offset = HEADER.unpack_from(data)
+            if magic != MAGIC:
+                raise ValueError("formato desconocido")
+            body = memoryview(data)[HEADER.size:]
+            body = body[:len(body) - len(body) % RECORD.size]
+            for offset, length, timestamp, code, column in RECORD.iter_unpack(body):
+                if offset >= indexed_offset:
+                    break
+                self.append(offset, length, timestamp, code, column)
+            self.indexed_offset = indexed_offset
+            self.saved_entries = len(self)
+        except FileNotFoundError:
+            self.reset()
+        except Exception as e:
+            logging.debug(f"No se pudo leer el índice {self.index_path}: {e}")
+            self.reset()
+
+    def append(self, offset: int, length: int, timestamp: int, code: int, column: int = 0):
+        """
+        Adds an entry to the index in memory. Call `save` to persist it.
+
+        Args:
+            offset (int): The byte offset of the line in the log.
+            length (int): The length of the line in bytes.
+            timestamp (int): The timestamp, as `YYYYMMDDHHMMSSmmm`.
+            code (int): The error code.
+            column (int, optional): The position of the timestamp in the line. Defaults to 0.
+        """
+        self.offsets.append(offset)
+        self.lengths.append(length)
+        self.timestamps.append(timestamp)
+        self.codes.append(code)
+        self.columns.append(column)
+
+    def update(self):
+        """
+        Indexes the complete lines appended to the log since the last update and persists them.
+        If the log shrank, was rotated since the previous update or no longer holds its last indexed
+        entry, it was replaced, so it is indexed again from the beginning.
+
+        Returns:
+            (int): The number of new entries.
+        """
+        try:
+            stat = os.stat(self.log_path)
+            size = log_size(self.log_path)
+        except OSError:
+            return 0
+        file_id = (stat.st_dev, stat.st_ino)
+        if size < self.indexed_offset or (self.file_id is not None and file_id != self.file_id) or \
+                (size > self.indexed_offset and not self.last_entry_matches()):
+            self.reset()
+        self.file_id = file_id
+        if size == self.indexed_offset:
+            return 0
+
+        with open_log(self.log_path) as file:
+            file.seek(self.indexed_offset)
+            data = file.read(size - self.indexed_offset)
+        end = data.rfind(b"\n") + 1  # A trailing line without a line break may still be being written
+
+        previous_entries = len(self)
+        position = 0
+        while position < end:
+            line_end = data.index(b"\n", position) + 1
+            match = ERROR_LOG_PATTERN.search(data, position, line_end)
+            if match:
+                year, month, day, hour, minute, second, millisecond, code = match.groups()
+                self.append(
+                    self.indexed_offset + position,
+                    line_end - position,
+                    int(year + month + day + hour + minute + second + millisecond),
+                    int(code),
+                    timestamp_column(data, position, match.start())
+                )
+            position = line_end
+        self.indexed_offset += end
+        self.save()
+        return len(self) - previous_entries
+
+    def last_entry_matches(self):
+        """
+        Checks whether the last indexed entry is still at its offset. A rotated log may be replaced
+        by a new file with the same identity (its inode reused), which only its content tells apart.
+        Compressed segments are never replaced, so they are not read.
+
+        Returns:
+            (bool): False if the log holds another entry at that offset; True otherwise.
+        """
+        if not self or self.log_path.endswith(COMPRESSED_SUFFIX):
+            return True
+        try:
+            _, line = next(self.read_lines([len(self) - 1]))
+        except OSError:
+            return False
+        return starts_with_timestamp(line, self.timestamps[-1], self.columns[-1])
+
+    def save(self):
+        """
+        Appends the entries not yet persisted to the sidecar file and then updates its header,
+        so an interrupted save never leaves entries past the indexed offset.
+        """
+        try:
+            if self.saved_entries == 0 or not os.path.exists(self.index_path):
+                mode, self.saved_entries = "wb", 0
+            else:
+                mode = "r+b"
+            with open(self.index_path, mode) as file:
+                file.seek(HEADER.size + self.saved_entries * RECORD.size)
+                file.write(b"".join(
+                    RECORD.pack(self.offsets[i], self.lengths[i], self.timestamps[i], self.codes[i], self.columns[i])
+                    for i in range(self.saved_entries, len(self))
+                ))
+                file.truncate()
+                file.seek(0)
+                file.write(HEADER.pack(MAGIC, self.indexed_offset))
+            self.saved_entries = len(self)
+        except Exception as e:
+            BaseError(3001, f"No se pudo guardar el índice {self.index_path}: {e}", level="warning")
+
+    def find(self, start_date: str = None, end_date: str = None, codes: Iterable[str] = None, first: int = 0):
+        """
+        Looks up the entries of a date range and error codes in the index, without reading the log.
+        Entries are appended in time order, so the date range is found by binary search.
+
+        Args:
+            start_date (str, optional): The first date to include (YYYY-MM-DD). Defaults to no lower bound.
+            end_date (str, optional): The last date to include (YYYY-MM-DD). Defaults to no upper bound.
+            codes (Iterable[str], optional): The error codes to include. Defaults to all.
+            first (int, optional): The position of the first entry to look at, to skip the ones already seen. Defaults to 0.
+
+        Returns:
+            (list[int]): The positions of the matching entries.
+        """
+        lowest = bisect_left(self.timestamps, date_key(start_date), first) if start_date else first
+        highest = bisect_right(self.timestamps, date_key(end_date, end_of_day=True), lowest) if end_date else len(self)
+        if not codes:
+            return list(range(lowest, highest))
+        codes = {int(code) for code in codes}
+        return [position for position in range(lowest, highest) if self.codes[position] in codes]
+
+    def locate(self, positions: Iterable[int]):
+        """
+        Copies what is needed to read the given entries, so they can be read (see `read_ranges`)
+        without holding the lock that guards the index, even if it is updated or reset meanwhile.
+
+        Args:
+            positions (Iterable[int]): The positions of the entries, as returned by `find`.
+
+        Returns:
+            (list[tuple[int, int, int, int, int]]): The position, timestamp, offset, length and
+                timestamp column of each entry.
+        """
+        return [
+            (position, self.timestamps[position], self.offsets[position], self.lengths[position], self.columns[position])
+            for position in positions
+        ]
+
+    def read_lines(self, positions: Iterable[int]):
+        """
+        Reads the lines of the given entries, opening the log once.
+
+        Args:
+            positions (Iterable[int]): The positions of the entries, as returned by `find`.
+
+        Yields:
+            (tuple[int, str]): The position and the line, without its line break, of each entry.
+        """
+        located = self.locate(positions)
+        lines = read_ranges(self.log_path, ((offset, length) for _, _, offset, length, _ in located))
+        for (position, _, _, _, _), line in zip(located, lines):
+            yield position, line
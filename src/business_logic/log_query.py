@@ -0,0 +1,490 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import heapq
+import os
+import re
+import threading
+from array import array
+from collections import OrderedDict
+from bisect import bisect_left
+from datetime import datetime
+from typing import Iterable, Iterator, TextIO
+from src.business_logic.log_index import LogIndex, date_key, read_ranges, starts_with_timestamp
+from src.business_logic.log_text_index import LogTextIndex, search_phrase, searchable_text
+from src.common.utils.file_manager import find_root_directory
+from src.utils.log_rotation import segment_paths
+from version import PROGRAM_VERSION, SERVICE_VERSION
+
+MONTH_FOLDER_PATTERN = re.compile(r"^\d{4}-\d{2}$")  # logs/{año-mes}/
+BATCH_SIZE = 500  # Entries yielded at once by `ErrorLogQuery.iter_batches`
+BLOCK_ROWS = 100  # Rows of `LogResults` read from the logs at once when one is shown
+CACHE_ROWS = 2000  # Rows of `LogResults` whose text is kept
+EXPORT_ROWS = 4096  # Rows of `LogResults` read from the logs at once when exported
+MISSING_ENTRY = "(entrada no disponible, el log fue reemplazado o eliminado)"
+
+def log_file_paths(folder_path: str, log_file: str):
+    """
+    Returns the files holding a log of a month folder: its rotated segments, from the oldest,
+    followed by the live log, when they exist.
+
+    Args:
+        folder_path (str): The `{año-mes}` folder.
+        log_file (str): The log file name.
+
+    Returns:
+        (list[str]): The paths of the files, in time order.
+    """
+    log_path = os.path.join(folder_path, log_file)
+    paths = segment_paths(log_path)
+    if os.path.exists(log_path):
+        paths.append(log_path)
+    return paths
+
+def error_log_files():
+    """
+    Returns the name of the error log of each source, as written in each `logs/{año-mes}/` folder.
+
+    Returns:
+        (dict[str, str]): The log file name, by source.
+    """
+    return {
+        "programa": "programa_reloj_de_asistencias_" + PROGRAM_VERSION + "_error.log",
+        "icono": "icono_reloj_de_asistencias_" + SERVICE_VERSION + "_error.log",
+        "servicio": "servicio_reloj_de_asistencias_" + SERVICE_VERSION + "_error.log"
+    }
+
+class ErrorLogQuery:
+    def __init__(self, logs_dir: str = None):
+        """
+        Initializes the ErrorLogQuery instance.
+
+        The instance keeps the index of each log file already read (see `LogIndex`) and, once a text
+        search is made, its trigram index (see `LogTextIndex`), so consecutive queries only index the
+        entries appended in between. Queries may run in several threads: the indexes are only
+        updated and looked up holding `lock`, and the lines are read afterwards from a copy of
+        their offsets (see `LogIndex.locate`).
+
+        Args:
+            logs_dir (str, optional): The folder with the `{año-mes}` log folders. Defaults to the
+                `logs` folder of the root directory.
+        """
+        self.logs_dir: str = logs_dir or os.path.join(find_root_directory(), "logs")
+        self.lock = threading.Lock()
+        self.log_indexes: dict[str, LogIndex] = {}
+        self.text_indexes: dict[str, LogTextIndex] = {}
+
+    def get_log_index(self, log_path: str, source: str):
+        """
+        Returns the index of a log file, creating it on first use.
+
+        Args:
+            log_path (str): The path of the log file.
+            source (str): The source of the log.
+
+        Returns:
+            (LogIndex): The index of the log file.
+        """
+        log_index = self.log_indexes.get(log_path)
+        if log_index is None:
+            log_index = self.log_indexes[log_path] = LogIndex(log_path, source)
+        return log_index
+
+    def get_text_index(self, log_index: LogIndex):
+        """
+        Returns the trigram index of a log file, creating it on first use.
+
+        Args:
+            log_index (LogIndex): The index of the log file.
+
+        Returns:
+            (LogTextIndex): The trigram index of the log file.
+        """
+        text_index = self.text_indexes.get(log_index.log_path)
+        if text_index is None or text_index.log_index is not log_index:
+            text_index = self.text_indexes[log_index.log_path] = LogTextIndex(log_index)
+        return text_index
+
+    def find_positions(self, log_index: LogIndex, start_date: str, end_date: str, selected_errors: Iterable[str],
+                       phrase: str, first: int = 0):
+        """
+        Looks up the candidate entries of a log file in its indexes, without reading its lines.
+        Call it holding `lock`.
+
+        Args:
+            log_index (LogIndex): The index of the log file, already updated.
+            start_date (str): The start date in the format 'YYYY-MM-DD' to filter log entries.
+            end_date (str): The end date in the format 'YYYY-MM-DD' to filter log entries.
+            selected_errors (Iterable[str]): The error codes to include, or None for all.
+            phrase (str): The text the entries must contain (see `search_phrase`), or an empty string.
+            first (int, optional): The position of the first entry to look at. Defaults to 0.
+
+        Returns:
+            (list[int]): The positions of the entries matching the date and code filters and holding
+                every trigram of the phrase, in ascending order.
+        """
+        positions = log_index.find(start_date, end_date, selected_errors, first)
+        if phrase:
+            # Read only the entries holding every trigram of the phrase
+            text_index = self.get_text_index(log_index)
+            text_index.update()
+            candidates = text_index.candidates(phrase)
+            if candidates is not None:
+                positions = [position for position in positions if position in candidates]
+        return positions
+
+    def iter_entries(self, log_index: LogIndex, located: list[tuple[int, int, int, int, int]], phrase: str,
+                     replaced: set[str] = None):
+        """
+        Reads the candidate entries of a log file lazily, in time order, keeping those whose line
+        contains the phrase.
+
+        The entries are read from the copy of their offsets taken with `LogIndex.locate` while holding
+        `lock`, so the lines can be read without it while another query updates the same index.
+        If the log was rotated or replaced since, the offsets no longer match it, so the reading stops
+        at the first line that is not the indexed entry.
+
+        Args:
+            log_index (LogIndex): The index of the log file.
+            located (list[tuple[int, int, int, int, int]]): The candidate entries, as returned by `LogIndex.locate`
+                for the positions of `find_positions`.
+            phrase (str): The text the entries must contain, or an empty string.
+            replaced (set[str], optional): Filled with the path of the log file if it was replaced. Defaults to None.
+
+        Yields:
+            (tuple[int, LogIndex, tuple, str]): The timestamp, log index, location (as returned by
+                `LogIndex.locate`) and text (`source: line`) of each matching entry.
+        """
+        lines = read_ranges(log_index.log_path, ((offset, length) for _, _, offset, length, _ in located))
+        for location, line in zip(located, lines):
+            _, timestamp, _, _, column = location
+            if not starts_with_timestamp(line, timestamp, column):
+                if replaced is not None:
+                    replaced.add(log_index.log_path)
+                return
+            if phrase in searchable_text(line):
+                yield timestamp, log_index, location, f"{log_index.source}: {line}"
+
+    def folder_in_range(self, folder: str, start_date: str, end_date: str):
+        """
+        Checks, by its name, whether a `{año-mes}` log folder may hold entries of a date range.
+
+        Args:
+            folder (str): The folder name.
+            start_date (str): The start date in the format 'YYYY-MM-DD', or None.
+            end_date (str): The end date in the format 'YYYY-MM-DD', or None.
+
+        Returns:
+            (bool): False if the folder is a month outside the range; True otherwise.
+        """
+        if not MONTH_FOLDER_PATTERN.match(folder):
+            return True
+        return not ((start_date and folder < start_date[:7]) or (end_date and folder > end_date[:7]))
+
+    def iter_batches(self, start_date: str, end_date: str, selected_errors: Iterable[str] = None,
+                     selected_sources: Iterable[str] = None, search_text: str = "", cancel_event: threading.Event = None,
+                     snapshot: dict[str, int] = None, limit: int = None, replaced: set[str] = None):
+        """
+        Yields the matching error log entries in batches, sorted by date and time.
+
+        Each log file, and each of its rotated segments, is an already time-ordered stream of entries, so the streams are merged lazily
+        by timestamp (`heapq.merge`) and lines are only read as the merge reaches them. Month folders
+        outside the date range are skipped without opening their logs, and reading stops once `limit`
+        entries are found, so the cost follows the number of results rather than the volume of logs.
+
+        Args:
+            start_date (str): The start date in the format 'YYYY-MM-DD' to filter log entries.
+            end_date (str): The end date in the format 'YYYY-MM-DD' to filter log entries.
+            selected_errors (Iterable[str], optional): The error codes to include. Defaults to all.
+            selected_sources (Iterable[str], optional): The sources to include. Defaults to all.
+            search_text (str, optional): The text the entries must contain, including their date, level
+                and error code, case insensitive. Defaults to no filtering.
+            cancel_event (threading.Event, optional): An event that stops the query when set. Defaults to None.
+            snapshot (dict[str, int], optional): Filled with the number of indexed entries of each log file read,
+                by path, so `read_new_entries` can continue from there. Defaults to None.
+            limit (int, optional): The maximum number of entries. Defaults to no limit.
+            replaced (set[str], optional): Filled with the paths of the log files rotated or replaced while
+                the query read them, whose entries are then missing, so the query can be run again. Defaults to None.
+
+        Yields:
+            (list[tuple[int, LogIndex, tuple, str]]): Up to `BATCH_SIZE` entries, as their timestamp,
+                log index, location (see `LogIndex.locate`) and text (`source: line`).
+        """
+        if not os.path.isdir(self.logs_dir):
+            return
+        phrase = search_phrase(search_text or "")
+        streams: list[Iterator] = []
+        for folder in sorted(os.listdir(self.logs_dir)):
+            folder_path = os.path.join(self.logs_dir, folder)
+            if not self.folder_in_range(folder, start_date, end_date) or not os.path.isdir(folder_path):
+                continue
+            for source, log_file in error_log_files().items():
+                if cancel_event is not None and cancel_event.is_set():
+                    return
+                if selected_sources and source not in selected_sources:
+                    continue
+                for log_path in log_file_paths(folder_path, log_file):
+                    with self.lock:
+                        log_index = self.get_log_index(log_path, source)
+                        log_index.update()
+                        if snapshot is not None:
+                            snapshot[log_path] = len(log_index)
+                        located = log_index.locate(self.find_positions(log_index, start_date, end_date, selected_errors, phrase))
+                    if located:
+                        streams.append(self.iter_entries(log_index, located, phrase, replaced))
+
+        batch = []
+        found = 0
+        for entry in heapq.merge(*streams, key=lambda entry: entry[0]):
+            if cancel_event is not None and cancel_event.is_set():
+                return
+            batch.append(entry)
+            found += 1
+            if len(batch) >= BATCH_SIZE or found == limit:
+                yield batch
+                batch = []
+            if found == limit:
+                return
+        if batch:
+            yield batch
+
+    def read_new_entries(self, since: dict[str, int], start_date: str, end_date: str, selected_errors: Iterable[str] = None,
+                         selected_sources: Iterable[str] = None, search_text: str = ""):
+        """
+        Reads the matching entries written to the current month's error logs since the last call,
+        reading each log only from its last indexed offset. If a log was rotated in between, the
+        entries written before the rotation are read from its new segment.
+
+        Args:
+            since (dict[str, int]): The number of entries already seen of each log file, by path,
+                as filled by `iter_batches`. It is updated with the entries read.
+            start_date (str): The start date in the format 'YYYY-MM-DD' to filter log entries.
+            end_date (str): The end date in the format 'YYYY-MM-DD' to filter log entries.
+            selected_errors (Iterable[str], optional): The error codes to include. Defaults to all.
+            selected_sources (Iterable[str], optional): The sources to include. Defaults to all.
+            search_text (str, optional): The text the entries must contain, case insensitive. Defaults to no filtering.
+
+        Returns:
+            (list[tuple[int, LogIndex, tuple, str]]): The new matching entries, sorted by date and time.
+        """
+        entries = []
+        phrase = search_phrase(search_text or "")
+        folder_path = os.path.join(self.logs_dir, datetime.now().strftime("%Y-%m"))
+        for source, log_file in error_log_files().items():
+            if selected_sources and source not in selected_sources:
+                continue
+            live_path = os.path.join(folder_path, log_file)
+            live_seen = since.get(live_path, 0)
+            for log_path in log_file_paths(folder_path, log_file):
+                with self.lock:
+                    log_index = self.get_log_index(log_path, source)
+                    log_index.update()
+                    if log_path in since or log_path == live_path:
+                        first = since.get(log_path, 0)
+                    else:
+                        first = live_seen  # A segment rotated since the last read holds the entries already seen of the live log
+                    if first > len(log_index):
+                        first = 0  # The log was replaced and indexed again
+                    located = log_index.locate(self.find_positions(log_index, start_date, end_date, selected_errors, phrase, first))
+                    indexed = len(log_index)
+                # The lines are read without the lock, from the copy of their offsets
+                replaced = set()
+                entries.extend(self.iter_entries(log_index, located, phrase, replaced))
+                if not replaced:
+                    # Otherwise its entries are read on the next call, from the segment it was rotated to
+                    since[log_path] = indexed
+        entries.sort(key=lambda entry: entry[0])
+        return entries
+
+    def get_error_logs(self, start_date: str, end_date: str, selected_errors: Iterable[str] = None,
+                       selected_sources: Iterable[str] = None, search_text: str = "", limit: int = None):
+        """
+        Retrieves every matching error log entry at once (see `iter_batches`).
+
+        Args:
+            start_date (str): The start date in the format 'YYYY-MM-DD' to filter log entries.
+            end_date (str): The end date in the format 'YYYY-MM-DD' to filter log entries.
+            selected_errors (Iterable[str], optional): The error codes to include. Defaults to all.
+            selected_sources (Iterable[str], optional): The sources to include. Defaults to all.
+            search_text (str, optional): The text the entries must contain, case insensitive. Defaults to no filtering.
+            limit (int, optional): The maximum number of entries. Defaults to no limit.
+
+        Returns:
+            (list[str]): The entries, as `source: line`, sorted by date and time.
+        """
+        batches = self.iter_batches(start_date, end_date, selected_errors, selected_sources, search_text, limit=limit)
+        return [entry[3] for batch in batches for entry in batch]
+
+class LogResults:
+    def __init__(self, cache_rows: int = CACHE_ROWS):
+        """
+        Initializes an empty set of query results.
+
+        Only where each entry is kept is stored: its timestamp, its log file and the offset, length
+        and timestamp column of its line, in compact arrays, so a query with many results takes a
+        few bytes per entry. The text of the entries is read from the logs when they are shown
+        (see `entry_at`), a block of rows at a time, and the most recently read rows are kept in a
+        small cache. If a log was rotated since, its entries are read from the segment it was moved
+        to, whose offsets are the same (see `rotate_file`).
+
+        Args:
+            cache_rows (int, optional): The number of rows whose text is kept. Defaults to `CACHE_ROWS`.
+
+        Attributes:
+            timestamps (array): The timestamp of each entry, as `YYYYMMDDHHMMSSmmm`, in ascending order.
+            log_codes (array): The log file of each entry, as its position in `log_paths`.
+            offsets (array): The byte offset of each entry line in its log.
+            lengths (array): The length in bytes of each entry line.
+            columns (array): The position of the timestamp in each entry line.
+            log_paths (list[str]): The distinct log files of the entries.
+            sources (list[str]): The source of each log file in `log_paths`.
+            cache (OrderedDict[int, str]): The text of the rows read most recently, by row.
+        """
+        self.timestamps: array = array('q')
+        self.log_codes: array = array('H')
+        self.offsets: array = array('Q')
+        self.lengths: array = array('L')
+        self.columns: array = array('L')
+        self.log_paths: list[str] = []
+        self.sources: list[str] = []
+        self.log_path_codes: dict[str, int] = {}
+        self.cache_rows: int = cache_rows
+        self.cache: OrderedDict[int, str] = OrderedDict()
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def extend(self, entries: list[tuple[int, LogIndex, tuple, str]]):
+        """
+        Adds a batch of entries, as yielded by `ErrorLogQuery.iter_batches`, after the current ones.
+        Their text is not kept.
+
+        Args:
+            entries (list[tuple[int, LogIndex, tuple, str]]): The entries, sorted by date and time.
+        """
+        for timestamp, log_index, (_, _, offset, length, column), _ in entries:
+            log_code = self.log_path_codes.get(log_index.log_path)
+            if log_code is None:
+                log_code = self.log_path_codes[log_index.log_path] = len(self.log_paths)
+                self.log_paths.append(log_index.log_path)
+                self.sources.append(log_index.source)
+            self.timestamps.append(timestamp)
+            self.log_codes.append(log_code)
+            self.offsets.append(offset)
+            self.lengths.append(length)
+            self.columns.append(column)
+
+    def entry_at(self, row: int):
+        """
+        Returns the text of an entry, reading from the logs the block of rows holding it unless it is cached.
+
+        Args:
+            row (int): The position of the entry in the results.
+
+        Returns:
+            (str): The entry, as `source: line`.
+        """
+        entry = self.cache.get(row)
+        if entry is not None:
+            self.cache.move_to_end(row)
+            return entry
+        first = row - row % BLOCK_ROWS
+        for block_row, block_entry in enumerate(self.read_rows(first, min(first + BLOCK_ROWS, len(self))), first):
+            self.cache[block_row] = block_entry
+            self.cache.move_to_end(block_row)
+        while len(self.cache) > self.cache_rows:
+            self.cache.popitem(last=False)
+        return self.cache.get(row) or self.read_rows(row, row + 1)[0]
+
+    def read_rows(self, first: int, last: int):
+        """
+        Reads the text of a range of entries from the logs, opening each log once.
+
+        Args:
+            first (int): The position of the first entry.
+            last (int): The position after the last entry.
+
+        Returns:
+            (list[str]): The entries, as `source: line`.
+        """
+        rows_by_log: dict[int, list[int]] = {}
+        for row in range(first, last):
+            rows_by_log.setdefault(self.log_codes[row], []).append(row)
+        entries = [None] * (last - first)
+        for log_code, rows in rows_by_log.items():
+            source = self.sources[log_code]
+            for row, line in zip(rows, self.read_log_lines(self.log_paths[log_code], rows)):
+                entries[row - first] = f"{source}: {line if line is not None else MISSING_ENTRY}"
+        return entries
+
+    def read_log_lines(self, log_path: str, rows: list[int]):
+        """
+        Reads the lines of entries of one log file. The entries no longer in the log, because it was
+        rotated since the query, are looked for in its segments, from the newest.
+
+        Args:
+            log_path (str): The path of the log file.
+            rows (list[int]): The positions of the entries, in ascending order.
+
+        Returns:
+            (list[str or None]): The line of each entry, or None if it could not be found.
+        """
+        lines = {}
+        pending = rows
+        for file_path in [log_path] + segment_paths(log_path)[::-1]:
+            if not pending:
+                break
+            missing = []
+            try:
+                read = read_ranges(file_path, ((self.offsets[row], self.lengths[row]) for row in pending))
+                for row, line in zip(pending, read):
+                    if starts_with_timestamp(line, self.timestamps[row], self.columns[row]):
+                        lines[row] = line
+                    else:
+                        missing.append(row)
+            except (OSError, EOFError):
+                missing = [row for row in pending if row not in lines]
+            pending = missing
+        return [lines.get(row) for row in rows]
+
+    def find_date(self, date_str: str):
+        """
+        Finds the first entry of a date or, if it has none, of the next date with entries.
+
+        Args:
+            date_str (str): The date (YYYY-MM-DD).
+
+        Returns:
+            (int): The position of the entry, or the number of results if every entry is older.
+        """
+        return bisect_left(self.timestamps, date_key(date_str))
+
+    def export(self, output: TextIO):
+        """
+        Writes every entry to a text stream, one per line, reading them from the logs a block at a
+        time without going through the cache.
+
+        Args:
+            output (TextIO): The text stream to write to.
+
+        Returns:
+            (int): The number of exported entries.
+        """
+        for first in range(0, len(self), EXPORT_ROWS):
+            output.writelines(entry + "\n" for entry in self.read_rows(first, min(first + EXPORT_ROWS, len(self))))
+        return len(self)
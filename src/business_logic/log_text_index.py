@@ -0,0 +1,215 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import logging
+import os
+import struct
+from array import array
+from src.business_logic.log_index import LogIndex
+from src.common.utils.errors import BaseError
+
+TEXT_INDEX_SUFFIX = ".tri"
+HEADER = struct.Struct("<4sQQ")  # Format marker, indexed entries, offset of the last indexed entry
+POSTINGS = struct.Struct("<BL")  # Length of the trigram in bytes, number of entries
+MAGIC = b"LTX2"  # LTX1 indexed only the message of each entry
+
+def trigrams(text: str):
+    """
+    Returns the distinct three character sequences of a text.
+
+    Args:
+        text (str): The lowercase text.
+
+    Returns:
+        (set[str]): The trigrams.
+    """
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def searchable_text(line: str):
+    """
+    Returns the text of a log entry a search is matched against: the whole line, with its
+    date, level and error code, as the entries were searched before they were indexed.
+
+    Args:
+        line (str): The entry line, as `YYYY-MM-DD HH:MM:SS,mmm - LEVEL - [CODE] message`.
+
+    Returns:
+        (str): The lowercase line.
+    """
+    return line.lower()
+
+def search_phrase(search_text: str):
+    """
+    Normalizes a search into the text every matching entry must contain, as typed.
+
+    Args:
+        search_text (str): The search, as typed.
+
+    Returns:
+        (str): The lowercase text, or an empty string if there is nothing to search.
+    """
+    return search_text.lower() if search_text.strip() else ""
+
+class LogTextIndex:
+    def __init__(self, log_index: LogIndex):
+        """
+        Initializes the trigram index of the entries of one log file.
+
+        For each trigram of the entry lines (see `searchable_text`), the index keeps the positions (in `log_index`) of the
+        entries containing it. A text of three or more characters can then only be in the entries
+        holding all its trigrams, so a search reads just those lines to confirm the match.
+        The index is kept in a sidecar file (`{log_path}.tri`) and extended with the entries added
+        to `log_index` since the last update.
+
+        Args:
+            log_index (LogIndex): The index of the entries of the log file.
+
+        Attributes:
+            postings (dict[str, array]): The positions of the entries containing each trigram, in ascending order.
+            indexed_entries (int): The number of entries of `log_index` already indexed.
+            last_offset (int): The offset in the log of the last indexed entry, used to detect that
+                the log was replaced and indexed again.
+        """
+        self.log_index: LogIndex = log_index
+        self.index_path: str = log_index.log_path + TEXT_INDEX_SUFFIX
+        self.reset()
+        self.load()
+
+    def reset(self):
+        """
+        Empties the index, so the entries are indexed again from the first one.
+        """
+        self.postings: dict[str, array] = {}
+        self.indexed_entries: int = 0
+        self.last_offset: int = 0
+        self.log_index_resets: int = self.log_index.resets
+
+    def is_outdated(self):
+        """
+        Checks whether the indexed entries no longer match the log index, because the log was replaced.
+
+        Returns:
+            (bool): True if the entries must be indexed again.
+        """
+        if self.indexed_entries == 0:
+            return False
+        return self.log_index_resets != self.log_index.resets or self.indexed_entries > len(self.log_index) or \
+            self.log_index.offsets[self.indexed_entries - 1] != self.last_offset
+
+    def load(self):
+        """
+        Loads the sidecar file. A missing, unreadable or outdated sidecar (whose entries no longer
+        match the log index) only means the entries are indexed again.
+        """
+        try:
+            with open(self.index_path, "rb") as file:
+                data = file.read()
+            magic, indexed_entries, last_offset = HEADER.unpack_from(data)
+            if magic != MAGIC:
+                raise ValueError("formato desconocido")
+            position = HEADER.size
+            postings = {}
+            while position < len(data):
+                key_length, count = POSTINGS.unpack_from(data, position)
+                position += POSTINGS.size
+                key = data[position:position + key_length].decode("utf-8")
+                position += key_length
+                positions = array('L')
+                positions.frombytes(data[position:position + count * positions.itemsize])
+                position += count * positions.itemsize
+                postings[key] = positions
+            self.postings, self.indexed_entries, self.last_offset = postings, indexed_entries, last_offset
+            self.log_index_resets = self.log_index.resets
+            if self.is_outdated():
+                self.reset()
+        except FileNotFoundError:
+            self.reset()
+        except Exception as e:
+            logging.debug(f"No se pudo leer el índice de texto {self.index_path}: {e}")
+            self.reset()
+
+    def update(self):
+        """
+        Indexes the entries added to the log index since the last update and persists the index.
+        Call `LogIndex.update` first.
+
+        Returns:
+            (int): The number of new entries.
+        """
+        if self.is_outdated():
+            self.reset()
+        new_positions = range(self.indexed_entries, len(self.log_index))
+        if not new_positions:
+            return 0
+        for position, line in self.log_index.read_lines(new_positions):
+            for trigram in trigrams(searchable_text(line)):
+                positions = self.postings.get(trigram)
+                if positions is None:
+                    positions = self.postings[trigram] = array('L')
+                positions.append(position)
+        self.indexed_entries = len(self.log_index)
+        self.last_offset = self.log_index.offsets[self.indexed_entries - 1]
+        self.save()
+        return len(new_positions)
+
+    def save(self):
+        """
+        Writes the index to its sidecar file atomically (temporary file plus rename).
+        """
+        try:
+            chunks = [HEADER.pack(MAGIC, self.indexed_entries, self.last_offset)]
+            for key, positions in self.postings.items():
+                encoded_key = key.encode("utf-8")
+                chunks.append(POSTINGS.pack(len(encoded_key), len(positions)))
+                chunks.append(encoded_key)
+                chunks.append(positions.tobytes())
+            temp_path = self.index_path + ".tmp"
+            with open(temp_path, "wb") as file:
+                file.write(b"".join(chunks))
+            os.replace(temp_path, self.index_path)
+        except Exception as e:
+            BaseError(3001, f"No se pudo guardar el índice {self.index_path}: {e}", level="warning")
+
+    def candidates(self, phrase: str):
+        """
+        Narrows a search down to the entries that may contain a text, those holding all its trigrams.
+        The lines of the candidates must still be checked, since the trigrams may be apart.
+
+        Args:
+            phrase (str): The lowercase text (see `search_phrase`).
+
+        Returns:
+            (set[int] or None): The positions of the candidate entries, or None if the text
+                is shorter than three characters, in which case every entry is a candidate.
+        """
+        postings = []
+        for trigram in trigrams(phrase):
+            positions = self.postings.get(trigram)
+            if positions is None:
+                return set()
+            postings.append(positions)
+        if not postings:
+            return None
+        # Start from the rarest trigram, so the intersections stay small
+        postings.sort(key=len)
+        result = set(postings[0])
+        for positions in postings[1:]:
+            result.intersection_update(positions)
+            if not result:
+                break
+        return result
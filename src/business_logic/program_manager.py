@@ -22,7 +22,15 @@ import configparser
 import logging
 from logging import config
 import os
+import threading
+import time
+from datetime import datetime
 from typing import Callable
+from src.business_logic.attendance_count_store import AttendanceCountStore
+from src.business_logic.attendance_batch import AttendanceBatch
+from src.business_logic.backup_replicator import BackupReplicator
+from src.business_logic.devices_scanner import attendance_file_path, find_attendance_file, read_device_districts
+from src.business_logic.reported_errors_store import ReportedErrorsStore, device_file_identity, format_error_line, remove_legacy_reported_files
 from src.common.business_logic.attendances_manager import AttendancesManagerBase
 from src.common.business_logic.connection_manager import ConnectionManager
 from src.common.business_logic.models.device import Device
@@ -31,57 +39,133 @@ from src.common.business_logic.shared_state import SharedState
 from src.common.business_logic.types import ConnectionInfo, DeviceInfo
 from src.common.utils.errors import BatteryFailingError, NetworkError, ConnectionFailedError, BaseError, ObtainAttendancesError, OutdatedTimeError
 from src.common.utils.file_manager import find_marker_directory, find_root_directory
+from src.utils.config_store import read_config, set_config_value
 config = configparser.ConfigParser()
 
+# Minimum time between two progress updates, in seconds
+PROGRESS_INTERVAL = 0.1
+# Records a device holds before overwriting the oldest ones, unless `attendance_capacity` is configured.
+# Most ZKTeco models hold at least this many, so larger devices are only downloaded more often
+DEFAULT_ATTENDANCE_CAPACITY = 50_000
+
 class ProgressTracker:
-    def __init__(self, state: SharedState, emit_progress: Callable):
+    def __init__(self, state: SharedState, emit_progress: Callable, emit_device_results: Callable = None,
+                 interval: float = PROGRESS_INTERVAL):
         """
-        Initializes the ProgramManager instance.
+        Initializes the ProgressTracker instance, shared by every device of an operation.
 
         Args:
             state (SharedState): The shared state object used to manage and share data across components.
             emit_progress (Callable): A callable function used to emit progress updates.
+            emit_device_results (Callable, optional): A callable function used to emit the results of the
+                devices processed since the previous update, by IP. Defaults to None.
+            interval (float, optional): The minimum time between two updates, in seconds.
+                Defaults to `PROGRESS_INTERVAL`.
         """
         self.state: SharedState = state
         self.emit_progress: Callable = emit_progress
-
-    def update(self, device: Device):
+        self.emit_device_results: Callable = emit_device_results
+        self.interval: float = interval
+        self.lock = threading.Lock()
+        self.start_time: float = time.monotonic()
+        self.last_emit_time: float = 0.0
+        self.processed_devices: int = 0
+        self.emitted_devices: int = 0
+        self.last_device: str = None
+        self.pending_results: dict[str, dict] = {}
+
+    def update(self, device: Device, result: dict = None):
         """
-        Updates the progress of processing a device and emits progress information if applicable.
+        Records a processed device and emits the progress, at most once per `interval`.
+
+        The devices processed between two updates are coalesced into the next one, so large fleets
+        do not flood the UI with one signal per device. The last device of the operation is always emitted.
 
         Args:
             device (Device): The device object being processed.
-
-        Behavior:
-            - Increments the count of processed devices in the current state.
-            - Calculates the progress percentage based on the total devices.
-            - Emits progress information including:
-                - Percent progress.
-                - IP address of the device being processed.
-                - Number of processed devices.
-                - Total number of devices.
-            - Logs the progress details for debugging purposes.
+            result (dict, optional): The result of the device, as it will appear in the result of the
+                whole operation, emitted through `emit_device_results`. Defaults to None (no result).
 
         Exceptions:
             - Catches any exception that occurs during the update process and raises a `BaseError`
               with an error code of 3000 and a descriptive message.
         """
         try:
-            if self.state:
-                processed_devices: int = self.state.increment_processed_devices()
-                if self.emit_progress:
-                    progress: int = self.state.calculate_progress()
-                    self.emit_progress(
-                        percent_progress=progress,
-                        device_progress=device.ip,
-                        processed_devices=processed_devices,
-                        total_devices=self.state.get_total_devices()
-                    )
-                    logging.debug(f"Processed: {processed_devices}/{self.state.get_total_devices()}, Progress: {progress}%")
+            with self.lock:
+                self.processed_devices = self.state.increment_processed_devices() if self.state else self.processed_devices + 1
+                self.last_device = device.ip
+                if self.emit_device_results:
+                    self.pending_results[device.ip] = result or {}
+                now: float = time.monotonic()
+                total_devices: int = self.state.get_total_devices() if self.state else 0
+                if now - self.last_emit_time < self.interval and self.processed_devices < total_devices:
+                    return
+                self.emit(now, total_devices)
         except Exception as e:
             BaseError(3000, f'Error actualizando el progreso: {str(e)}')
         return
 
+    def flush(self):
+        """
+        Emits the progress and the results not emitted yet, e.g. when an operation ends
+        before every device is processed.
+        """
+        try:
+            with self.lock:
+                if self.pending_results or self.emitted_devices != self.processed_devices:
+                    self.emit(time.monotonic(), self.state.get_total_devices() if self.state else 0)
+        except Exception as e:
+            BaseError(3000, f'Error actualizando el progreso: {str(e)}')
+
+    def emit(self, now: float, total_devices: int):
+        """
+        Emits the progress, with the throughput and the estimated time left, and the pending results.
+        Must be called with `lock` held.
+
+        Args:
+            now (float): The current time, from `time.monotonic`.
+            total_devices (int): The total number of devices of the operation.
+        """
+        self.last_emit_time = now
+        self.emitted_devices = self.processed_devices
+        if self.emit_progress and self.last_device:
+            elapsed: float = now - self.start_time
+            devices_per_second: float = self.processed_devices / elapsed if elapsed > 0 else 0.0
+            remaining_devices: int = max(total_devices - self.processed_devices, 0)
+            eta_seconds: float = remaining_devices / devices_per_second if devices_per_second > 0 else None
+            progress: int = int(self.processed_devices * 100 / total_devices) if total_devices else 100
+            self.emit_progress(
+                percent_progress=progress,
+                device_progress=self.last_device,
+                processed_devices=self.processed_devices,
+                total_devices=total_devices,
+                devices_per_second=devices_per_second,
+                eta_seconds=eta_seconds
+            )
+            logging.debug(f"Processed: {self.processed_devices}/{total_devices}, Progress: {progress}%, "
+                          f"{devices_per_second:.2f} devices/s")
+        if self.pending_results:
+            results, self.pending_results = self.pending_results, {}
+            self.emit_device_results(results)
+
+def is_cancelled(cancel_event: threading.Event, device: Device):
+    """
+    Checks, before the next safe step on a device, whether its operation was cancelled.
+    The devices still queued are skipped and those in progress stop before their next step,
+    closing their connection, so the operation returns the results obtained so far.
+
+    Args:
+        cancel_event (threading.Event): The event set to cancel the operation, or None.
+        device (Device): The device about to be processed.
+
+    Returns:
+        (bool): True if the operation was cancelled, False otherwise.
+    """
+    if cancel_event and cancel_event.is_set():
+        logging.debug(f"{device.ip} - Operación cancelada")
+        return True
+    return False
+
 class AttendancesManager(AttendancesManagerBase):
     def __init__(self):
         """
@@ -98,7 +182,8 @@ class AttendancesManager(AttendancesManagerBase):
         self.state = SharedState()
         super().__init__(self.state)
 
-    def manage_devices_attendances(self, selected_ips: list[str], emit_progress: Callable = None):
+    def manage_devices_attendances(self, selected_ips: list[str], emit_progress: Callable = None, emit_device_results: Callable = None,
+                                   cancel_event: threading.Event = None):
         """
         Manages the attendance records for the specified devices.
         This method processes attendance data for the devices with the given IPs.
@@ -108,28 +193,55 @@ class AttendancesManager(AttendancesManagerBase):
         Args:
             selected_ips (list[str]): A list of IP addresses of the devices to manage.
             emit_progress (Callable, optional): A callable function to emit progress updates. Defaults to None.
+            emit_device_results (Callable, optional): A callable function to emit the results of the devices
+                processed since the previous progress update, by IP (see `ProgressTracker`). Defaults to None.
+            cancel_event (threading.Event, optional): An event that cancels the operation when set; the results
+                obtained so far are returned (see `is_cancelled`). Defaults to None.
         
         Returns:
-            (int): The count of attendances processed.
+            (dict[str, dict]): The result of each device, by IP: whether the "connection failed" or its
+                "attendance count" and the "attendances with error" not reported before
+                (see `describe_attendances_with_error`).
 
         Side Effects:
-            - Reads configuration settings from 'config.ini'.
+            - Reads configuration settings from 'config.ini' (see `read_config`).
             - Resets the internal state before processing.
-            - Updates the 'force_clear_attendance' setting in 'config.ini' if it was set to True.
+            - Updates the 'force_clear_attendance' setting in 'config.ini' if it was set to True and
+              every selected device was cleared.
+            - Persists the number of records left on each device in `attendance_counts.json`, after
+              forgetting those changed by another process (see `AttendanceCountStore.forget_changed_elsewhere`).
+            - Records the returned attendances with error as reported (see `ReportedErrorsStore`).
+            - Starts the background replication of the `devices/` folder to the backup directory, the only
+              copy made of the attendance files (see `write_attendance_file`).
         """
         self.emit_progress: Callable = emit_progress
-        config.read(os.path.join(find_root_directory(), 'config.ini'))
+        read_config(config)
         self.clear_attendance: bool = config.getboolean('Device_config', 'clear_attendance')
         self.force_clear_attendance: bool = config.getboolean('Device_config', 'force_clear_attendance')
+        self.skip_unchanged_attendances: bool = config.getboolean('Device_config', 'skip_unchanged_attendances', fallback=True)
+        self.attendance_capacity: int = config.getint('Device_config', 'attendance_capacity', fallback=DEFAULT_ATTENDANCE_CAPACITY)
+        clear_attendance: bool = self.clear_attendance
         logging.debug(f'force_clear_attendance: {self.force_clear_attendance}')
+        self.attendance_counts = AttendanceCountStore()
+        self.attendance_counts.forget_changed_elsewhere()
+        self.device_districts: dict[str, str] = read_device_districts(os.path.join(find_root_directory(), "info_devices.txt"))
+        self.cleared_devices: set[str] = set()
         self.state.reset()
+        self.progress_tracker = ProgressTracker(self.state, emit_progress, emit_device_results)
+        self.cancel_event: threading.Event = cancel_event
         attendances_count = super().manage_devices_attendances(selected_ips)
-        if self.force_clear_attendance:
+        self.progress_tracker.flush()
+        self.attendance_counts.save()
+        self.keep_new_attendances_with_error(attendances_count)
+        # The forced clearing is kept until every selected device was actually cleared,
+        # e.g. after a failed connection or a cancelled download
+        not_cleared: set[str] = set(selected_ips) - self.cleared_devices
+        if self.force_clear_attendance and clear_attendance and not_cleared:
+            logging.info(f'El forzado de eliminación de marcaciones sigue habilitado para {len(not_cleared)} dispositivos sin borrar')
+        elif self.force_clear_attendance:
             self.force_clear_attendance = False
-            config['Device_config']['force_clear_attendance'] = 'False'
-
-            with open('config.ini', 'w') as configfile:
-                config.write(configfile)
+            set_config_value('Device_config', 'force_clear_attendance', False, config)
+        BackupReplicator.from_config(config).replicate_in_background()
         return attendances_count
 
     def manage_attendances_of_one_device(self, device: Device):
@@ -144,14 +256,21 @@ class AttendancesManager(AttendancesManagerBase):
 
         Workflow:
             1. Establishes a connection to the device using `ConnectionManager`.
-            2. Retrieves attendance data from the device.
-            3. Formats the attendance data and handles any errors during formatting.
-            4. Clears attendance data on the device based on the `clear_attendance` flag.
-            5. Updates the device's model name if possible.
-            6. Processes individual and global attendance records.
-            7. Synchronizes the device's time and handles time-related errors.
-            8. Updates the attendance count for the device in a shared dictionary.
-            9. Ensures proper disconnection from the device and updates progress tracking.
+            2. Reads the record count reported by the device and, if it matches the count
+               persisted after the last download, skips the bulk transfer (and steps 3, 4 and 6),
+               unless the device would be cleared or may be full (see `can_skip_download`).
+            3. Retrieves attendance data from the device and verifies it against the reported count.
+            4. Separates the valid attendances from those with errors in one pass (see `split_attendances`).
+            5. Clears attendance data on the device based on the `clear_attendance` flag.
+            6. Updates the device's model name if possible.
+            7. Writes the device file of the day (see `write_attendance_file`) and the global attendance records.
+            8. Synchronizes the device's time and handles time-related errors.
+            9. Updates the attendance count and the attendances with error (with the file the download
+               wrote to and their line) for the device in a shared dictionary.
+            10. Ensures proper disconnection from the device and updates progress tracking.
+
+            If the operation is cancelled, the device is skipped while queued, or disconnected before
+            step 2. Once the download starts, the device is processed to the end.
 
         Exceptions:
             - Handles `NetworkError` and `ObtainAttendancesError` during connection and data retrieval.
@@ -166,7 +285,10 @@ class AttendancesManager(AttendancesManagerBase):
         Returns:
             None
         """
+        if is_cancelled(self.cancel_event, device):
+            return
         logging.debug(f"Iniciando {device.ip}")
+        start_time = time.perf_counter()
         try:
             try:
                 conn_manager = ConnectionManager(device.ip, 4370, device.communication)
@@ -175,16 +297,38 @@ class AttendancesManager(AttendancesManagerBase):
                 conn_manager.connect_with_retry()
                 #end_time = time.time()
                 #logging.debug(f'{device.ip} - Tiempo de conexión total: {(end_time - start_time):2f}')
-                attendances: list[Attendance] = conn_manager.get_attendances()
-                #logging.info(f'{device.ip} - PREFORMATEO - Longitud marcaciones: {len(attendances)} - Marcaciones: {attendances}')
-                attendances, attendances_with_error = self.format_attendances(attendances, device.id)
-                if len(attendances_with_error) > 0:
-                    if not self.force_clear_attendance:
-                        self.clear_attendance = False
-                        logging.debug(f'No se eliminaran las marcaciones correspondientes al dispositivo {device.ip}')
-                #logging.info(f'{device.ip} - POSTFORMATEO - Longitud marcaciones: {len(attendances)} - Marcaciones: {attendances}')
-                logging.debug(f'clear_attendance: {self.clear_attendance}')
-                conn_manager.clear_attendances(self.clear_attendance)
+                if is_cancelled(self.cancel_event, device):
+                    return
+                reported_count: int = self.obtain_reported_attendance_count(conn_manager)
+                download_skipped: bool = self.can_skip_download(device, reported_count)
+                remaining_count: int = None  # The records left on the device, if known
+                if download_skipped:
+                    logging.debug(f'{device.ip} - Sin marcaciones nuevas ({reported_count}), se omite la descarga')
+                    attendances: list[Attendance] = []
+                    valid_indexes: list[int] = []
+                    attendances_with_error = AttendanceBatch()
+                else:
+                    attendances: list[Attendance] = conn_manager.get_attendances()
+                    downloaded_count: int = len(attendances)
+                    if reported_count is not None and downloaded_count != reported_count:
+                        BaseError(2004, f'{device.model_name}, {device.point}, {device.ip}: {reported_count} registradas, {downloaded_count} obtenidas', level="warning")
+                    #logging.info(f'{device.ip} - PREFORMATEO - Longitud marcaciones: {len(attendances)} - Marcaciones: {attendances}')
+                    # The download is held as typed columns; the objects only live until the files are written
+                    batch = AttendanceBatch.from_attendances(attendances)
+                    valid_indexes, attendances_with_error = self.split_attendances(device, batch)
+                    if len(attendances_with_error) > 0:
+                        if not self.force_clear_attendance:
+                            self.clear_attendance = False
+                            logging.debug(f'No se eliminaran las marcaciones correspondientes al dispositivo {device.ip}')
+                    #logging.info(f'{device.ip} - POSTFORMATEO - Longitud marcaciones: {len(attendances)} - Marcaciones: {attendances}')
+                    logging.debug(f'clear_attendance: {self.clear_attendance}')
+                    conn_manager.clear_attendances(self.clear_attendance)
+                    if self.clear_attendance:
+                        with self.lock:
+                            self.cleared_devices.add(device.ip)
+                        remaining_count = 0
+                    elif reported_count is not None and downloaded_count == reported_count:
+                        remaining_count = reported_count
             except (NetworkError, ObtainAttendancesError) as e:
                 with self.lock:
                     self.attendances_count_devices[device.ip] = {
@@ -199,8 +343,18 @@ class AttendancesManager(AttendancesManagerBase):
             except Exception as e:
                 pass
 
-            self.manage_individual_attendances(device, attendances)
-            self.manage_global_attendances(attendances)
+            file_path: str = None
+            if not download_skipped:
+                file_path = self.write_attendance_file(device, batch, valid_indexes)
+                # The global file is written by the common layer, which takes `Attendance` objects
+                valid_attendances: list[Attendance] = [attendances[index] for index in valid_indexes]
+                if file_path is None:
+                    # Without the district of the device its folder is unknown, so the common layer writes the file
+                    self.manage_individual_attendances(device, valid_attendances)
+                    file_path = self.find_written_file(device)
+                self.manage_global_attendances(valid_attendances)
+                attendances = valid_attendances = None
+                self.record_attendance_count(device, remaining_count, file_path)
 
             try:
                 conn_manager.update_time()
@@ -210,18 +364,208 @@ class AttendancesManager(AttendancesManagerBase):
                 HourManager().update_battery_status(device.ip)
                 BatteryFailingError(device.model_name, device.point, device.ip)
 
+            errors: list[dict[str, str]] = self.describe_attendances_with_error(device, attendances_with_error, file_path)
             with self.lock:
                 self.attendances_count_devices[device.ip] = {
-                    "attendance count": str(len(attendances))
+                    "attendance count": str(len(valid_indexes)),
+                    "attendances with error": errors
                 }
         except Exception as e:
             pass
         finally:
             if conn_manager.is_connected():
                 conn_manager.disconnect()
-            ProgressTracker(self.state, self.emit_progress).update(device)
-            logging.debug(f"Finalizando {device.ip}")
+            self.progress_tracker.update(device, self.attendances_count_devices.get(device.ip))
+            logging.debug(f"Finalizando {device.ip}",
+                          extra={"ip": device.ip, "operation": "obtain_attendances", "duration": time.perf_counter() - start_time})
         return
+
+    def split_attendances(self, device: Device, batch: AttendanceBatch):
+        """
+        Separates the valid attendances of a download from the malformed, older than three months
+        and future ones, classifying the whole download at once (see `AttendanceBatch.partition`)
+        instead of checking one `Attendance` at a time. Repeated records are written once and not reported.
+
+        Args:
+            device (Device): The device the attendances were downloaded from.
+            batch (AttendanceBatch): The downloaded attendances.
+
+        Returns:
+            (tuple[list[int], AttendanceBatch]): The indexes of the valid attendances and the attendances with error.
+        """
+        valid_indexes, error_indexes = batch.partition()
+        repeated: int = len(batch) - len(valid_indexes) - len(error_indexes)
+        if repeated:
+            logging.debug(f'{device.ip} - Se omitieron {repeated} marcaciones repetidas')
+        return valid_indexes, batch.select(error_indexes)
+
+    def describe_attendances_with_error(self, device: Device, attendances_with_error: AttendanceBatch, file_path: str = None):
+        """
+        Describes the attendances with error of a download while they are still in memory, so the
+        2003 report does not need to read the files back.
+
+        Args:
+            device (Device): The device the attendances were downloaded from.
+            attendances_with_error (AttendanceBatch): The attendances separated by `split_attendances`.
+            file_path (str, optional): The file the download wrote to (see `write_attendance_file`),
+                or None if it was not found, in which case the errors are reported without it.
+
+        Returns:
+            (list[dict[str, str]]): One entry per attendance, with its "ip", "date", "file_path" and "line".
+        """
+        if not len(attendances_with_error):
+            return []
+        date: str = datetime.now().strftime("%Y-%m-%d")
+        return [
+            {
+                "ip": device.ip,
+                "date": date,
+                "file_path": file_path,
+                "line": format_error_line(attendances_with_error.user_id_at(index), attendances_with_error.timestamp_at(index))
+            }
+            for index in range(len(attendances_with_error))
+        ]
+
+    def keep_new_attendances_with_error(self, devices: dict[str, dict]):
+        """
+        Leaves in the result of each device only the attendances with error not reported before,
+        and records them as reported (see `ReportedErrorsStore`).
+
+        Args:
+            devices (dict[str, dict]): The result of each device, by IP, as built by
+                `manage_attendances_of_one_device`.
+        """
+        try:
+            devices_path: str = os.path.join(find_root_directory(), "devices")
+            remove_legacy_reported_files()
+            reported_errors = ReportedErrorsStore()
+            new_reported: int = 0
+            for device in devices.values():
+                new_errors: list[dict[str, str]] = []
+                for error in device.get("attendances with error", []):
+                    # Without its file, the error is identified by the device IP alone
+                    device_file: str = device_file_identity(devices_path, error["file_path"]) if error["file_path"] else error["ip"]
+                    error_id: int = ReportedErrorsStore.make_key(device_file, error["line"])
+                    if error_id in reported_errors:
+                        continue  # This error was already reported
+                    reported_errors.add(error_id)
+                    new_errors.append(error)
+                if "attendances with error" in device:
+                    device["attendances with error"] = new_errors
+                new_reported += len(new_errors)
+            if new_reported:
+                reported_errors.save()
+        except Exception as e:
+            BaseError(3000, f'Error registrando las marcaciones con error: {str(e)}', level="warning")
+
+    def can_skip_download(self, device: Device, reported_count: int):
+        """
+        Checks whether the bulk transfer of a device can be skipped because its records did not change.
+
+        Args:
+            device (Device): The device.
+            reported_count (int): The record count reported by the device, or None.
+
+        Returns:
+            (bool): True if the count matches the one persisted after the last download and the
+                device would neither be cleared nor may be full, False otherwise.
+        """
+        if not self.skip_unchanged_attendances or reported_count is None:
+            return False
+        # A device that would be cleared is always downloaded, so the clearing is not lost
+        if self.force_clear_attendance or (self.clear_attendance and reported_count > 0):
+            return False
+        # A full device overwrites its oldest records, so its count does not change
+        if reported_count >= self.attendance_capacity:
+            return False
+        return reported_count == self.attendance_counts.get(device.ip)
+
+    def write_attendance_file(self, device: Device, batch: AttendanceBatch, indexes: list[int]):
+        """
+        Appends the valid attendances of a download to the file of the device for the current day,
+        `devices/{distrito}/{modelo}-{punto}/ip_YYYY-MM-DD_file.cro` (see `AttendanceBatch.iter_lines`).
+
+        The file is written once: its backup copy is made after the run by `BackupReplicator`,
+        not on this path.
+
+        Args:
+            device (Device): The device the attendances were downloaded from.
+            batch (AttendanceBatch): The downloaded attendances.
+            indexes (list[int]): The indexes of the valid attendances, in order.
+
+        Returns:
+            (str or None): The path of the file, or None if the district of the device is not in
+                `info_devices.txt` or no file was written.
+        """
+        district: str = self.device_districts.get(device.ip)
+        if not district:
+            logging.warning(f'{device.ip} - No se encontró el distrito del dispositivo en info_devices.txt')
+            return None
+        file_path: str = attendance_file_path(
+            os.path.join(find_root_directory(), "devices"), district, device.model_name, device.point,
+            device.ip, datetime.now().strftime("%Y-%m-%d")
+        )
+        if indexes:
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, "a", encoding="utf-8") as file:
+                file.writelines(batch.iter_lines(indexes))
+        return file_path if os.path.isfile(file_path) else None
+
+    def find_written_file(self, device: Device):
+        """
+        Finds the file the common layer wrote the download of a device to today, looking first in the
+        folder where it was written before (see `find_attendance_file`).
+
+        Args:
+            device (Device): The device.
+
+        Returns:
+            (str or None): The path of the file, or None if it was not found.
+        """
+        try:
+            return find_attendance_file(
+                os.path.join(find_root_directory(), "devices"), device.ip,
+                datetime.now().strftime("%Y-%m-%d"), self.attendance_counts.get_folder(device.ip)
+            )
+        except OSError as e:
+            logging.warning(f'{device.ip} - No se encontró el archivo de marcaciones: {e}')
+            return None
+
+    def record_attendance_count(self, device: Device, remaining_count: int, file_path: str = None):
+        """
+        Persists the records left on a device once its attendances were written, with the folder
+        they were written to, or forgets its count if it cannot be trusted.
+
+        Args:
+            device (Device): The device.
+            remaining_count (int): The records left on the device, or None if not known.
+            file_path (str, optional): The file the download wrote to. Defaults to None.
+        """
+        if remaining_count is None:
+            # The count cannot be trusted, download the device again next time
+            self.attendance_counts.forget(device.ip)
+            return
+        self.attendance_counts.set(device.ip, remaining_count, os.path.dirname(file_path) if file_path else None)
+
+    def obtain_reported_attendance_count(self, conn_manager: ConnectionManager):
+        """
+        Reads the number of records the device reports, without downloading them.
+
+        Args:
+            conn_manager (ConnectionManager): The connected manager of the device.
+
+        Returns:
+            (int or None): The reported count, or None if the device did not report it,
+                in which case the records are always downloaded.
+        """
+        try:
+            device_info: DeviceInfo = conn_manager.obtain_device_info()
+            return int(device_info.get("attendance_count"))
+        except NetworkError:
+            raise
+        except Exception as e:
+            logging.debug(f'No se pudo obtener la cantidad de marcaciones: {e}')
+            return None
         
 class HourManager(HourManagerBase):
     def __init__(self):
@@ -239,20 +583,29 @@ class HourManager(HourManagerBase):
         self.state = SharedState()
         super().__init__(self.state)
 
-    def manage_hour_devices(self, selected_ips: list[str], emit_progress: Callable = None):
+    def manage_hour_devices(self, selected_ips: list[str], emit_progress: Callable = None, emit_device_results: Callable = None,
+                            cancel_event: threading.Event = None):
         """
         Synchronizes the time on a list of devices identified by their IP addresses.
 
         Args:
             selected_ips (list[str]): A list of IP addresses of the devices to update.
             emit_progress (Callable, optional): A callback function to emit progress updates. Defaults to None.
+            emit_device_results (Callable, optional): A callback function to emit the errors of the devices
+                processed since the previous progress update, by IP (see `ProgressTracker`). Defaults to None.
+            cancel_event (threading.Event, optional): An event that cancels the operation when set; the results
+                obtained so far are returned (see `is_cancelled`). Defaults to None.
 
         Returns:
             (Any): The result of the `update_devices_time` method from the superclass.
         """
         self.emit_progress: Callable = emit_progress
         self.state.reset()
-        return super().update_devices_time(selected_ips)
+        self.progress_tracker = ProgressTracker(self.state, emit_progress, emit_device_results)
+        self.cancel_event: threading.Event = cancel_event
+        devices_errors = super().update_devices_time(selected_ips)
+        self.progress_tracker.flush()
+        return devices_errors
 
     def update_device_time_of_one_device(self, device: Device):
         """
@@ -277,12 +630,18 @@ class HourManager(HourManagerBase):
             - Updates the battery status if an outdated time error occurs.
             - Ensures the connection is properly closed in the `finally` block.
             - Tracks progress using the `ProgressTracker` class.
+            - Skips the device, or stops before updating its time, if the operation was cancelled.
         """
+        if is_cancelled(self.cancel_event, device):
+            return
         logging.debug(f"Iniciando {device.ip}")
+        start_time = time.perf_counter()
         try:
             try:
                 conn_manager: ConnectionManager = ConnectionManager(device.ip, 4370, device.communication)
                 conn_manager.connect_with_retry()
+                if is_cancelled(self.cancel_event, device):
+                    return
                 with self.lock:
                     self.devices_errors[device.ip] = { "connection failed": False }
                 conn_manager.update_time()
@@ -306,8 +665,9 @@ class HourManager(HourManagerBase):
         finally:
             if conn_manager.is_connected():
                 conn_manager.disconnect()
-            ProgressTracker(self.state, self.emit_progress).update(device)
-            logging.debug(f"Finalizando {device.ip}")
+            self.progress_tracker.update(device, self.devices_errors.get(device.ip))
+            logging.debug(f"Finalizando {device.ip}",
+                          extra={"ip": device.ip, "operation": "update_time", "duration": time.perf_counter() - start_time})
         return
 
 class RestartManager(OperationManager):
@@ -330,7 +690,8 @@ class RestartManager(OperationManager):
         self.devices_errors: dict[str, dict[str, bool]] = {}
         super().__init__(self.state)
 
-    def restart_devices(self, selected_ips: list[str], emit_progress: Callable = None):
+    def restart_devices(self, selected_ips: list[str], emit_progress: Callable = None, emit_device_results: Callable = None,
+                        cancel_event: threading.Event = None):
         """
         Restarts the devices specified by their IP addresses.
         This method clears any existing device errors, resets the state, and manages
@@ -341,6 +702,10 @@ class RestartManager(OperationManager):
             selected_ips (list[str]): A list of IP addresses of the devices to restart.
             emit_progress (Callable, optional): A callable function to emit progress updates. 
                 Defaults to None.
+            emit_device_results (Callable, optional): A callable function to emit the errors of the devices
+                processed since the previous progress update, by IP (see `ProgressTracker`). Defaults to None.
+            cancel_event (threading.Event, optional): An event that cancels the operation when set; the results
+                obtained so far are returned (see `is_cancelled`). Defaults to None.
         
         Returns:
             (dict): A dictionary containing errors encountered during the restart process, 
@@ -349,7 +714,10 @@ class RestartManager(OperationManager):
         self.devices_errors.clear()
         self.emit_progress: Callable = emit_progress
         self.state.reset()
+        self.progress_tracker = ProgressTracker(self.state, emit_progress, emit_device_results)
+        self.cancel_event: threading.Event = cancel_event
         super().manage_threads_to_devices(selected_ips=selected_ips, function=self.restart_device)
+        self.progress_tracker.flush()
 
         if len(self.devices_errors) > 0:
             return self.devices_errors
@@ -372,11 +740,16 @@ class RestartManager(OperationManager):
             - Updates the device error state in a thread-safe manner using a lock.
             - Ensures the connection is properly closed in the `finally` block.
             - Tracks progress using the `ProgressTracker` class.
+            - Skips the device, or stops before restarting it, if the operation was cancelled.
         """
+        if is_cancelled(self.cancel_event, device):
+            return
         try:
             try:
                 conn_manager: ConnectionManager = ConnectionManager(device.ip, 4370, device.communication)
                 conn_manager.connect_with_retry()
+                if is_cancelled(self.cancel_event, device):
+                    return
                 with self.lock:
                     self.devices_errors[device.ip] = { "connection failed": False }
                 conn_manager.restart_device()
@@ -391,7 +764,7 @@ class RestartManager(OperationManager):
         finally:
             if conn_manager.is_connected():
                 conn_manager.disconnect()
-            ProgressTracker(self.state, self.emit_progress).update(device)
+            self.progress_tracker.update(device, self.devices_errors.get(device.ip))
         return
 
 class ConnectionsInfo(OperationManager):
@@ -412,7 +785,8 @@ class ConnectionsInfo(OperationManager):
         self.connections_info: dict[str, ConnectionInfo] = {}
         super().__init__(self.state)
 
-    def obtain_connections_info(self, selected_ips: list[str], emit_progress: Callable = None):
+    def obtain_connections_info(self, selected_ips: list[str], emit_progress: Callable = None, emit_device_results: Callable = None,
+                                cancel_event: threading.Event = None):
         """
         Obtains connection information for a list of selected IPs and manages the threading process 
         to retrieve this information from devices.
@@ -421,6 +795,11 @@ class ConnectionsInfo(OperationManager):
             selected_ips (list[str]): A list of IP addresses to connect to and retrieve information from.
             emit_progress (Callable, optional): A callable function to emit progress updates during 
                 the operation. Defaults to None.
+            emit_device_results (Callable, optional): A callable function to emit the connection information
+                of the devices processed since the previous progress update, by IP (see `ProgressTracker`).
+                Defaults to None.
+            cancel_event (threading.Event, optional): An event that cancels the operation when set; the results
+                obtained so far are returned (see `is_cancelled`). Defaults to None.
         
         Returns:
             (dict): A dictionary containing connection information for the devices if any connections 
@@ -429,8 +808,11 @@ class ConnectionsInfo(OperationManager):
         self.connections_info.clear()
         self.emit_progress: Callable = emit_progress
         self.state.reset()
+        self.progress_tracker = ProgressTracker(self.state, emit_progress, emit_device_results)
+        self.cancel_event: threading.Event = cancel_event
 
         super().manage_threads_to_devices(selected_ips=selected_ips, function=self.obtain_connection_info)
+        self.progress_tracker.flush()
 
         if len(self.connections_info) > 0:
             return self.connections_info
@@ -465,14 +847,20 @@ class ConnectionsInfo(OperationManager):
 
         Note:
             This method uses a lock to ensure thread-safe updates to the shared 
-            `connections_info` dictionary.
+            `connections_info` dictionary. The device is skipped, or its connection closed
+            before pinging it, if the operation was cancelled.
         """
+        if is_cancelled(self.cancel_event, device):
+            return
         try:
             try:
                 logging.debug(f"Iniciando {device.ip}")
+                start_time = time.perf_counter()
                 conn_manager: ConnectionManager = ConnectionManager(device.ip, 4370, device.communication)
                 connection_info: ConnectionInfo = ConnectionInfo()
                 conn_manager.connect_with_retry()
+                if is_cancelled(self.cancel_event, device):
+                    return
                 test_ping_connection: bool = conn_manager.ping_device()
                 if test_ping_connection:
                     device_info: DeviceInfo = conn_manager.obtain_device_info()
@@ -500,6 +888,7 @@ class ConnectionsInfo(OperationManager):
         finally:
             if conn_manager.is_connected():
                 conn_manager.disconnect()
-            ProgressTracker(self.state, self.emit_progress).update(device)
-            logging.debug(f"Finalizando {device.ip}")
+            self.progress_tracker.update(device, self.connections_info.get(device.ip))
+            logging.debug(f"Finalizando {device.ip}",
+                          extra={"ip": device.ip, "operation": "connection_info", "duration": time.perf_counter() - start_time})
         return
\ No newline at end of file
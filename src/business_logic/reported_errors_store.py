@@ -0,0 +1,196 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import glob
+import hashlib
+import logging
+import os
+import struct
+import tempfile
+import threading
+import time
+import urllib.parse
+from datetime import datetime
+from src.business_logic.cro_parser import format_line
+from src.common.utils.errors import BaseError
+from src.common.utils.file_manager import find_root_directory
+
+RECORD = struct.Struct("<QI")  # 64-bit key hash, reporting time in epoch seconds
+SECONDS_PER_DAY = 86400
+
+class ReportedErrorsStore:
+    def __init__(self, file_path: str = None, max_entries: int = 200_000, max_age_days: int = 120):
+        """
+        Initializes the ReportedErrorsStore instance.
+
+        The store remembers which incorrect attendances were already reported, so they do not
+        trigger the 2003 report again on later checks or days. Each error is kept as a 64-bit
+        hash plus the time it was reported (12 bytes on disk), in a dictionary for O(1) lookups.
+
+        Args:
+            file_path (str, optional): The binary file where the store is persisted.
+                Defaults to `reported_attendance_errors.dat` in the root directory.
+            max_entries (int, optional): The maximum number of errors kept; the oldest ones are
+                dropped first. Defaults to 200000.
+            max_age_days (int, optional): The number of days after which an error is forgotten.
+                Older records are rejected by the three months check anyway. Defaults to 120.
+        """
+        self.file_path: str = file_path or os.path.join(find_root_directory(), "reported_attendance_errors.dat")
+        self.max_entries: int = max_entries
+        self.max_age_days: int = max_age_days
+        self.lock = threading.Lock()
+        self.entries: dict[int, int] = {}
+        self.load()
+
+    @staticmethod
+    def make_key(device_file: str, line: str):
+        """
+        Hashes an error into its key.
+
+        Args:
+            device_file (str): The identity of the file, without its date (see `device_file_identity`),
+                so the same record downloaded again on another day has the same key.
+            line (str): The content of the incorrect line. Only its user ID, date and time
+                (the first three fields) are used, so a line read from a file and one built
+                from a downloaded attendance (see `format_error_line`) have the same key.
+
+        Returns:
+            (int): The 64-bit key.
+        """
+        record = " ".join(line.split()[:3])
+        digest = hashlib.blake2b(f"{device_file}\0{record}".encode("utf-8"), digest_size=8).digest()
+        return int.from_bytes(digest, "little")
+
+    def load(self):
+        """
+        Loads the persisted errors and drops the expired ones. A missing or unreadable
+        store only means the errors are reported once more.
+        """
+        try:
+            with open(self.file_path, "rb") as file:
+                data = file.read()
+            usable = len(data) - len(data) % RECORD.size
+            self.entries = dict(RECORD.iter_unpack(data[:usable]))
+        except FileNotFoundError:
+            self.entries = {}
+        except Exception as e:
+            logging.warning(f"No se pudo leer {self.file_path}: {e}")
+            self.entries = {}
+        self.expire()
+
+    def __contains__(self, key: int):
+        with self.lock:
+            return key in self.entries
+
+    def __len__(self):
+        with self.lock:
+            return len(self.entries)
+
+    def add(self, key: int, reported_at: int = None):
+        """
+        Records an error as reported. Call `save` to persist it.
+
+        Args:
+            key (int): The key of the error (see `make_key`).
+            reported_at (int, optional): The reporting time in epoch seconds. Defaults to now.
+        """
+        with self.lock:
+            self.entries.setdefault(key, int(reported_at or time.time()))
+
+    def expire(self, now: int = None):
+        """
+        Drops the errors older than `max_age_days` and, if the store is still over `max_entries`,
+        the oldest ones until it fits.
+
+        Args:
+            now (int, optional): The current time in epoch seconds. Defaults to now.
+        """
+        limit = int(now or time.time()) - self.max_age_days * SECONDS_PER_DAY
+        with self.lock:
+            self.entries = {key: reported_at for key, reported_at in self.entries.items() if reported_at >= limit}
+            if len(self.entries) > self.max_entries:
+                newest = sorted(self.entries.items(), key=lambda entry: entry[1])[-self.max_entries:]
+                self.entries = dict(newest)
+
+    def save(self):
+        """
+        Expires old errors and writes the store atomically (temporary file plus rename).
+        """
+        self.expire()
+        try:
+            with self.lock:
+                data = b"".join(RECORD.pack(key, reported_at) for key, reported_at in self.entries.items())
+            temp_path = self.file_path + ".tmp"
+            with open(temp_path, "wb") as file:
+                file.write(data)
+            os.replace(temp_path, self.file_path)
+        except Exception as e:
+            BaseError(3001, str(e))
+
+def device_file_identity(devices_path: str, file_path: str):
+    """
+    Identifies an attendance file by its device folder and IP, leaving out its date.
+
+    Args:
+        devices_path (str): The path of the `devices` folder.
+        file_path (str): The path of a `ip_YYYY-MM-DD_file.cro` file.
+
+    Returns:
+        (str): The identity, e.g. `Norte/MB360-Entrada/10.0.0.1`.
+    """
+    relative_folder = os.path.relpath(os.path.dirname(file_path), devices_path).replace("\\", "/")
+    ip = os.path.basename(file_path).split("_", 1)[0]
+    return f"{relative_folder}/{ip}"
+
+def format_error_line(user_id, timestamp):
+    """
+    Formats a downloaded incorrect attendance as the start of its line in the `.cro` file.
+
+    Args:
+        user_id (Any): The user ID of the attendance.
+        timestamp (datetime or Any): The timestamp of the attendance.
+
+    Returns:
+        (str): The line, e.g. `1234 05/03/2024 08:15`, or the raw values if the timestamp is not a datetime.
+    """
+    if isinstance(timestamp, datetime):
+        return format_line(user_id, timestamp)
+    return f"{user_id} {timestamp}"
+
+def format_file_uri(file_path: str):
+    """
+    Converts a local file path to a file URI, as linked in the 2003 report.
+
+    Args:
+        file_path (str): The local file path to be converted into a file URI.
+
+    Returns:
+        (str): The formatted file URI.
+    """
+    return urllib.parse.urljoin('file:', urllib.parse.quote(file_path.replace("\\", "/")))
+
+def remove_legacy_reported_files():
+    """
+    Removes the daily `reported_incorrect_attendances_{date}.tmp` files that older versions
+    kept in the temporary directory, now replaced by `ReportedErrorsStore`.
+    """
+    for temp_file_path in glob.glob(os.path.join(tempfile.gettempdir(), "reported_incorrect_attendances_*.tmp")):
+        try:
+            os.remove(temp_file_path)
+        except Exception as e:
+            logging.warning(f"No se pudo eliminar el archivo {temp_file_path}: {e}")
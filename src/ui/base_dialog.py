@@ -56,24 +56,29 @@ class BaseDialog(QDialog):
     def init_ui(self):
         pass
 
-    def adjust_size_to_table(self):
+    def adjust_size_to_table(self, table=None):
         """
         Adjusts the size of the dialog window to fit the content of the table widget.
-        This method resizes the columns of the table widget to fit their contents and calculates
+        This method resizes the columns of the table to fit their contents and calculates
         the required width and height of the table based on its content. It ensures that the
         dialog window does not exceed the available screen height, applying a margin if necessary.
         Finally, it resizes the dialog window to accommodate the adjusted table dimensions.
         
+        Args:
+            table (QTableView, optional): The table to fit. Defaults to the `table_widget` attribute.
+
         Notes:
             - An extra width adjustment is added to account for margins and the button bar.
             - The height is capped to fit within the available screen height minus a margin.
         """
+        table = table if table is not None else self.table_widget
+
         # Adjust columns based on the content
-        self.table_widget.resizeColumnsToContents()
+        table.resizeColumnsToContents()
         
         # Get the content size of the table (width and height)
-        table_width = self.table_widget.horizontalHeader().length()
-        table_height = self.table_widget.verticalHeader().length() + self.table_widget.rowCount() * self.table_widget.rowHeight(0)
+        table_width = table.horizontalHeader().length()
+        table_height = table.verticalHeader().length() + table.model().rowCount() * table.rowHeight(0)
         
         max_height = self.screen().availableGeometry().height()
         if table_height > max_height:
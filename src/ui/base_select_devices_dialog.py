@@ -1,19 +1,21 @@
 from PyQt5.QtWidgets import (
-    QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+    QVBoxLayout, QHBoxLayout, QTableView, QLineEdit,
     QPushButton, QHeaderView, QMessageBox, QProgressBar, QLabel, QSpinBox, QWidget
 )
 import os
-from PyQt5.QtGui import QColor
-from src.common.utils.file_manager import find_root_directory
 from src.ui.base_dialog import BaseDialog
 from src.ui.components.combobox import ComboBoxDelegate
+from src.ui.devices_table_model import DevicesFilterProxyModel, DevicesTableModel, IP_COLUMN
 from PyQt5.QtCore import Qt
 from src.common.utils.errors import BaseError
 from src.ui.operation_thread import OperationThread
+from src.utils.config_store import read_config, set_config_value
 import configparser
 config = configparser.ConfigParser()
 
 class SelectDevicesDialog(BaseDialog):
+    RESULT_COLUMNS: list[str] = []  # Labels of the columns filled with the result of each device
+
     def __init__(self, parent=None, op_function=None, window_title=""):
         """
         Initializes the BaseSelectDevicesDialog class.
@@ -26,7 +28,7 @@ class SelectDevicesDialog(BaseDialog):
         Attributes:
             op_function (callable): Stores the operation function passed as an argument.
             file_path (str): The file path to the "info_devices.txt" file, located in the current working directory.
-            data (list): A list to store device-related data.
+            data (list[tuple]): The active devices, one tuple of displayed fields per device.
         
         Raises:
             BaseError: If an exception occurs during initialization, it raises a BaseError with code 3501 and the error message.
@@ -49,8 +51,10 @@ class SelectDevicesDialog(BaseDialog):
         
         UI Components:
             - QVBoxLayout: Main layout for the dialog.
-            - QTableWidget: Table widget to display devices with configurable columns and sorting enabled.
-            - QPushButton: Buttons for updating data, selecting all rows, and deselecting all rows.
+            - QTableView: Table view over a `DevicesTableModel`, sorted and filtered by a `DevicesFilterProxyModel`.
+            - QLineEdit: Filter of the devices shown, by a text contained in any column.
+            - QPushButton: Buttons for updating data, selecting all rows, deselecting all rows and
+              cancelling the running operation.
             - QLabel: Label to display a message when data is being updated.
             - QProgressBar: Progress bar to indicate the progress of data updates.
             - ComboBoxDelegate: Delegate for the communication column to provide a combo box UI.
@@ -76,7 +80,7 @@ class SelectDevicesDialog(BaseDialog):
             self.spin_timeout = QSpinBox(self)
             self.spin_timeout.setMinimum(0)
             self.spin_timeout.setMaximum(999)
-            config.read(os.path.join(find_root_directory(), 'config.ini'))
+            read_config(config)
             self.timeout = config.getint('Network_config', 'timeout')
             if self.timeout:
                 self.spin_timeout.setValue(self.timeout)
@@ -100,20 +104,34 @@ class SelectDevicesDialog(BaseDialog):
             self.inputs_layout.addWidget(self.label_retries)
             self.inputs_layout.addWidget(self.spin_retries)
 
+            self.filter_edit = QLineEdit(self)
+            self.filter_edit.setPlaceholderText("Filtrar dispositivos...")
+            self.filter_edit.setClearButtonEnabled(True)
+            self.inputs_layout.addWidget(self.filter_edit)
+
             layout.addWidget(self.inputs_widget)
 
-            # Table for show devices
-            self.table_widget = QTableWidget()
-            self.table_widget.setColumnCount(len(header_labels))
-            self.table_widget.setHorizontalHeaderLabels(header_labels)
-            self.table_widget.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
-            self.table_widget.horizontalHeader().setStretchLastSection(True)
-            self.table_widget.setSortingEnabled(True)
+            # Table for show devices: the model holds the devices and the results,
+            # and the proxy sorts and filters them without touching the model
+            self.table_model = DevicesTableModel(header_labels, self)
+            self.proxy_model = DevicesFilterProxyModel(self)
+            self.proxy_model.setSourceModel(self.table_model)
+            self.filter_edit.textChanged.connect(self.proxy_model.setFilterFixedString)
+
+            self.table_view = QTableView()
+            self.table_view.setModel(self.proxy_model)
+            # Columns are fitted to their content once per load or operation (see `adjust_size_to_table`),
+            # measuring the first rows only, instead of on every change
+            self.table_view.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+            self.table_view.horizontalHeader().setResizeContentsPrecision(200)
+            self.table_view.horizontalHeader().setStretchLastSection(True)
+            self.table_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+            self.table_view.setSortingEnabled(True)
 
             # Enable full row selection with multi-selection (each click toggles selection)
-            self.table_widget.setSelectionBehavior(QTableWidget.SelectRows)
-            self.table_widget.setSelectionMode(QTableWidget.MultiSelection)
-            layout.addWidget(self.table_widget)
+            self.table_view.setSelectionBehavior(QTableView.SelectRows)
+            self.table_view.setSelectionMode(QTableView.MultiSelection)
+            layout.addWidget(self.table_view)
 
             self.button_layout = QHBoxLayout()
 
@@ -145,11 +163,17 @@ class SelectDevicesDialog(BaseDialog):
             self.progress_bar.setVisible(False)
             layout.addWidget(self.progress_bar)
 
+            # Button for cancel the running operation, keeping the results obtained so far
+            self.btn_cancel = QPushButton("Cancelar operación", self)
+            self.btn_cancel.clicked.connect(self.cancel_operation)
+            self.btn_cancel.setVisible(False)
+            layout.addWidget(self.btn_cancel)
+
             self.setLayout(layout)
 
             # Set delegate for communication column (UI only)
-            combo_box_delegate = ComboBoxDelegate(self.table_widget)
-            self.table_widget.setItemDelegateForColumn(5, combo_box_delegate)
+            combo_box_delegate = ComboBoxDelegate(self.table_view)
+            self.table_view.setItemDelegateForColumn(5, combo_box_delegate)
 
             # Load initial device data
             self.load_data()
@@ -157,18 +181,15 @@ class SelectDevicesDialog(BaseDialog):
             raise BaseError(3501, str(e))
         
     def on_change_timeout(self, value):
+        # The steps of the spinbox are batched and written once (see `ConfigStore`)
         if value != self.timeout:
             self.timeout = value
-            config.set('Network_config', 'timeout', str(self.spin_timeout.value()))
-            with open(os.path.join(find_root_directory(), 'config.ini'), 'w') as configfile:
-                config.write(configfile)
+            set_config_value('Network_config', 'timeout', self.spin_timeout.value(), config)
 
     def on_change_retries(self, value):
         if value != self.retries:
             self.retries = value
-            config.set('Network_config', 'retry_connection', str(self.spin_retries.value()))
-            with open(os.path.join(find_root_directory(), 'config.ini'), 'w') as configfile:
-                config.write(configfile)
+            set_config_value('Network_config', 'retry_connection', self.spin_retries.value(), config)
 
     def load_data(self):
         """
@@ -200,41 +221,17 @@ class SelectDevicesDialog(BaseDialog):
 
     def load_data_into_table(self):
         """
-        Populates the table widget with data from the `self.data` attribute.
-
-        This method clears any existing rows in the table widget and inserts new rows
-        based on the records in `self.data`. Each cell is populated with non-editable
-        items, and the background color of the cells is set to light gray. After
-        populating the table, the method adjusts the table's size to fit its content.
-
-        Steps:
-
-        1. Clears all rows in the table widget.
-        2. Iterates through the records in `self.data` and inserts rows into the table.
-        3. Creates non-editable table items for each cell and sets their background color.
-        4. Adjusts the table size to fit the content.
-
-        Note:
-            - The `self.data` attribute is expected to be an iterable of records, where
-              each record is an iterable of values corresponding to table columns.
-            - The table widget is assumed to be an instance of QTableWidget.
-
+        Shows the devices of the `self.data` attribute in the table, through its model
+        (see `DevicesTableModel`), and adjusts the dialog size to fit the content.
+        The results of a previous operation are discarded.
         """
-        self.table_widget.setRowCount(0)
-        for row_index, record in enumerate(self.data):
-            self.table_widget.insertRow(row_index)
-            # Create non-editable items for each column
-            for col_index, value in enumerate(record):
-                item = QTableWidgetItem(str(value))
-                item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-                item.setBackground(QColor(Qt.lightGray))
-                self.table_widget.setItem(row_index, col_index, item)
-        self.adjust_size_to_table()
+        self.table_model.set_devices(self.data)
+        self.adjust_size_to_table(self.table_view)
 
     def operation_with_selected_ips(self):
         """
-        Handles operations with the selected IP addresses from the table widget.
-        This method retrieves the selected rows from the table widget, extracts the IP addresses
+        Handles operations with the selected IP addresses from the table view.
+        This method retrieves the selected rows from the table view, extracts the IP addresses
         from a specific column, and performs an operation on the selected IPs using a separate thread.
         It also updates the UI to reflect the ongoing operation and handles progress updates.
         
@@ -246,10 +243,10 @@ class SelectDevicesDialog(BaseDialog):
             selected_ips (list[str]): A list to store the IP addresses of the selected devices.
         
         UI Updates:
-            - Hides the table widget.
-            - Sorts the table widget by the IP column in descending order.
+            - Keeps the table view visible, sorted by the IP column in descending order, and clears
+              its result columns, which are filled as each device is processed (see `apply_results`).
             - Updates labels and buttons to indicate the operation is in progress.
-            - Displays a progress bar to show the operation's progress.
+            - Displays a progress bar to show the operation's progress, and a button to cancel it.
         
         Threads:
             - Creates and starts an `OperationThread` to perform the operation on the selected IPs.
@@ -257,19 +254,17 @@ class SelectDevicesDialog(BaseDialog):
         """
         try:        
             self.selected_ips: list[str] = []
-            # Retrieve selected rows via the selection model
-            for index in self.table_widget.selectionModel().selectedRows():
-                row = index.row()
-                ip = self.table_widget.item(row, 3).text()  # Column 3 holds the IP
-                self.selected_ips.append(ip)
+            # Retrieve selected rows via the selection model, mapped from the proxy to the devices
+            for index in self.table_view.selectionModel().selectedRows():
+                self.selected_ips.append(self.table_model.ip_at(self.proxy_model.mapToSource(index).row()))
 
             if not self.selected_ips:
                 QMessageBox.information(self, "Sin selección", "No se seleccionaron dispositivos")
                 raise Exception("No se seleccionaron dispositivos")
             else:
                 self.inputs_widget.setVisible(False)
-                self.table_widget.setVisible(False)
-                self.table_widget.sortByColumn(3, Qt.DescendingOrder)
+                self.table_view.sortByColumn(IP_COLUMN, Qt.DescendingOrder)
+                self.start_results()
                 self.label_updating.setText("Actualizando datos...")
                 self.btn_update.setVisible(False)
                 self.btn_activate_all.setVisible(False)
@@ -277,9 +272,11 @@ class SelectDevicesDialog(BaseDialog):
                 self.label_updating.setVisible(True)
                 self.progress_bar.setVisible(True)
                 self.progress_bar.setValue(0)
+                self.show_cancel_button()
                 #logging.debug(f"Dispositivos seleccionados: {self.selected_ips}")
                 self.op_thread = OperationThread(self.op_function, self.selected_ips)
                 self.op_thread.progress_updated.connect(self.update_progress)
+                self.op_thread.device_results.connect(self.apply_results)
                 self.op_thread.op_terminate.connect(self.op_terminate)
                 self.op_thread.finished.connect(self.cleanup_thread)
                 self.op_thread.start()
@@ -308,13 +305,33 @@ class SelectDevicesDialog(BaseDialog):
         self.btn_update.setVisible(True)
         self.btn_activate_all.setVisible(True)
         self.btn_deactivate_all.setVisible(True)
-        self.table_widget.setVisible(True)
+        self.table_view.setVisible(True)
         self.label_updating.setVisible(False)
         self.progress_bar.setVisible(False)
+        self.btn_cancel.setVisible(False)
+
+    def show_cancel_button(self):
+        """
+        Shows the button to cancel the operation about to start.
+        """
+        self.btn_cancel.setText("Cancelar operación")
+        self.btn_cancel.setEnabled(True)
+        self.btn_cancel.setVisible(True)
+
+    def cancel_operation(self):
+        """
+        Cancels the running operation (see `OperationThread.cancel`). The devices still queued are
+        skipped and those in progress stop after their current step, so `op_terminate` receives
+        the results obtained so far.
+        """
+        if getattr(self, "op_thread", None) and self.op_thread.isRunning():
+            self.op_thread.cancel()
+            self.btn_cancel.setText("Cancelando...")
+            self.btn_cancel.setEnabled(False)
 
     def column_exists(self, column_name):
         """
-        Checks if a column with the specified name exists in the table widget.
+        Checks if a column with the specified name exists in the table.
 
         Args:
             column_name (str): The name of the column to check for existence.
@@ -322,12 +339,11 @@ class SelectDevicesDialog(BaseDialog):
         Returns:
             (bool): True if the column exists, False otherwise.
         """
-        headers = [self.table_widget.horizontalHeaderItem(i).text() for i in range(self.table_widget.columnCount())]
-        return column_name in headers
+        return self.table_model.column_of(column_name) != -1
     
     def get_column_number(self, column_name):
         """
-        Retrieves the index of a column in the table widget based on the column's name.
+        Retrieves the index of a column in the table based on the column's name.
 
         Args:
             column_name (str): The name of the column to search for.
@@ -335,12 +351,10 @@ class SelectDevicesDialog(BaseDialog):
         Returns:
             (int): The index of the column if found, otherwise -1.
         """
-        for i in range(self.table_widget.columnCount()):
-            if self.table_widget.horizontalHeaderItem(i).text() == column_name:
-                return i
-        return -1
+        return self.table_model.column_of(column_name)
 
-    def update_progress(self, percent_progress, device_progress, processed_devices, total_devices):
+    def update_progress(self, percent_progress, device_progress, processed_devices, total_devices,
+                        devices_per_second=-1.0, eta_seconds=-1.0):
         """
         Updates the progress bar and status label with the current progress of device processing.
 
@@ -349,60 +363,128 @@ class SelectDevicesDialog(BaseDialog):
             device_progress (str): A message indicating the status of the last connection attempt.
             processed_devices (int): The number of devices that have been processed so far.
             total_devices (int): The total number of devices to be processed.
+            devices_per_second (float, optional): The number of devices processed per second, or -1 if unknown.
+            eta_seconds (float, optional): The estimated time left, in seconds, or -1 if unknown.
 
         Returns:
             None
         """
         if percent_progress and device_progress:
             self.progress_bar.setValue(percent_progress)
-            self.label_updating.setText(f"Último intento de conexión: {device_progress}\n{processed_devices}/{total_devices} dispositivos")
+            text = f"Último intento de conexión: {device_progress}\n{processed_devices}/{total_devices} dispositivos"
+            if devices_per_second > 0:
+                text += f" ({devices_per_second:.1f} disp./s)"
+            if eta_seconds >= 0 and processed_devices < total_devices:
+                text += f"\nTiempo restante estimado: {format_duration(eta_seconds)}"
+            self.label_updating.setText(text)
 
     def select_all_rows(self):
         """
-        Selects all rows in the table widget that are not already selected.
-        This method retrieves the list of currently selected rows in the table widget
-        and iterates through all rows in the table. If a row is not already selected,
-        it selects the row.
-        
-        Note:
-            - The method assumes that `self.table_widget` is a valid QTableWidget or
-              similar widget with `selectionModel`, `selectedRows`, `rowCount`, and
-              `selectRow` methods.
+        Selects all the rows shown in the table view (those matching the filter).
         """
-        selected_rows = [index.row() for index in self.table_widget.selectionModel().selectedRows()]
-        
-        row_count = self.table_widget.rowCount()
-        for row in range(row_count):
-            if row not in selected_rows:
-                self.table_widget.selectRow(row)
+        self.table_view.selectAll()
 
     def deselect_all_rows(self):
         """
-        Deselects all rows in the table widget.
+        Deselects all rows in the table view.
 
-        This method clears the current selection in the table widget,
+        This method clears the current selection in the table view,
         ensuring that no rows remain selected.
         """
-        self.table_widget.clearSelection()
+        self.table_view.clearSelection()
 
     def ensure_column_exists(self, column_name):
         """
-        Ensures that a column with the specified name exists in the table widget. 
-        If the column does not exist, it creates a new column with the given name.
-        If the column already exists, it retrieves its index.
+        Ensures that a result column with the specified name exists in the table.
+        If the column does not exist, the model adds it (see `DevicesTableModel.ensure_column`).
 
         Args:
             column_name (str): The name of the column to ensure exists.
 
         Returns:
-            (int): The index of the column in the table widget.
-        """
-        if not self.column_exists(column_name):
-            # Add a new column to the table
-            actual_column = self.table_widget.columnCount()
-            self.table_widget.setColumnCount(actual_column + 1)
-            self.table_widget.setHorizontalHeaderItem(actual_column, QTableWidgetItem(column_name))
-        else:
-            # Get the column number
-            actual_column = self.get_column_number(column_name)
-        return actual_column
\ No newline at end of file
+            (int): The index of the column in the table model.
+        """
+        return self.table_model.ensure_column(column_name)
+
+    def device_cells(self, ip: str, result: dict):
+        """
+        Builds the cells of the result columns (`RESULT_COLUMNS`) of a device. Subclasses with result
+        columns override it.
+
+        Args:
+            ip (str): The IP of the device.
+            result (dict): The result of the device, empty if the operation gave none.
+
+        Returns:
+            (list[tuple[str, Qt.GlobalColor]]): The text and background color (or None for the default one)
+                of each result column.
+        """
+        return []
+
+    def result_columns(self):
+        """
+        Returns the result columns (`RESULT_COLUMNS`), adding those that do not exist yet.
+
+        Returns:
+            (list[int]): The index of each result column in the table model.
+        """
+        return [self.ensure_column_exists(label) for label in self.RESULT_COLUMNS]
+
+    def start_results(self):
+        """
+        Clears the result columns before an operation: the rows of the devices not selected are
+        shown in white and those of the selected devices stay empty until their result arrives.
+        """
+        selected_ips = set(self.selected_ips)
+        unselected_cells = {
+            ip: ("", Qt.white)
+            for ip in (self.table_model.ip_at(row) for row in range(self.table_model.rowCount()))
+            if ip not in selected_ips
+        }
+        for column in self.result_columns():
+            self.table_model.set_column_results(column, dict(unselected_cells))
+
+    def apply_results(self, devices: dict[str, dict]):
+        """
+        Shows the results of several devices at once, one column at a time: those processed since the
+        previous progress update while the operation runs, or the whole result when it ends.
+        The rows of the devices without a result keep their cells.
+
+        Args:
+            devices (dict[str, dict]): The result of each device, by IP.
+        """
+        columns = self.result_columns()
+        cells = [self.table_model.column_results(column) for column in columns]
+        for ip, result in devices.items():
+            for column_cells, cell in zip(cells, self.device_cells(ip, result or {})):
+                column_cells[ip] = cell
+        for column, column_cells in zip(columns, cells):
+            self.table_model.set_column_results(column, column_cells)
+
+    def show_results(self, sort_column: int):
+        """
+        Resizes the dialog to the table, sorts it by the given column in descending order and
+        clears the selection, once the results of an operation are set in the model.
+
+        Args:
+            sort_column (int): The column to sort by.
+        """
+        self.adjust_size_to_table(self.table_view)
+        self.table_view.sortByColumn(sort_column, Qt.DescendingOrder)
+        self.deselect_all_rows()
+
+def format_duration(seconds: float):
+    """
+    Formats a duration as minutes and seconds, or hours, minutes and seconds if it is an hour or longer.
+
+    Args:
+        seconds (float): The duration, in seconds.
+
+    Returns:
+        (str): The formatted duration, e.g. "03:25" or "1:02:05".
+    """
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}:{minutes:02d}:{seconds:02d}"
+    return f"{minutes:02d}:{seconds:02d}"
@@ -0,0 +1,278 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Qt
+from PyQt5.QtGui import QBrush, QColor
+
+IP_COLUMN = 3  # Column of the device IP in `SelectDevicesDialog.data`
+NUMERIC_COLUMNS = {"Cant. de Marcaciones"}  # Result columns sorted by their numeric value
+
+def text_sort_key(text: str):
+    """
+    Returns the key to sort a cell by its text, case insensitive.
+
+    Args:
+        text (str): The text of the cell.
+
+    Returns:
+        (tuple): The sort key.
+    """
+    return (1, 0, text.casefold())
+
+def numeric_sort_key(text: str):
+    """
+    Returns the key to sort a cell of a numeric column. Numbers are sorted by their value and
+    come before the cells that are not a number (e.g. an error), which are sorted by their text.
+
+    Args:
+        text (str): The text of the cell.
+
+    Returns:
+        (tuple): The sort key.
+    """
+    try:
+        return (0, float(text), "")
+    except ValueError:
+        return text_sort_key(text)
+
+class DevicesTableModel(QAbstractTableModel):
+    def __init__(self, header_labels: list[str], parent=None):
+        """
+        Initializes a table model over the devices of a device selection dialog.
+
+        The devices are kept as plain tuples and the results of an operation as one dictionary
+        per result column, keyed by IP, holding the text and background color of each cell.
+        Cells are only built when the view paints them, so the cost of loading devices or
+        showing results does not depend on how many cells the table has.
+
+        Args:
+            header_labels (list[str]): The labels of the device columns.
+            parent (QObject, optional): The parent object for the model. Defaults to None.
+
+        Attributes:
+            devices (list[tuple]): The devices, one tuple of column values per row.
+            result_labels (list[str]): The labels of the result columns, shown after the device columns.
+            results (list[dict[str, tuple[str, Qt.GlobalColor]]]): The cells of each result column,
+                as their text and background color, by IP.
+        """
+        super().__init__(parent)
+        self.header_labels: list[str] = list(header_labels)
+        self.device_columns: int = len(self.header_labels)
+        self.column_count: int = self.device_columns
+        self.devices: list[tuple] = []
+        self.rows_by_ip: dict[str, int] = {}
+        self.result_labels: list[str] = []
+        self.results: list[dict[str, tuple[str, Qt.GlobalColor]]] = []
+        self.brushes: dict[Qt.GlobalColor, QBrush] = {}
+
+    def set_devices(self, devices: list[tuple]):
+        """
+        Replaces the devices of the table and discards the results of the previous operation.
+
+        Args:
+            devices (list[tuple]): The devices, one tuple of column values per row, with the IP in column 3.
+        """
+        self.beginResetModel()
+        self.devices = devices
+        self.rows_by_ip = {str(device[IP_COLUMN]): row for row, device in enumerate(devices)}
+        self.results = [{} for _ in self.result_labels]
+        self.endResetModel()
+
+    def ip_at(self, row: int):
+        """
+        Returns the IP of the device of a row.
+
+        Args:
+            row (int): The row in the model (not in a proxy).
+
+        Returns:
+            (str): The IP of the device.
+        """
+        return str(self.devices[row][IP_COLUMN])
+
+    def column_of(self, label: str):
+        """
+        Returns the column with the given label.
+
+        Args:
+            label (str): The column label.
+
+        Returns:
+            (int): The index of the column, or -1 if it does not exist.
+        """
+        labels = self.header_labels + self.result_labels
+        return labels.index(label) if label in labels else -1
+
+    def ensure_column(self, label: str):
+        """
+        Returns the column with the given label, adding it as an empty result column if it does not exist.
+
+        Args:
+            label (str): The column label.
+
+        Returns:
+            (int): The index of the column.
+        """
+        column = self.column_of(label)
+        if column == -1:
+            column = self.columnCount()
+            self.beginInsertColumns(QModelIndex(), column, column)
+            self.result_labels.append(label)
+            self.results.append({})
+            self.column_count += 1
+            self.endInsertColumns()
+        return column
+
+    def set_column_results(self, column: int, cells: dict[str, tuple[str, Qt.GlobalColor]]):
+        """
+        Replaces the cells of a result column. Devices without a cell are shown empty.
+
+        Args:
+            column (int): The result column, as returned by `ensure_column`.
+            cells (dict[str, tuple[str, Qt.GlobalColor]]): The text and background color
+                (or None for the default one) of each cell, by IP.
+        """
+        self.results[column - self.device_columns] = cells
+        if self.devices:
+            self.dataChanged.emit(self.index(0, column), self.index(len(self.devices) - 1, column))
+
+    def column_results(self, column: int):
+        """
+        Returns the cells of a result column.
+
+        Args:
+            column (int): The result column, as returned by `ensure_column`.
+
+        Returns:
+            (dict[str, tuple[str, Qt.GlobalColor]]): A copy of the text and background color of each cell, by IP.
+        """
+        return dict(self.results[column - self.device_columns])
+
+    def set_result(self, ip: str, column: int, text: str, color: Qt.GlobalColor = None):
+        """
+        Sets one cell of a result column.
+
+        Args:
+            ip (str): The IP of the device.
+            column (int): The result column, as returned by `ensure_column`.
+            text (str): The text of the cell.
+            color (Qt.GlobalColor, optional): The background color of the cell. Defaults to the default one.
+        """
+        self.results[column - self.device_columns][ip] = (text, color)
+        row = self.rows_by_ip.get(ip)
+        if row is not None:
+            index = self.index(row, column)
+            self.dataChanged.emit(index, index)
+
+    def text_at(self, row: int, column: int):
+        """
+        Returns the text of a cell.
+
+        Args:
+            row (int): The row in the model.
+            column (int): The column.
+
+        Returns:
+            (str): The text of the cell.
+        """
+        device = self.devices[row]
+        if column < self.device_columns:
+            return str(device[column])
+        return self.results[column - self.device_columns].get(str(device[IP_COLUMN]), ("", None))[0]
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """
+        Sorts the devices by the text of a column, case insensitive, or by the value of the numbers of a
+        numeric column (see `NUMERIC_COLUMNS`), reading each cell once instead of once per comparison.
+
+        Args:
+            column (int): The column to sort by.
+            order (Qt.SortOrder, optional): The sort order. Defaults to ascending.
+        """
+        if not 0 <= column < self.column_count:
+            return
+        self.layoutAboutToBeChanged.emit()
+        labels = self.header_labels + self.result_labels
+        sort_key = numeric_sort_key if labels[column] in NUMERIC_COLUMNS else text_sort_key
+        keys = [sort_key(self.text_at(row, column)) for row in range(len(self.devices))]
+        sorted_rows = sorted(range(len(self.devices)), key=keys.__getitem__, reverse=order == Qt.DescendingOrder)
+        self.devices = [self.devices[row] for row in sorted_rows]
+        self.rows_by_ip = {str(device[IP_COLUMN]): row for row, device in enumerate(self.devices)}
+        new_rows = {old_row: new_row for new_row, old_row in enumerate(sorted_rows)}
+        persistent_indexes = self.persistentIndexList()
+        self.changePersistentIndexList(
+            persistent_indexes,
+            [self.index(new_rows[index.row()], index.column()) for index in persistent_indexes]
+        )
+        self.layoutChanged.emit()
+
+    def brush(self, color: Qt.GlobalColor):
+        brush = self.brushes.get(color)
+        if brush is None:
+            brush = self.brushes[color] = QBrush(QColor(color))
+        return brush
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.devices)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.column_count
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            labels = self.header_labels + self.result_labels
+            return labels[section] if section < len(labels) else None
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.BackgroundRole):
+            return None
+        row, column = index.row(), index.column()
+        if column < self.device_columns:
+            if role == Qt.DisplayRole:
+                return str(self.devices[row][column])
+            return self.brush(Qt.lightGray)
+        text, color = self.results[column - self.device_columns].get(str(self.devices[row][IP_COLUMN]), ("", None))
+        if role == Qt.DisplayRole:
+            return text
+        return self.brush(color) if color is not None else None
+
+class DevicesFilterProxyModel(QSortFilterProxyModel):
+    def __init__(self, parent=None):
+        """
+        Initializes the proxy that sorts the devices table and filters it by a text
+        contained in any of its columns, case insensitive.
+
+        Sorting is delegated to `DevicesTableModel.sort`, which reads each cell once, so the
+        proxy keeps the order of the model and only filters it.
+
+        Args:
+            parent (QObject, optional): The parent object for the proxy. Defaults to None.
+        """
+        super().__init__(parent)
+        self.setFilterCaseSensitivity(Qt.CaseInsensitive)
+        self.setFilterKeyColumn(-1)
+        self.setSortCaseSensitivity(Qt.CaseInsensitive)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.sourceModel().sort(column, order)
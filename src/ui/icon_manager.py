@@ -34,8 +34,9 @@ from PyQt5.QtWidgets import QMainWindow, QSystemTrayIcon, QMenu, QAction, QMessa
 from PyQt5.QtCore import pyqtSlot
 from src.ui.update_time_device_dialog import UpdateTimeDeviceDialog
 from src.common.utils.system_utils import exit_duplicated_instance, verify_duplicated_instance
+from src.utils.config_store import read_config, set_config_value
 
-config.read(os.path.join(find_root_directory(), 'config.ini'))  # Read the config.ini configuration file
+read_config(config)  # Read the config.ini configuration file
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -360,24 +361,15 @@ class MainWindow(QMainWindow):
         """
         Toggles the state of the 'clear attendance' checkbox and updates the configuration file accordingly.
 
-        This method inverts the current state of the `checked_clear_attendance` attribute, updates the 
-        corresponding value in the configuration file under the 'Device_config' section, and writes the 
-        changes back to the file. If an error occurs during the file write operation, it raises a 
-        `BaseError` with an appropriate error code and message.
-
-        Raises:
-            BaseError: If an exception occurs while writing to the configuration file.
+        This method inverts the current state of the `checked_clear_attendance` attribute and updates the 
+        corresponding value in the configuration file under the 'Device_config' section. The file is
+        written in the background (see `ConfigStore`), which reports any error writing it.
         """
         self.checked_clear_attendance = not self.checked_clear_attendance  # Invert the current checkbox state
         # logging.debug(f"Status checkbox: {self.checked_clear_attendance}")  # Debug log: current checkbox state
         # Modify the value of the desired field in the configuration file
-        config['Device_config']['clear_attendance'] = str(self.checked_clear_attendance)
-        # Write the changes back to the configuration file
-        try:
-            with open('config.ini', 'w') as config_file:
-                config.write(config_file)
-        except Exception as e:
-            BaseError(3001, str(e))
+        # and write it back to the configuration file, in the background (see `ConfigStore`)
+        set_config_value('Device_config', 'clear_attendance', self.checked_clear_attendance, config)
 
     @pyqtSlot()
     def __opt_toggle_checkbox_automatic_init(self):
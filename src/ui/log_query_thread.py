@@ -0,0 +1,113 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import threading
+from PyQt5.QtCore import QThread, pyqtSignal
+from src.business_logic.log_query import ErrorLogQuery
+from src.common.utils.errors import BaseError
+
+class LogQueryThread(QThread):
+    entries_found = pyqtSignal(list)  # Signal for each batch of matching entries
+
+    def __init__(self, log_query: ErrorLogQuery, filters: dict, limit: int = None, parent = None):
+        """
+        Initializes the LogQueryThread instance.
+
+        Args:
+            log_query (ErrorLogQuery): The query engine, shared by the queries of a dialog.
+            filters (dict): The filters of `ErrorLogQuery.iter_batches`.
+            limit (int, optional): The maximum number of entries. Defaults to no limit.
+            parent (QObject, optional): The parent object for the thread. Defaults to None.
+        """
+        super().__init__(parent)
+        self.log_query: ErrorLogQuery = log_query
+        self.filters: dict = filters
+        self.limit: int = limit
+        self.cancel_event = threading.Event()
+        self.snapshot: dict[str, int] = {}  # Entries read of each log file, to follow them afterwards
+        self.replaced: set[str] = set()  # Log files rotated while the query read them
+
+    def cancel(self):
+        """
+        Requests the query to stop. No more batches are emitted afterwards.
+        """
+        self.cancel_event.set()
+
+    def run(self):
+        """
+        Runs the query and emits each batch of entries as soon as it is read.
+
+        Emits:
+            entries_found (list[str]): The entries of each month folder with matches.
+
+        Raises:
+            BaseError: If an exception occurs during the query, a `BaseError` is raised
+                with error code 3000 and the exception message.
+        """
+        try:
+            for entries in self.log_query.iter_batches(cancel_event=self.cancel_event, snapshot=self.snapshot, limit=self.limit,
+                                                        replaced=self.replaced, **self.filters):
+                if self.cancel_event.is_set():
+                    return
+                self.entries_found.emit(entries)
+        except Exception as e:
+            raise BaseError(3000, str(e))
+
+class LogFollowThread(QThread):
+    entries_found = pyqtSignal(list)  # Signal with the new matching entries, if any
+    failed = pyqtSignal(str)  # Signal with the message of the error that stopped the read
+
+    def __init__(self, log_query: ErrorLogQuery, filters: dict, since: dict[str, int], parent = None):
+        """
+        Initializes the LogFollowThread instance, which reads once the entries written to the current
+        month's error logs since the last read (see `ErrorLogQuery.read_new_entries`), so follow mode
+        never indexes nor reads the logs in the GUI thread.
+
+        Args:
+            log_query (ErrorLogQuery): The query engine, shared by the queries of a dialog.
+            filters (dict): The filters of `ErrorLogQuery.read_new_entries`.
+            since (dict[str, int]): The entries already read of each log file, by path. It is updated
+                by the thread, so it must not be used elsewhere until the thread finishes.
+            parent (QObject, optional): The parent object for the thread. Defaults to None.
+        """
+        super().__init__(parent)
+        self.log_query: ErrorLogQuery = log_query
+        self.filters: dict = filters
+        self.since: dict[str, int] = since
+        self.cancel_event = threading.Event()
+
+    def cancel(self):
+        """
+        Discards the entries being read. They are not emitted afterwards.
+        """
+        self.cancel_event.set()
+
+    def run(self):
+        """
+        Reads the new entries and emits them, unless the read was cancelled.
+
+        Emits:
+            entries_found (list[tuple[int, LogIndex, tuple, str]]): The new entries, sorted by date and time.
+            failed (str): The error message, if the logs could not be read.
+        """
+        try:
+            entries = self.log_query.read_new_entries(self.since, **self.filters)
+            if entries and not self.cancel_event.is_set():
+                self.entries_found.emit(entries)
+        except Exception as e:
+            self.failed.emit(str(e))
@@ -0,0 +1,97 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+from PyQt5.QtCore import QAbstractListModel, QModelIndex, Qt
+from src.business_logic.log_query import LogResults
+
+class LogResultsModel(QAbstractListModel):
+    PAGE_SIZE = 500  # Rows added to the view each time it scrolls to the end
+
+    def __init__(self, parent=None):
+        """
+        Initializes a list model over the results of an error log query (see `LogResults`).
+
+        The rows are exposed to the view one page at a time as it scrolls (`canFetchMore` /
+        `fetchMore`). Only where each entry is in the logs is kept; the text of the rows is read when
+        the view paints them, a block at a time, and the rows read most recently are cached (see `LogResults`).
+
+        Args:
+            parent (QObject, optional): The parent object for the model. Defaults to None.
+
+        Attributes:
+            results (LogResults): The results of the current query.
+            loaded_rows (int): The number of rows exposed to the view.
+        """
+        super().__init__(parent)
+        self.results = LogResults()
+        self.loaded_rows: int = 0
+
+    def reset_results(self):
+        """
+        Discards the current results, before a new query starts.
+        """
+        self.beginResetModel()
+        self.results = LogResults()
+        self.loaded_rows = 0
+        self.endResetModel()
+
+    def append_entries(self, entries: list):
+        """
+        Adds a batch of entries of the current query. The first page is shown right away;
+        the rest is fetched as the view scrolls.
+
+        Args:
+            entries (list[tuple[int, LogIndex, tuple, str]]): The entries, as yielded by `ErrorLogQuery.iter_batches`.
+        """
+        self.results.extend(entries)
+        if self.loaded_rows < self.PAGE_SIZE and self.canFetchMore(QModelIndex()):
+            self.fetchMore(QModelIndex())
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.loaded_rows
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.loaded_rows < len(self.results)
+
+    def fetchMore(self, parent=QModelIndex()):
+        count = min(self.PAGE_SIZE, len(self.results) - self.loaded_rows)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.loaded_rows, self.loaded_rows + count - 1)
+        self.loaded_rows += count
+        self.endInsertRows()
+
+    def fetch_until(self, row: int):
+        """
+        Exposes the rows up to the given one, so the view can scroll to it.
+
+        Args:
+            row (int): The position of the row in the results.
+        """
+        row = min(row, len(self.results) - 1)
+        if row >= self.loaded_rows:
+            self.beginInsertRows(QModelIndex(), self.loaded_rows, row)
+            self.loaded_rows = row + 1
+            self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= self.loaded_rows:
+            return None
+        if role == Qt.DisplayRole:
+            return self.results.entry_at(index.row())
+        return None
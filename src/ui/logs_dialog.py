@@ -17,20 +17,25 @@
 
 import logging
 import os
-import re
 import json
 from PyQt5.QtWidgets import (
-    QVBoxLayout, QTextEdit, QDateEdit, QPushButton, QLabel, 
-    QHBoxLayout, QListWidget, QListWidgetItem, QLineEdit
+    QVBoxLayout, QListView, QDateEdit, QPushButton, QLabel, 
+    QHBoxLayout, QListWidget, QListWidgetItem, QLineEdit, QFileDialog, QAbstractItemView, QCheckBox
 )
-from PyQt5.QtCore import QDate
+from PyQt5.QtCore import QDate, QThread, QTimer
+from src.business_logic.log_query import ErrorLogQuery
 from src.ui.base_dialog import BaseDialog
+from src.ui.log_query_thread import LogFollowThread, LogQueryThread
+from src.ui.log_results_model import LogResultsModel
 from src.common.utils.errors import BaseError
 from PyQt5.QtGui import QIcon
 from src.common.utils.file_manager import find_marker_directory, find_root_directory
-from version import PROGRAM_VERSION, SERVICE_VERSION
 
 LOGS_DIR = os.path.join(find_root_directory(), "logs")
+QUERY_DELAY_MS = 300  # Time without filter changes before a query starts
+FOLLOW_INTERVAL_MS = 2000  # Time between reads of the current month's logs in follow mode
+MAX_RESULTS = 100_000  # Entries after which a query stops
+MAX_REQUERIES = 1  # Times a query runs again on its own when a log was rotated while it was read
 
 # Load error codes from errors.json
 ERROR_CODES_DICT = {}
@@ -57,11 +62,30 @@ class LogsDialog(BaseDialog):
         class initializer with a specific window title, initializing the user
         interface, and handling any exceptions that may occur during the process.
 
+        Attributes:
+            log_query (ErrorLogQuery): The query engine, which keeps the index of each log file
+                while the dialog is open so each query only indexes the new entries.
+            query_thread (LogQueryThread): The thread of the current query, if any.
+            query_threads (list[QThread]): The query and follow threads that have not finished yet,
+                including the cancelled ones.
+            follow_thread (LogFollowThread): The thread of the current read in follow mode, if any.
+            current_filters (dict): The filters of the current query, also applied in follow mode.
+            follow_offsets (dict[str, int]): The entries already shown of each log file, by path,
+                or None while the current query is running.
+            requeries (int): The times the current query ran again on its own (see `cleanup_query_thread`).
+
         Raises:
             BaseError: If an exception occurs during initialization, it is wrapped
                        in a BaseError with code 3501 and the exception message.
         """
         try:
+            self.log_query = ErrorLogQuery(LOGS_DIR)
+            self.query_thread: LogQueryThread = None
+            self.query_threads: list[QThread] = []
+            self.follow_thread: LogFollowThread = None
+            self.current_filters: dict = {}
+            self.follow_offsets: dict[str, int] = None
+            self.requeries: int = 0
             super().__init__(window_title="VISOR DE LOGS")
             self.init_ui()
             super().init_ui()
@@ -93,7 +117,11 @@ class LogsDialog(BaseDialog):
                 * `select_errors_label`: QLabel for error filter instructions.
                 * `select_sources_label`: QLabel for source filter instructions.
             - Logs Display:
-                * `text_edit`: QTextEdit for displaying filtered logs.
+                * `log_view`: QListView over `log_model`, which only reads and paints the visible entries.
+                * `label_results`: QLabel with the number of entries found.
+                * `jump_date_edit` / `jump_button`: Scroll to the first entry of a date.
+                * `export_button`: QPushButton to save the current results to a text file.
+                * `follow_checkbox`: QCheckBox to append the new entries of the current month's logs as they are written.
 
         Layout:
             - `filter_layout`: Horizontal layout for date selection, text search, 
@@ -102,6 +130,7 @@ class LogsDialog(BaseDialog):
             - `source_list_layout`: Vertical layout for source filter label and list.
             - `filter_lists_layout`: Horizontal layout combining error and source 
               filter layouts.
+            - `results_layout`: Horizontal layout for the results count, jump to date and export.
             - `layout`: Main vertical layout combining all components.
 
         Behavior:
@@ -109,33 +138,40 @@ class LogsDialog(BaseDialog):
                 * Dates are changed.
                 * Text is entered in the search field.
                 * Error or source selections are modified.
+            - Changes are debounced: the query starts once the filters stop changing for `QUERY_DELAY_MS`.
             - Loads logs at startup.
 
         Raises:
             BaseError: If an exception occurs during UI initialization.
         """
         try:
+            # Debounce timer, restarted on each filter change
+            self.query_timer = QTimer(self)
+            self.query_timer.setSingleShot(True)
+            self.query_timer.setInterval(QUERY_DELAY_MS)
+            self.query_timer.timeout.connect(self.load_logs)
+
             # Date selection widgets
             self.start_date_edit = QDateEdit(self)
             self.start_date_edit.setCalendarPopup(True)
             self.start_date_edit.setDate(QDate.currentDate().addMonths(-1))
-            self.start_date_edit.editingFinished.connect(self.load_logs)  # Dynamic filtering on date change
+            self.start_date_edit.editingFinished.connect(self.query_timer.start)  # Dynamic filtering on date change
 
             self.end_date_edit = QDateEdit(self)
             self.end_date_edit.setCalendarPopup(True)
             self.end_date_edit.setDate(QDate.currentDate())
-            self.end_date_edit.editingFinished.connect(self.load_logs)  # Dynamic filtering on date change
+            self.end_date_edit.editingFinished.connect(self.query_timer.start)  # Dynamic filtering on date change
 
             # Text search filter
             self.text_search_edit = QLineEdit(self)
             self.text_search_edit.setPlaceholderText("Buscar texto en los logs...")
-            self.text_search_edit.textChanged.connect(self.load_logs)  # Dynamic filtering on text change
+            self.text_search_edit.textChanged.connect(self.query_timer.start)  # Dynamic filtering on text change
 
             # Error selection list (initially hidden)
             self.error_list = QListWidget(self)
             self.error_list.setSelectionMode(QListWidget.MultiSelection)
             self.error_list.setVisible(False)  # Initially hide the error list
-            self.error_list.itemSelectionChanged.connect(self.load_logs)  # Dynamic filtering on selection change
+            self.error_list.itemSelectionChanged.connect(self.query_timer.start)  # Dynamic filtering on selection change
 
             for code, description in ERROR_CODES_DICT.items():
                 item = QListWidgetItem(f"[{code}] {description}")
@@ -146,7 +182,7 @@ class LogsDialog(BaseDialog):
             self.source_list = QListWidget(self)
             self.source_list.setSelectionMode(QListWidget.MultiSelection)
             self.source_list.setVisible(False)  # Initially hide the source list
-            self.source_list.itemSelectionChanged.connect(self.load_logs)  # Dynamic filtering on selection change
+            self.source_list.itemSelectionChanged.connect(self.query_timer.start)  # Dynamic filtering on selection change
 
             sources = ["programa", "icono", "servicio"]
             for source in sources:
@@ -195,19 +231,51 @@ class LogsDialog(BaseDialog):
             filter_lists_layout.addLayout(error_list_layout)
             filter_lists_layout.addLayout(source_list_layout)
 
-            # Text widget to display logs
-            self.text_edit = QTextEdit(self)
-            self.text_edit.setReadOnly(True)
+            # List view to display logs, paginated and painted on demand
+            self.log_model = LogResultsModel(self)
+            self.log_view = QListView(self)
+            self.log_view.setModel(self.log_model)
+            self.log_view.setUniformItemSizes(True)  # Rows are not measured one by one
+            self.log_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+            self.log_view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+
+            # Results count, jump to date and export
+            self.label_results = QLabel("Resultados: 0", self)
+            self.jump_date_edit = QDateEdit(self)
+            self.jump_date_edit.setCalendarPopup(True)
+            self.jump_date_edit.setDate(QDate.currentDate())
+            self.jump_button = QPushButton("Ir a fecha", self)
+            self.jump_button.clicked.connect(self.jump_to_date)
+            self.export_button = QPushButton("Exportar", self)
+            self.export_button.clicked.connect(self.export_logs)
+
+            # Follow mode, polling the current month's logs for new entries
+            self.follow_timer = QTimer(self)
+            self.follow_timer.setInterval(FOLLOW_INTERVAL_MS)
+            self.follow_timer.timeout.connect(self.follow_logs)
+            self.follow_checkbox = QCheckBox("Seguir en vivo", self)
+            self.follow_checkbox.toggled.connect(self.toggle_follow)
+
+            results_layout = QHBoxLayout()
+            results_layout.addWidget(self.label_results)
+            results_layout.addWidget(self.follow_checkbox)
+            results_layout.addStretch()
+            results_layout.addWidget(QLabel("Fecha:"))
+            results_layout.addWidget(self.jump_date_edit)
+            results_layout.addWidget(self.jump_button)
+            results_layout.addWidget(self.export_button)
 
             # Main layout
             layout = QVBoxLayout()
             layout.addLayout(filter_layout)
             layout.addLayout(filter_lists_layout)
-            layout.addWidget(self.text_edit)
+            layout.addWidget(self.log_view)
+            layout.addLayout(results_layout)
             self.setLayout(layout)
             layout.setStretch(0, 0)  # filter_layout takes only the space it needs
             layout.setStretch(1, 0)  # filter_lists_layout takes only the space it needs
-            layout.setStretch(2, 1)  # text_edit (logs) expands to fill the remaining space
+            layout.setStretch(2, 1)  # log_view (logs) expands to fill the remaining space
+            layout.setStretch(3, 0)  # results_layout takes only the space it needs
 
             # Load logs at startup
             self.load_logs()
@@ -238,52 +306,203 @@ class LogsDialog(BaseDialog):
         except Exception as e:
             raise BaseError(3500, str(e))
 
-    def load_logs(self):
+    def load_logs(self, requery: bool = False):
         """
-        Loads and displays error logs based on the specified filters.
+        Starts a query of the error logs with the current filters in a worker thread (see `LogQueryThread`).
 
-        This method retrieves error logs within a specified date range, 
-        filtered by selected error types, sources, and a search text. 
+        The previous query, if still running, is cancelled. The view is cleared and the matching
+        entries are appended as each batch arrives (see `append_logs`), so the dialog stays
+        responsive while the logs are read.
 
-        The logs are then displayed in a text editor.
+        Args:
+            requery (bool, optional): Whether the query runs again on its own because a log was
+                rotated while it was read, rather than because the filters changed. Defaults to False.
 
         Raises:
-            BaseError: If an exception occurs during the log retrieval process.
+            BaseError: If an exception occurs while starting the query.
 
         Filters:
             - Date range: Defined by `start_date_edit` and `end_date_edit`.
             - Error types: Selected items in `error_list`.
             - Sources: Selected items in `source_list`.
             - Search text: Text entered in `text_search_edit`.
+        """
+        try:
+            self.query_timer.stop()
+            if not requery:
+                self.requeries = 0
+            if self.query_thread is not None:
+                self.query_thread.cancel()
+            if self.follow_thread is not None:
+                self.follow_thread.cancel()
+
+            filters = {
+                "start_date": self.start_date_edit.date().toString("yyyy-MM-dd"),
+                "end_date": self.end_date_edit.date().toString("yyyy-MM-dd"),
+                "search_text": self.text_search_edit.text().lower(),
+                "selected_errors": {item.data(1) for item in self.error_list.selectedItems()},
+                "selected_sources": {item.data(1) for item in self.source_list.selectedItems()}
+            }
 
-        Steps:
-            1. Retrieve the start and end dates from the date edit widgets.
-            2. Get the search text and convert it to lowercase.
-            3. Collect selected error types and sources from their respective lists.
-            4. Fetch the filtered error logs using `get_error_logs`.
-            5. Display the logs in the `text_edit` widget.
+            self.log_model.reset_results()
+            self.label_results.setText("Resultados: 0")
+            self.current_filters = filters
+            self.follow_offsets = None
+            self.query_thread = LogQueryThread(self.log_query, filters, limit=MAX_RESULTS)
+            self.query_thread.entries_found.connect(self.append_logs)
+            self.query_thread.finished.connect(self.cleanup_query_thread)
+            self.query_threads.append(self.query_thread)
+            self.query_thread.start()
+        except Exception as e:
+            raise BaseError(3500, str(e))
+
+    def append_logs(self, entries: list[str]):
+        """
+        Appends a batch of entries to the results, unless it comes from a cancelled query.
 
-        Note:
-            Ensure that the `get_error_logs` method is implemented to handle 
-            the filtering logic and return the appropriate logs.
+        Args:
+            entries (list[tuple[int, LogIndex, tuple, str]]): The entries, sorted by date and time.
+        """
+        if self.sender() is not self.query_thread or self.query_thread.cancel_event.is_set():
+            return
+        self.log_model.append_entries(entries)
+        found = len(self.log_model.results)
+        if found >= MAX_RESULTS:
+            self.label_results.setText(f"Resultados: {found} (se alcanzó el límite, acote los filtros)")
+        else:
+            self.label_results.setText(f"Resultados: {found}")
+
+    def jump_to_date(self):
+        """
+        Scrolls the view to the first entry of the date in `jump_date_edit`, or of the next date with entries.
         """
         try:
-            start_date = self.start_date_edit.date().toString("yyyy-MM-dd")
-            end_date = self.end_date_edit.date().toString("yyyy-MM-dd")
-            search_text = self.text_search_edit.text().lower()
-
-            selected_errors = {item.data(1) for item in self.error_list.selectedItems()}
-            selected_sources = {item.data(1) for item in self.source_list.selectedItems()}
-            
-            error_logs = self.get_error_logs(start_date, end_date, selected_errors, selected_sources, search_text)
-            self.text_edit.setPlainText("\n".join(error_logs))
+            results = self.log_model.results
+            if len(results) == 0:
+                return
+            row = min(results.find_date(self.jump_date_edit.date().toString("yyyy-MM-dd")), len(results) - 1)
+            self.log_model.fetch_until(row)
+            index = self.log_model.index(row)
+            self.log_view.setCurrentIndex(index)
+            self.log_view.scrollTo(index, QAbstractItemView.PositionAtTop)
         except Exception as e:
             raise BaseError(3500, str(e))
 
+    def export_logs(self):
+        """
+        Saves the entries of the current query to a text file chosen by the user, one per line.
+        """
+        try:
+            file_path, _ = QFileDialog.getSaveFileName(self, "Exportar logs", "logs.txt", "Archivos de texto (*.txt)")
+            if not file_path:
+                return
+            with open(file_path, "w", encoding="utf-8") as output:
+                exported = self.log_model.results.export(output)
+            logging.info(f"Se exportaron {exported} entradas de logs a {file_path}")
+        except Exception as e:
+            BaseError(3001, str(e))
+
+    def cleanup_query_thread(self):
+        """
+        Schedules the deletion of a finished query or follow thread.
+        """
+        thread = self.sender()
+        if thread in self.query_threads:
+            self.query_threads.remove(thread)
+        if thread is self.follow_thread:
+            self.follow_thread = None
+        if thread is self.query_thread:
+            self.query_thread = None
+            if not thread.cancel_event.is_set():
+                if thread.replaced and self.requeries < MAX_REQUERIES:
+                    # A log was rotated while it was read, so the query runs again to read its new segment
+                    self.requeries += 1
+                    self.load_logs(requery=True)
+                else:
+                    if thread.replaced:
+                        logging.warning(f"Los logs {', '.join(sorted(thread.replaced))} cambiaron durante la consulta, "
+                                        f"puede que falten entradas")
+                    # Follow mode continues from the entries read by the query
+                    self.follow_offsets = dict(thread.snapshot)
+        thread.deleteLater()
+
+    def toggle_follow(self, checked: bool):
+        """
+        Starts or stops following the current month's logs.
+
+        Args:
+            checked (bool): Whether follow mode is enabled.
+        """
+        if checked:
+            self.follow_logs()
+            self.follow_timer.start()
+        else:
+            self.follow_timer.stop()
+
+    def follow_logs(self):
+        """
+        Starts reading, in a worker thread (see `LogFollowThread`), the entries written to the current
+        month's program, icon and service error logs since the last read that match the current filters,
+        reading each log only from its last offset. The entries are appended by `append_followed_logs`.
+        Nothing is read while a query is running, since it already includes them, nor while the
+        previous read has not finished.
+        """
+        try:
+            if self.query_thread is not None or self.follow_offsets is None or self.follow_thread is not None:
+                return
+            self.follow_thread = LogFollowThread(self.log_query, self.current_filters, self.follow_offsets)
+            self.follow_thread.entries_found.connect(self.append_followed_logs)
+            self.follow_thread.failed.connect(self.stop_follow)
+            self.follow_thread.finished.connect(self.cleanup_query_thread)
+            self.query_threads.append(self.follow_thread)
+            self.follow_thread.start()
+        except Exception as e:
+            self.stop_follow(str(e))
+
+    def append_followed_logs(self, entries: list):
+        """
+        Appends the new entries read in follow mode and scrolls to them, unless the read was
+        cancelled by a new query.
+
+        Args:
+            entries (list[tuple[int, LogIndex, tuple, str]]): The entries, sorted by date and time.
+        """
+        if self.sender() is not self.follow_thread or self.follow_thread.cancel_event.is_set():
+            return
+        self.log_model.append_entries(entries)
+        self.log_model.fetch_until(len(self.log_model.results) - 1)
+        self.label_results.setText(f"Resultados: {len(self.log_model.results)}")
+        self.log_view.scrollToBottom()
+
+    def stop_follow(self, message: str):
+        """
+        Disables follow mode after the logs could not be read.
+
+        Args:
+            message (str): The error message.
+        """
+        self.follow_checkbox.setChecked(False)
+        BaseError(3500, message)
+
+    def done(self, result):
+        """
+        Cancels the running queries and follow mode reads before closing the dialog, waiting for
+        their threads to stop so they are not destroyed while running.
+
+        Args:
+            result (int): The result code of the dialog.
+        """
+        self.query_timer.stop()
+        self.follow_timer.stop()
+        for thread in list(self.query_threads):
+            thread.cancel()
+            thread.wait()
+        super().done(result)
+
     def get_error_logs(self, start_date, end_date, selected_errors, selected_sources, search_text):
         """
         Retrieves error log entries from log files within a specified date range, filtered by error codes, sources, 
-        and optional search text.
+        and optional search text, in the calling thread (see `ErrorLogQuery.get_error_logs`).
 
         Args:
             start_date (str): The start date in the format 'YYYY-MM-DD' to filter log entries.
@@ -299,38 +518,6 @@ class LogsDialog(BaseDialog):
             BaseError: If an exception occurs during log processing, it raises a BaseError with code 3500 and the error message.
         """
         try:
-            error_entries = []
-            
-            pattern = re.compile(r"(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3}) - \w+ - \[(\d{4})\]")  # Capture date, time, and error code
-
-            log_files = {
-                "programa": "programa_reloj_de_asistencias_" + PROGRAM_VERSION + "_error.log",
-                "icono": "icono_reloj_de_asistencias_" + SERVICE_VERSION + "_error.log",
-                "servicio": "servicio_reloj_de_asistencias_" + SERVICE_VERSION + "_error.log"
-            }
-
-            for folder in os.listdir(LOGS_DIR):
-                folder_path = os.path.join(LOGS_DIR, folder)
-                if os.path.isdir(folder_path):
-                    for source, log_file in log_files.items():
-                        if selected_sources and source not in selected_sources:
-                            continue
-                        log_path = os.path.join(folder_path, log_file)
-                        if os.path.exists(log_path):
-                            with open(log_path, "r", encoding="utf-8", errors="replace") as log_file:
-                                for line in log_file:
-                                    match = pattern.search(line)
-                                    if match:
-                                        log_datetime, error_code = match.groups()
-                                        log_date = log_datetime.split()[0]
-                                        if start_date <= log_date <= end_date:
-                                            # Show all errors if none are selected, otherwise filter
-                                            if (not selected_errors or error_code in selected_errors) and (not search_text or search_text in line.lower()):
-                                                error_entries.append(f"{source}: {line.strip()}")
-
-            # Sort the entries by date and time
-            error_entries.sort(key=lambda x: re.search(r"(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3})", x).group(1))
-            
-            return error_entries
+            return self.log_query.get_error_logs(start_date, end_date, selected_errors, selected_sources, search_text)
         except Exception as e:
-            raise BaseError(3500, str(e))
\ No newline at end of file
+            raise BaseError(3500, str(e))
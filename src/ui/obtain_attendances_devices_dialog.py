@@ -16,25 +16,24 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import configparser
+from src.utils.config_store import read_config, set_config_value
 config = configparser.ConfigParser()
-config.read('config.ini')
-from datetime import datetime
+read_config(config)
 import logging
-import os
-import re
-from PyQt5.QtWidgets import QHBoxLayout, QPushButton, QLabel, QTableWidgetItem
+from PyQt5.QtWidgets import QHBoxLayout, QPushButton, QLabel, QProgressBar, QWidget
 from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QColor
-import urllib.parse
+from src.business_logic.attendance_files_checker import AttendanceFilesChecker
 from src.business_logic.program_manager import AttendancesManager
-from src.common.business_logic.models.attendance import Attendance
+from src.business_logic.reported_errors_store import format_file_uri
 from src.common.utils.errors import BaseError, BaseErrorWithMessageBox
-from src.common.utils.file_manager import find_root_directory
 from src.ui.base_select_devices_dialog import SelectDevicesDialog
+from src.ui.devices_table_model import IP_COLUMN
 from src.ui.operation_thread import OperationThread
 from PyQt5.QtWidgets import QMessageBox
 
 class ObtainAttendancesDevicesDialog(SelectDevicesDialog):
+    RESULT_COLUMNS = ["Cant. de Marcaciones"]
+
     def __init__(self, parent=None):
         """
         Initializes the ObtainAttendancesDevicesDialog class.
@@ -45,6 +44,9 @@ class ObtainAttendancesDevicesDialog(SelectDevicesDialog):
         Attributes:
             failed_devices (list[str]): A list to store devices that failed during the operation.
             attendances_manager (AttendancesManager): An instance of AttendancesManager to handle attendance management.
+            files_checker (AttendanceFilesChecker): The check of the attendance files run after each download.
+            check_thread (OperationThread): The thread of the running attendance files check, if any.
+            check_pending (bool): Whether another check must start when the running one finishes.
 
         Raises:
             BaseError: If an exception occurs during initialization, it raises a BaseError with code 3501 and the exception message.
@@ -52,6 +54,9 @@ class ObtainAttendancesDevicesDialog(SelectDevicesDialog):
         try:
             self.failed_devices: list[str] = []
             self.attendances_manager = AttendancesManager()
+            self.files_checker = AttendanceFilesChecker()
+            self.check_thread: OperationThread = None
+            self.check_pending: bool = False
             super().__init__(parent, op_function=self.attendances_manager.manage_devices_attendances, window_title="OBTENER MARCACIONES")
             self.init_ui()
         except Exception as e:
@@ -74,6 +79,7 @@ class ObtainAttendancesDevicesDialog(SelectDevicesDialog):
             - QPushButton: A button to retry failed connections, initially hidden.
             - QPushButton: A button to update and obtain attendance records, with updated text.
             - QLabel: A label to display the total number of attendances, initially hidden.
+            - QProgressBar / QPushButton: Progress and cancellation of the background attendance files check, initially hidden.
         """
         try:
             header_labels = ["Distrito", "Modelo", "Punto de Marcación", "IP", "ID", "Comunicación"]
@@ -87,6 +93,21 @@ class ObtainAttendancesDevicesDialog(SelectDevicesDialog):
             self.label_total_attendances.setAlignment(Qt.AlignCenter)
             self.layout().addWidget(self.label_total_attendances)
             self.label_total_attendances.setVisible(False)
+
+            # Progress of the attendance files check, which runs in the background after each download
+            self.checking_files_widget = QWidget(self)
+            checking_files_layout = QHBoxLayout(self.checking_files_widget)
+            self.label_checking_files = QLabel("Verificando archivos de marcaciones...", self)
+            self.progress_bar_checking_files = QProgressBar(self)
+            self.progress_bar_checking_files.setMinimum(0)
+            self.progress_bar_checking_files.setMaximum(100)
+            self.btn_cancel_checking_files = QPushButton("Cancelar verificación", self)
+            self.btn_cancel_checking_files.clicked.connect(self.cancel_attendance_files_check)
+            checking_files_layout.addWidget(self.label_checking_files)
+            checking_files_layout.addWidget(self.progress_bar_checking_files)
+            checking_files_layout.addWidget(self.btn_cancel_checking_files)
+            self.layout().addWidget(self.checking_files_widget)
+            self.checking_files_widget.setVisible(False)
         except Exception as e:
             raise BaseError(3501, str(e))
         
@@ -112,6 +133,28 @@ class ObtainAttendancesDevicesDialog(SelectDevicesDialog):
             self.show_btn_retry_failed_connection()
         return
 
+    def device_cells(self, ip: str, device: dict[str, str]):
+        """
+        Builds the attendance count cell of a device, or marks its connection as failed.
+
+        Args:
+            ip (str): The IP of the device.
+            device (dict[str, str]): The result of the device (see `op_terminate`).
+
+        Returns:
+            (list[tuple[str, Qt.GlobalColor]]): The text and background color of the result column.
+        """
+        if not device:
+            return [("", None)]
+        if device.get("connection failed", False):
+            return [("Conexión fallida", Qt.red)]
+        attendance_count = device.get("attendance count")
+        try:
+            int(attendance_count)
+        except ValueError:
+            attendance_count = 0
+        return [(str(attendance_count), Qt.green)]
+
     def op_terminate(self, devices: dict[str, dict[str, str]] = None):
         """
         Finalizes the operation of obtaining attendance data from devices and updates the UI accordingly.
@@ -121,15 +164,14 @@ class ObtainAttendancesDevicesDialog(SelectDevicesDialog):
                 containing device-specific information, such as "connection failed" status and "attendance count".
         
         Functionality:
-            - Iterates through the rows of the table widget to update attendance data for each device.
-            - Checks if the device IP is in the list of selected IPs and updates the corresponding table cell:
-                - Marks devices with failed connections in red and adds them to the failed devices list.
-                - Updates the attendance count for devices with successful connections and marks them in green.
-            - Ensures the "Cant. de Marcaciones" column exists in the table and updates it with attendance data.
+            - Adds the devices with failed connections to the failed devices list.
             - Calculates the total number of attendances across all devices.
+            - Applies the whole result to the "Cant. de Marcaciones" column (see `device_cells`), where
+              each device was already shown as it was processed (see `apply_results`).
             - Adjusts the table size, enables sorting, and sorts the table by a specific column in descending order.
             - Deselects all rows in the table and centers the window.
-            - Attempts to check attendance files and handles any exceptions with a warning-level error.
+            - Reports the new attendances with error found during the download (see `report_attendances_with_error`).
+            - Starts the check of the attendance files in the background (see `start_attendance_files_check`).
             - Displays a retry button for failed connections and updates the total attendance label.
         
         Raises:
@@ -139,42 +181,23 @@ class ObtainAttendancesDevicesDialog(SelectDevicesDialog):
             self.failed_devices = []
             #logging.debug(f'selected devices: {self.selected_ips} - devices from operation: {devices} - failed devices: {self.failed_devices}')
 
-            actual_column = self.ensure_column_exists("Cant. de Marcaciones")
-
             total_marcaciones = 0
-            for row in range (self.table_widget.rowCount()):
-                ip_selected = self.table_widget.item(row, 3).text()  # Column 3 holds the IP
-                attendances_count_item = QTableWidgetItem("")
-                if ip_selected not in self.selected_ips:
-                    attendances_count_item.setBackground(QColor(Qt.white))
+            for ip, device in (devices or {}).items():
+                if not device:
+                    continue
+                if device.get("connection failed", False):
+                    self.failed_devices.append(ip)
                 else:
-                    device = devices.get(ip_selected)
-                    if device:
-                        if device.get("connection failed", False):
-                            attendances_count_item.setText("Conexión fallida")
-                            attendances_count_item.setBackground(QColor(Qt.red))
-                            self.failed_devices.append(ip_selected)
-                        else:
-                            attendance_count = device.get("attendance count")
-                            try:
-                                total_marcaciones += int(attendance_count)
-                            except ValueError:
-                                attendance_count = 0
-                                BaseError(3500, f"Error al obtener la cantidad de marcaciones del dispositivo {ip_selected}")
-                            attendances_count_item.setText(str(attendance_count))
-                            attendances_count_item.setBackground(QColor(Qt.green))
-                attendances_count_item.setFlags(attendances_count_item.flags() & ~Qt.ItemIsEditable)
-                self.table_widget.setItem(row, actual_column, attendances_count_item)
-            self.adjust_size_to_table()
-            self.table_widget.setSortingEnabled(True)
-            self.table_widget.sortByColumn(6, Qt.DescendingOrder)  
-            self.deselect_all_rows()
+                    try:
+                        total_marcaciones += int(device.get("attendance count"))
+                    except ValueError:
+                        BaseError(3500, f"Error al obtener la cantidad de marcaciones del dispositivo {ip}")
+            self.apply_results(devices or {})
+            self.show_results(6)
 
             self.center_window()
-            try:
-                self.check_attendance_files()
-            except Exception as e:
-                BaseError(3000, str(e), level="warning")
+            self.report_attendances_with_error(devices)
+            self.start_attendance_files_check()
             self.show_btn_retry_failed_connection()
             self.label_total_attendances.setText(f"Total de Marcaciones: {total_marcaciones}")
             self.label_total_attendances.setVisible(True)
@@ -182,234 +205,165 @@ class ObtainAttendancesDevicesDialog(SelectDevicesDialog):
         except Exception as e:
             raise BaseErrorWithMessageBox(3500, str(e), parent=self)
 
-    def parse_attendance(self, line: str):
+    def report_attendances_with_error(self, devices: dict[str, dict] = None):
         """
-        Parses a line of attendance data and extracts the timestamp.
+        Reports the files with new attendance errors, as gathered by the download workers,
+        without reading the files back. Each file is listed once (see `show_attendances_with_error`).
 
         Args:
-            line (str): A string containing attendance data, expected to have at least
-                        three parts separated by spaces, where the second and third parts
-                        represent the date and time respectively.
-
-        Returns:
-            (datetime or None): A datetime object representing the parsed timestamp if the
-                              line is well-formed and the date and time are valid.
-                              Returns None if the line is malformed or the date/time
-                              cannot be parsed.
+            devices (dict[str, dict]): The result of `AttendancesManager.manage_devices_attendances`,
+                whose "attendances with error" entries hold the "ip", "date", "file_path" and "line" of each error.
         """
-        parts = line.split()
-        if len(parts) < 3:
-            return None
         try:
-            date_str, time_str = parts[1], parts[2]
-            timestamp: datetime = datetime.strptime(f"{date_str} {time_str}", "%d/%m/%Y %H:%M")
-            return timestamp
-        except ValueError:
-            return None
+            devices_with_error = {}  # Grouped by file: key = file path, value = info for report
+            for device in (devices or {}).values():
+                for error in device.get("attendances with error", []):
+                    # Without a written file (e.g. it could not be found) the error is listed without a link
+                    devices_with_error.setdefault(error["file_path"] or (error["ip"], error["date"]), {
+                        "ip": error["ip"],
+                        "date": error["date"],
+                        "file_path": format_file_uri(error["file_path"]) if error["file_path"] else None
+                    })
+            self.show_attendances_with_error(list(devices_with_error.values()))
+        except Exception as e:
+            BaseError(3000, str(e), level="warning")
 
-    def check_attendance_files(self):
+    def show_attendances_with_error(self, devices_with_error: list[dict[str, str]]):
         """
-        Checks attendance files in the "devices" directory for errors.
-        A daily record (in a temporary file) is kept of each already reported incorrect check‑in,
-        so that new ones are only reported once. For reporting, information is grouped by file,
-        displaying each error only once (by file_path) as in the original version.
+        Shows the 2003 report with the files that have new attendance errors, if any.
 
-        Raises:
-            BaseError: if the 'devices' folder is not found or if attendance errors are detected.
+        If "Eliminar marcaciones" is enabled, the user is asked whether to force the clearing of the
+        attendances in the next download; otherwise, the files with errors are only listed.
+
+        Args:
+            devices_with_error (list[dict[str, str]]): One entry per file, with its "ip", "date" and
+                "file_path" (a file URI, or None to list it without a link).
         """
-        import tempfile
-        from datetime import timedelta
-
-        # Get today's and yesterday's dates
-        today_str = datetime.now().strftime("%Y-%m-%d")
-        yesterday_str = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
-
-        devices_path = os.path.join(find_root_directory(), "devices")
-        temp_dir = tempfile.gettempdir()
-        # logging.debug(f"Directorio temporal: {temp_dir}")
-
-        # Temporary file for today and yesterday
-        temp_file_path = os.path.join(
-            temp_dir,
-            f"reported_incorrect_attendances_{today_str}.tmp"
-        )
-        temp_file_yesterday = os.path.join(
-            temp_dir,
-            f"reported_incorrect_attendances_{yesterday_str}.tmp"
-        )
-
-        # Remove yesterday's file if it exists
-        if os.path.exists(temp_file_yesterday):
-            try:
-                os.remove(temp_file_yesterday)
-            except Exception as e:
-                logging.warning(f"No se pudo eliminar el archivo de ayer: {e}")
-
-        # Load errors already reported today: each line is a unique error identifier (file_path + line)
-        reported_errors = set()
-        if os.path.exists(temp_file_path):
-            with open(temp_file_path, "r", encoding="utf-8") as tf:
-                for line in tf:
-                    reported_errors.add(line.strip())
-
-        new_reported = set()            # Newly found errors (by line)
-        files_with_new_errors = {}      # Grouped by file: key = file.path, value = info for report
-
-        if not os.path.isdir(devices_path):
-            raise BaseError(3000, "No se encontró la carpeta 'devices'", level="warning")
-
-        # Traverse the devices directory
-        with os.scandir(devices_path) as entries:
-            for subfolder in entries:
-                if not subfolder.is_dir():
-                    continue
+        try:
+            if devices_with_error:
+                error_info = (
+                    "<html><br>" +
+                    "<br>".join(
+                        [f"- <a href='{device['file_path']}'>{device['date']}: {device['ip']}</a>"
+                        if device['file_path'] else f"- {device['date']}: {device['ip']}"
+                        for device in devices_with_error]
+                    ) +
+                    "</html>"
+                )
+                error_code = 2003
+                error = BaseError(error_code, error_info)
+
+                read_config(config)
+                clear_attendance: bool = config.getboolean('Device_config', 'clear_attendance')
+                if clear_attendance:
+                    self.ask_force_clear_attendances(error_code, error_info, parent=self)
+                else:
+                    error.show_message_box_html(parent=self)
+        except Exception as e:
+            BaseError(3000, str(e), level="warning")
 
-                subfolder_path = os.path.join(devices_path, subfolder.name)
-                with os.scandir(subfolder_path) as sub_entries:
-                    for sub_entry in sub_entries:
-                        if not sub_entry.is_dir():
-                            continue
-
-                        with os.scandir(sub_entry.path) as files:
-                            for file in files:
-                                if today_str in file.name and file.name.endswith(".cro"):
-                                    file_has_new_error = False  # Flag for new errors in this file
-
-                                    with open(file.path, "r", encoding="utf-8") as f:
-                                        # Check each line for attendance errors
-                                        for line_number, line in enumerate(f, start=1):
-                                            attendance = Attendance(timestamp=self.parse_attendance(line))
-                                            if attendance is not None and (
-                                                attendance.is_three_months_old() or attendance.is_in_the_future()
-                                            ):
-                                                # Create a unique identifier for this error line
-                                                error_id = str(line)
-                                                if error_id in reported_errors:
-                                                    continue  # This error was already reported
-
-                                                # New error found
-                                                new_reported.add(error_id)
-                                                file_has_new_error = True
-                                                # To continue scanning the file for all new errors (even though only one link per file is shown),
-                                                # do not break here. Uncomment the next line to only report the first occurrence per file.
-                                                # break
-
-                                    if file_has_new_error:
-                                        # Add one entry per file, as in the original version
-                                        if file.path not in files_with_new_errors:
-                                            files_with_new_errors[file.path] = {
-                                                "ip": self.extract_ip(file.name),
-                                                "date": self.extract_date(file.name),
-                                                "file_path": self.format_file_uri(file.path)
-                                            }
-
-        # Append newly found errors to the temporary file
-        if new_reported:
-            with open(temp_file_path, "a", encoding="utf-8") as tf:
-                for err in new_reported:
-                    tf.write(err + "\n")
-
-        # Build report from files that have new errors
-        devices_with_error = list(files_with_new_errors.values())
-        if devices_with_error:
-            error_info = (
-                "<html><br>" +
-                "<br>".join(
-                    [f"- <a href='{device['file_path']}'>{device['date']}: {device['ip']}</a>"
-                    for device in devices_with_error]
-                ) +
-                "</html>"
-            )
-            error_code = 2003
-            error = BaseError(error_code, error_info)
-
-            config.read(os.path.join(find_root_directory(), 'config.ini'))
-            clear_attendance: bool = config.getboolean('Device_config', 'clear_attendance')
-            if clear_attendance:
-                self.ask_force_clear_attendances(error_code, error_info, parent=self)
-            else:
-                error.show_message_box_html(parent=self)
+    def start_attendance_files_check(self):
+        """
+        Starts the check of the attendance files (see `AttendanceFilesChecker`) in an `OperationThread`,
+        so the window stays usable while the `devices` folder is scanned.
 
-    def ask_force_clear_attendances(self, error_code, error_info, parent):
-        msg_box = QMessageBox(parent)
-        msg_box.setIcon(QMessageBox.Warning)
-        msg_box.setWindowTitle(f"Error {error_code}")
-        msg_box.setTextFormat(Qt.RichText)
-        msg_box.setText(error_info)
-        msg_box.setInformativeText("¿Desea habilitar el forzado de eliminado de marcaciones en su proxima obtencion de marcaciones?")
-        msg_box.setStandardButtons(QMessageBox.Ok | QMessageBox.No)
-        msg_box.setDefaultButton(QMessageBox.No)
-        result = msg_box.exec_()
-        if result == QMessageBox.Ok:
-            config['Device_config']['force_clear_attendance'] = 'True'
-
-            # Write the changes back to the configuration file
-            try:
-                with open('config.ini', 'w') as config_file:
-                    config.write(config_file)
-            except Exception as e:
-                BaseError(3001, str(e))
-            
-            logging.info("Se ha habilitado el forzado de eliminacion de marcaciones")
+        Progress is shown below the table together with a button to cancel the check. If a check
+        is already running, another one is started when it finishes.
 
-    def format_file_uri(self, file_path: str):
+        Raises:
+            BaseError: If an exception occurs while starting the thread, it raises a BaseError with code 3500.
         """
-        Converts a local file path to a file URI.
+        try:
+            if self.check_thread is not None:
+                self.check_pending = True
+                return
+            self.check_pending = False
+            self.check_thread = OperationThread(self.files_checker.check_attendance_files)
+            self.check_thread.progress_updated.connect(self.update_check_progress)
+            self.check_thread.op_terminate.connect(self.on_attendance_files_checked)
+            self.check_thread.finished.connect(self.cleanup_check_thread)
+            self.progress_bar_checking_files.setValue(0)
+            self.label_checking_files.setText("Verificando archivos de marcaciones...")
+            self.btn_cancel_checking_files.setEnabled(True)
+            self.checking_files_widget.setVisible(True)
+            self.check_thread.start()
+        except Exception as e:
+            raise BaseError(3500, str(e))
 
-        This method takes a file path as input, replaces backslashes with forward slashes
-        (to ensure compatibility across different operating systems), and encodes special
-        characters to make the path safe for use in a URI. It then constructs a file URI
-        by prefixing the encoded path with 'file:'.
+    def update_check_progress(self, percent_progress, device_progress, processed_devices, total_devices, *_):
+        """
+        Updates the progress bar of the attendance files check.
 
         Args:
-            file_path (str): The local file path to be converted into a file URI.
-
-        Returns:
-            (str): The formatted file URI.
+            percent_progress (int): The percentage of device folders already checked.
+            device_progress (str): The name of the last checked device folder.
+            processed_devices (int): The number of device folders already checked.
+            total_devices (int): The total number of device folders.
         """
-        file_url = urllib.parse.urljoin('file:', urllib.parse.quote(file_path.replace("\\", "/")))
-        # logging.debug(file_url)
-        return file_url
+        self.progress_bar_checking_files.setValue(percent_progress)
+        self.label_checking_files.setText(f"Verificando archivos de marcaciones: {processed_devices}/{total_devices}")
 
-    def extract_ip(self, filename: str):
+    def cancel_attendance_files_check(self):
+        """
+        Requests the running attendance files check, if any, to stop.
+        The files already checked are still reported.
         """
-        Extracts an IP address from a given filename.
+        self.check_pending = False
+        if self.check_thread is not None:
+            self.check_thread.cancel()
+            self.btn_cancel_checking_files.setEnabled(False)
+            self.label_checking_files.setText("Cancelando verificación...")
 
-        The method uses a regular expression to match filenames that follow the
-        pattern: `<IP_ADDRESS>_<DATE>_file.cro`, where:
+    def cleanup_check_thread(self):
+        """
+        Schedules the deletion of the finished check thread and starts the pending check, if any.
+        """
+        self.check_thread.deleteLater()
+        self.check_thread = None
+        self.checking_files_widget.setVisible(False)
+        if self.check_pending:
+            self.start_attendance_files_check()
 
-        - `<IP_ADDRESS>` is a valid IPv4 address (e.g., 192.168.1.1).
-        - `<DATE>` is in the format YYYY-MM-DD.
+    def on_attendance_files_checked(self, result: dict = None):
+        """
+        Reports the files with new attendance errors found by the background check, as the
+        errors of a download are reported (see `show_attendances_with_error`).
 
         Args:
-            filename (str): The filename to extract the IP address from.
-
-        Returns:
-            (str): The extracted IP address if the filename matches the pattern, 
-                 otherwise None.
+            result (dict): The result of `AttendanceFilesChecker.check_attendance_files`.
         """
-        match = re.match(r"^(\d+\.\d+\.\d+\.\d+)_\d{4}-\d{2}-\d{2}_file\.cro$", filename)
-        return match.group(1) if match else None
-    
-    def extract_date(self, filename: str):
-        """
-        Extracts a date string from a given filename if it matches a specific pattern.
-
-        The method uses a regular expression to identify filenames that follow the
-        pattern: `<IP_ADDRESS>_<YYYY-MM-DD>_file.cro`, where:
+        try:
+            self.show_attendances_with_error((result or {}).get("devices_with_error", []))
+        except Exception as e:
+            BaseError(3000, str(e), level="warning")
 
-        - `<IP_ADDRESS>` is a sequence of four groups of digits separated by dots.
-        - `<YYYY-MM-DD>` is a date in the format year-month-day.
+    def done(self, result):
+        """
+        Cancels the attendance files check before closing the dialog, waiting for the
+        worker thread to stop so it is not destroyed while running.
 
         Args:
-            filename (str): The filename to extract the date from.
-
-        Returns:
-            (str or None): The extracted date string in the format 'YYYY-MM-DD' if the
-                        filename matches the pattern; otherwise, None.
+            result (int): The result code of the dialog.
         """
-        match = re.match(r"^\d+\.\d+\.\d+\.\d+_(\d{4}-\d{2}-\d{2})_file\.cro$", filename)
-        return match.group(1) if match else None
+        if self.check_thread is not None:
+            self.cancel_attendance_files_check()
+            self.check_thread.wait()
+        super().done(result)
+
+    def ask_force_clear_attendances(self, error_code, error_info, parent):
+        msg_box = QMessageBox(parent)
+        msg_box.setIcon(QMessageBox.Warning)
+        msg_box.setWindowTitle(f"Error {error_code}")
+        msg_box.setTextFormat(Qt.RichText)
+        msg_box.setText(error_info)
+        msg_box.setInformativeText("¿Desea habilitar el forzado de eliminado de marcaciones en su proxima obtencion de marcaciones?")
+        msg_box.setStandardButtons(QMessageBox.Ok | QMessageBox.No)
+        msg_box.setDefaultButton(QMessageBox.No)
+        result = msg_box.exec_()
+        if result == QMessageBox.Ok:
+            # Written in the background to the configuration file (see `ConfigStore`)
+            set_config_value('Device_config', 'force_clear_attendance', True, config)
+            logging.info("Se ha habilitado el forzado de eliminacion de marcaciones")
 
     def show_btn_retry_failed_connection(self):
         """
@@ -441,7 +395,8 @@ class ObtainAttendancesDevicesDialog(SelectDevicesDialog):
 
         Steps performed:
 
-        - Hides certain UI elements (e.g., table widget, buttons) and updates labels.
+        - Hides certain UI elements (e.g., buttons) and updates labels. The table stays visible and
+          the row of each retried device is updated as soon as it is processed.
         - Initializes and starts an `OperationThread` to handle the reconnection logic.
         - Connects thread signals to appropriate methods for progress updates and cleanup.
         - Hides the retry button after it is clicked.
@@ -454,8 +409,7 @@ class ObtainAttendancesDevicesDialog(SelectDevicesDialog):
             self.attendances_manager (object): Manager responsible for handling device attendances.
         """
         try:
-            self.table_widget.setVisible(False)
-            self.table_widget.sortByColumn(3, Qt.DescendingOrder)
+            self.table_view.sortByColumn(IP_COLUMN, Qt.DescendingOrder)
             self.label_total_attendances.setVisible(False)
             self.label_updating.setText("Reintentando conexiones...")
             self.btn_update.setVisible(False)
@@ -464,9 +418,11 @@ class ObtainAttendancesDevicesDialog(SelectDevicesDialog):
             self.label_updating.setVisible(True)
             self.progress_bar.setVisible(True)
             self.progress_bar.setValue(0)
+            self.show_cancel_button()
             # logging.debug(f"Dispositivos seleccionados: {self.failed_devices}")
             self.op_thread = OperationThread(self.attendances_manager.manage_devices_attendances, self.failed_devices)
             self.op_thread.progress_updated.connect(self.update_progress)
+            self.op_thread.device_results.connect(self.apply_results)
             self.op_thread.op_terminate.connect(self.op_terminate)
             self.op_thread.finished.connect(self.cleanup_thread)
             self.op_thread.start()
@@ -15,14 +15,18 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import logging
+import threading
 from typing import Callable
 from PyQt5.QtCore import QThread, pyqtSignal
 from src.common.utils.errors import BaseError
+from src.utils.config_store import flush_config
 
 class OperationThread(QThread):
     op_terminate = pyqtSignal(dict)
     op_start_time = pyqtSignal(float)
-    progress_updated = pyqtSignal(int, str, int, int)  # Signal for progress
+    progress_updated = pyqtSignal(int, str, int, int, float, float)  # Signal for progress
+    device_results = pyqtSignal(dict)  # Signal for the results of the devices processed since the previous progress update
 
     def __init__(self, op_func: Callable, selected_ips: list[str] = None, parent = None):
         """
@@ -37,6 +41,7 @@ class OperationThread(QThread):
         self.op_func: Callable = op_func
         self.selected_ips: list[str] = selected_ips
         self.result: dict = {}
+        self.cancel_event: threading.Event = threading.Event()
 
     def run(self):
         """
@@ -50,9 +55,12 @@ class OperationThread(QThread):
         Attributes:
             selected_ips (list): A list of selected IP addresses to pass to the operation
                 function. If not provided, the operation function is called without IPs.
-            result (dict): The result of the operation function execution.
+            result (dict): The result of the operation function execution, partial if it was cancelled.
+            cancel_event (threading.Event): The event passed to the operation function, set by `cancel`.
 
         Emits:
+            device_results (dict): Signal emitted with the results of the devices, by IP, processed
+                by the operation function since the previous progress update.
             op_terminate (dict): Signal emitted with the result of the operation function
                 or an empty dictionary if the result is `None`.
 
@@ -62,12 +70,18 @@ class OperationThread(QThread):
                 message.
         """
         try:
+            # The operation reads config.ini from disk (e.g. the timeout), so write the pending changes first
+            flush_config()
             #import time
             #start_time: float = time.time()
             if self.selected_ips:
-                self.result: dict = self.op_func(self.selected_ips, emit_progress=self.emit_progress)
+                self.result: dict = self.op_func(self.selected_ips, emit_progress=self.emit_progress, emit_device_results=self.emit_device_results,
+                                                 cancel_event=self.cancel_event)
             else:
-                self.result: dict = self.op_func(emit_progress=self.emit_progress)
+                self.result: dict = self.op_func(emit_progress=self.emit_progress, emit_device_results=self.emit_device_results,
+                                                 cancel_event=self.cancel_event)
+            if self.cancel_event.is_set():
+                logging.info("Se canceló la operación, se muestran los resultados parciales")
             if self.result is None:
                 self.op_terminate.emit({})
             else:
@@ -76,7 +90,26 @@ class OperationThread(QThread):
         except Exception as e:
             raise BaseError(3000, str(e), "critical")
 
-    def emit_progress(self, percent_progress: int = None, device_progress: str = None, processed_devices: int = None, total_devices: int = None):
+    def cancel(self):
+        """
+        Requests the operation function to stop: the devices still queued are skipped and those in
+        progress stop after their current step. `op_terminate` is emitted with the partial result.
+        """
+        if not self.cancel_event.is_set():
+            logging.info("Cancelando la operación...")
+            self.cancel_event.set()
+
+    def is_cancelled(self):
+        """
+        Checks whether the operation was cancelled.
+
+        Returns:
+            (bool): True if `cancel` was called, False otherwise.
+        """
+        return self.cancel_event.is_set()
+
+    def emit_progress(self, percent_progress: int = None, device_progress: str = None, processed_devices: int = None, total_devices: int = None,
+                      devices_per_second: float = None, eta_seconds: float = None):
         """
         Emits a progress update signal with the provided progress details.
 
@@ -85,5 +118,20 @@ class OperationThread(QThread):
             device_progress (str, optional): A string describing the progress of the current device. Defaults to None.
             processed_devices (int, optional): The number of devices that have been processed so far. Defaults to None.
             total_devices (int, optional): The total number of devices to be processed. Defaults to None.
+            devices_per_second (float, optional): The number of devices processed per second. Defaults to None,
+                emitted as -1.
+            eta_seconds (float, optional): The estimated time left, in seconds. Defaults to None, emitted as -1.
+        """
+        self.progress_updated.emit(percent_progress, device_progress, processed_devices, total_devices,
+                                   -1.0 if devices_per_second is None else devices_per_second,
+                                   -1.0 if eta_seconds is None else eta_seconds)  # Emit the progress signal
+
+    def emit_device_results(self, results: dict[str, dict]):
+        """
+        Emits the results of the devices processed since the previous progress update.
+
+        Args:
+            results (dict[str, dict]): The result of each device, by IP, as it appears in the result
+                of the whole operation.
         """
-        self.progress_updated.emit(percent_progress, device_progress, processed_devices, total_devices)  # Emit the progress signal
\ No newline at end of file
+        self.device_results.emit(results)
\ No newline at end of file
@@ -15,17 +15,17 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from PyQt5.QtWidgets import (
-    QTableWidgetItem
-)
-from PyQt5.QtGui import QColor
 import logging
 from PyQt5.QtCore import Qt
 from src.business_logic.program_manager import ConnectionsInfo
 from src.common.utils.errors import BaseError, BaseErrorWithMessageBox
 from src.ui.base_select_devices_dialog import SelectDevicesDialog
 
+DEVICE_INFO_KEYS = ["attendance_count", "serial_number", "platform", "firmware_version"]  # Shown after the connection status
+
 class PingDevicesDialog(SelectDevicesDialog):
+    RESULT_COLUMNS = ["Estado de Conexión", "Cant. de Marcaciones", "Número de Serie", "Plataforma", "Firmware"]
+
     def __init__(self, parent=None):
         """
         Initializes the PingDevicesDialog class.
@@ -71,11 +71,37 @@ class PingDevicesDialog(SelectDevicesDialog):
         super().init_ui(header_labels=header_labels)
         self.btn_update.setText("Probar conexiones")
 
+    def device_cells(self, ip: str, device: dict):
+        """
+        Builds the cells of the result columns of a device: its connection status and, from its
+        "device_info", its attendance count, serial number, platform and firmware version.
+
+        Args:
+            ip (str): The IP of the device.
+            device (dict): The connection information of the device (see `op_terminate`).
+
+        Returns:
+            (list[tuple[str, Qt.GlobalColor]]): The text and background color of each result column.
+        """
+        if not device:
+            return [("", None)] * len(self.RESULT_COLUMNS)
+        if device.get("connection_failed"):
+            cells = [("Conexión fallida", Qt.red)]
+        else:
+            cells = [("Conexión exitosa", Qt.green)]
+        device_info = device.get("device_info")
+        for key in DEVICE_INFO_KEYS:
+            if not device_info or not device_info.get(key):
+                cells.append(("No aplica", Qt.gray))
+            else:
+                cells.append((str(device_info.get(key, "")), Qt.green))
+        return cells
+
     def op_terminate(self, devices=None):
         """
-        Updates the table widget with the connection status and device information for a list of devices.
-        This method iterates through the rows of the table widget and updates the columns with information
-        such as connection status, attendance count, serial number, platform, and firmware version for each device.
+        Updates the table with the connection status and device information for a list of devices,
+        once the operation finishes. Each device was already shown as it was processed (see
+        `apply_results`); the whole result is applied again so the table matches it.
         The information is retrieved from the `devices` dictionary, which maps IP addresses to device data.
         
         Args:
@@ -94,96 +120,14 @@ class PingDevicesDialog(SelectDevicesDialog):
                                      with a message box displaying the error details.
         
         Notes:
-            - The method ensures that specific columns ("Estado de Conexión", "Cant. de Marcaciones",
-              "Número de Serie", "Plataforma", "Firmware") exist in the table widget before updating.
-            - The background color of each cell is updated based on the device's connection status and
-              availability of information.
-            - The table widget is resized and sorted by the 6th column in descending order after updates.
+            - The cells of each device are built by `device_cells`, in the columns of `RESULT_COLUMNS`.
+            - The table is resized and sorted by the 6th column in descending order after updates.
             - All rows are deselected at the end of the operation.
         """
         try:
             #logging.debug(devices)
-
-            # Ensure the "Estado de Conexión" column exists
-            connection_column = self.ensure_column_exists("Estado de Conexión")
-            attendance_count_column = self.ensure_column_exists("Cant. de Marcaciones")            
-            serial_number_column = self.ensure_column_exists("Número de Serie")            
-            platform_column = self.ensure_column_exists("Plataforma")
-            firmware_version_column = self.ensure_column_exists("Firmware")
-
-            for row in range(self.table_widget.rowCount()):
-                ip_selected = self.table_widget.item(row, 3).text()  # Column 3 holds the IP
-                connection_item = QTableWidgetItem("")
-                attendance_count_item = QTableWidgetItem("")
-                serial_number_item = QTableWidgetItem("")
-                platform_item = QTableWidgetItem("")
-                firmware_version_item = QTableWidgetItem("")
-                
-                if ip_selected not in self.selected_ips:
-                    connection_item.setBackground(QColor(Qt.white))
-                    attendance_count_item.setBackground(QColor(Qt.white))
-                    serial_number_item.setBackground(QColor(Qt.white))
-                    platform_item.setBackground(QColor(Qt.white))
-                    firmware_version_item.setBackground(QColor(Qt.white))
-                else:
-                    device = devices[ip_selected]
-                    
-                    if device:
-                        if device.get("connection_failed"):
-                            connection_item.setText("Conexión fallida")
-                            connection_item.setBackground(QColor(Qt.red))
-                        else:
-                            connection_item.setText("Conexión exitosa")
-                            connection_item.setBackground(QColor(Qt.green))
-                        
-                        #logging.debug(str(device))
-                        #logging.debug(str(device.get("device_info", "")))
-                        if not device.get("device_info") or not device["device_info"].get("attendance_count"):
-                            attendance_count_item.setText("No aplica")
-                            attendance_count_item.setBackground(QColor(Qt.gray))
-                        else:
-                            attendance_count_item.setText(str(device.get("device_info", "").get("attendance_count", "")))
-                            attendance_count_item.setBackground(QColor(Qt.green))
-                        
-                        if not device.get("device_info") or not device["device_info"].get("serial_number"):
-                            serial_number_item.setText("No aplica")
-                            serial_number_item.setBackground(QColor(Qt.gray))
-                        else:
-                            serial_number_item.setText(str(device.get("device_info", "").get("serial_number", "")))
-                            serial_number_item.setBackground(QColor(Qt.green))
-                        
-                        if not device.get("device_info") or not device["device_info"].get("platform"):
-                            platform_item.setText("No aplica")
-                            platform_item.setBackground(QColor(Qt.gray))
-                        else:
-                            platform_item.setText(str(device.get("device_info", "").get("platform", "")))
-                            platform_item.setBackground(QColor(Qt.green))
-                        
-                        if not device.get("device_info") or not device["device_info"].get("firmware_version"):
-                            firmware_version_item.setText("No aplica")
-                            firmware_version_item.setBackground(QColor(Qt.gray))
-                        else:
-                            firmware_version_item.setText(str(device.get("device_info", "").get("firmware_version", "")))
-                            firmware_version_item.setBackground(QColor(Qt.green))
-                        
-                connection_item.setFlags(connection_item.flags() & ~Qt.ItemIsEditable)
-                attendance_count_item.setFlags(attendance_count_item.flags() & ~Qt.ItemIsEditable)
-                serial_number_item.setFlags(serial_number_item.flags() & ~Qt.ItemIsEditable)
-                platform_item.setFlags(platform_item.flags() & ~Qt.ItemIsEditable)
-                firmware_version_item.setFlags(firmware_version_item.flags() & ~Qt.ItemIsEditable)
-                
-                self.table_widget.setItem(row, connection_column, connection_item)
-                self.table_widget.setItem(row, attendance_count_column, attendance_count_item)
-                self.table_widget.setItem(row, serial_number_column, serial_number_item)
-                self.table_widget.setItem(row, platform_column, platform_item)
-                self.table_widget.setItem(row, firmware_version_column, firmware_version_item)
-
-            self.adjust_size_to_table()
-
-            self.table_widget.setSortingEnabled(True)
-            self.table_widget.sortByColumn(6, Qt.DescendingOrder)  
-
-            self.deselect_all_rows()
+            self.apply_results(devices or {})
+            self.show_results(6)
             super().op_terminate()
         except Exception as e:
             raise BaseErrorWithMessageBox(3500, str(e), parent=self)
\ No newline at end of file
@@ -19,11 +19,14 @@ import logging
 from PyQt5.QtWidgets import (
     QMessageBox
 )
+from PyQt5.QtCore import Qt
 from src.business_logic.program_manager import RestartManager
 from src.common.utils.errors import BaseError
 from src.ui.base_select_devices_dialog import SelectDevicesDialog
 
 class RestartDevicesDialog(SelectDevicesDialog):
+    RESULT_COLUMNS = ["Estado de Conexión"]
+
     def __init__(self, parent=None):
         """
         Initializes the RestartDevicesDialog class.
@@ -61,6 +64,23 @@ class RestartDevicesDialog(SelectDevicesDialog):
         super().init_ui(header_labels=header_labels)
         self.btn_update.setText("Reiniciar dispositivos")
 
+    def device_cells(self, ip: str, device: dict[str, bool]):
+        """
+        Builds the connection status cell of a device.
+
+        Args:
+            ip (str): The IP of the device.
+            device (dict[str, bool]): The errors of the device (see `op_terminate`).
+
+        Returns:
+            (list[tuple[str, Qt.GlobalColor]]): The text and background color of the result column.
+        """
+        if not device:
+            return [("", None)]
+        if device.get("connection failed"):
+            return [("Conexión fallida", Qt.red)]
+        return [("Conexión exitosa", Qt.green)]
+
     def op_terminate(self, devices_errors: dict[str, dict[str, bool]] = None):
         """
         Handles the termination operation for devices, displaying appropriate messages
@@ -77,6 +97,7 @@ class RestartDevicesDialog(SelectDevicesDialog):
             - If `devices_errors` is empty or None, an information message box is displayed
               indicating successful device restarts.
             - Logs the `devices_errors` dictionary for debugging purposes.
+            - Shows the connection status of each device in the table (see `device_cells`).
             - Calls the parent class's `op_terminate` method after handling the operation.
 
         Exceptions:
@@ -84,6 +105,8 @@ class RestartDevicesDialog(SelectDevicesDialog):
         """
         try:
             #logging.debug(devices_errors)
+            self.apply_results(devices_errors or {})
+            self.show_results(6)
             if len(devices_errors) > 0:
                 error: BaseError = BaseError(2002, f"{', '.join(devices_errors.keys())}")
                 error.show_message_box(parent=self)
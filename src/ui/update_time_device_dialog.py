@@ -15,19 +15,17 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from PyQt5.QtWidgets import (
-    QTableWidgetItem
-)
 from src.business_logic.program_manager import HourManager
 from src.common.business_logic import hour_manager
 from src.common.business_logic.models.device import Device
 from src.common.utils.errors import BaseError, BaseErrorWithMessageBox
 from src.ui.base_select_devices_dialog import SelectDevicesDialog
-from PyQt5.QtGui import QColor
 from PyQt5.QtCore import Qt
 import logging
 
 class UpdateTimeDeviceDialog(SelectDevicesDialog):
+    RESULT_COLUMNS = ["Estado de Conexión", "Estado de Pila"]
+
     def __init__(self, parent = None):
         """
         Initializes the UpdateTimeDeviceDialog class.
@@ -97,13 +95,33 @@ class UpdateTimeDeviceDialog(SelectDevicesDialog):
             raise BaseErrorWithMessageBox(3001, str(e), parent=self)
         return device_info
 
+    def device_cells(self, ip: str, device: dict[str, bool]):
+        """
+        Builds the cells of the result columns of a device: its connection status and, if it connected,
+        its battery status, failing if the time update or `info_devices.txt` report it so.
+
+        Args:
+            ip (str): The IP of the device.
+            device (dict[str, bool]): The errors of the device (see `op_terminate`).
+
+        Returns:
+            (list[tuple[str, Qt.GlobalColor]]): The text and background color of each result column.
+        """
+        if not device:
+            return [("", None), ("", None)]
+        if device.get("connection failed"):
+            return [("Conexión fallida", Qt.red), ("No aplica", Qt.gray)]
+        battery_failing: bool = device.get("battery failing") or not self.device_info.get(ip, True)
+        if battery_failing:
+            return [("Conexión exitosa", Qt.green), ("Pila fallando", Qt.red)]
+        return [("Conexión exitosa", Qt.green), ("Pila funcionando", Qt.green)]
+
     def op_terminate(self, devices_errors: dict[str, dict[str, bool]] = None):
         """
-        Updates the table widget with the connection and battery status of devices.
-        This method processes the `devices_errors` dictionary to update the table widget
-        with the connection and battery status for each device. It ensures that the required
-        columns exist in the table, updates the rows with the appropriate status and colors,
-        and adjusts the table's size and sorting.
+        Updates the table with the connection and battery status of devices, once the operation finishes.
+        Each device was already shown as it was processed (see `apply_results`); the whole
+        `devices_errors` dictionary is applied again (see `device_cells`) so the table matches it,
+        and the table's size and sorting are adjusted.
 
         Args:
             devices_errors (dict[str, dict[str, bool]], optional): A dictionary where the keys
@@ -121,48 +139,8 @@ class UpdateTimeDeviceDialog(SelectDevicesDialog):
         """
         #logging.debug(devices_errors)
         try:
-            connection_column = self.ensure_column_exists("Estado de Conexión")
-            battery_column = self.ensure_column_exists("Estado de Pila")
-            
-            for row in range (self.table_widget.rowCount()):
-                ip_selected: str = self.table_widget.item(row, 3).text()  # Column 3 holds the IP
-                connection_item: QTableWidgetItem = QTableWidgetItem("")
-                battery_item: QTableWidgetItem = QTableWidgetItem("")
-                if ip_selected not in self.selected_ips:
-                    connection_item.setBackground(QColor(Qt.white))
-                    battery_item.setBackground(QColor(Qt.white))
-                else:
-                    device: dict[str, bool] = devices_errors.get(ip_selected)
-                    if device:
-                        if device.get("connection failed"):
-                            connection_item.setText("Conexión fallida")
-                            connection_item.setBackground(QColor(Qt.red))
-                        else:
-                            connection_item.setText("Conexión exitosa")
-                            connection_item.setBackground(QColor(Qt.green))
-                        if device.get("connection failed"):
-                            battery_item.setText("No aplica")
-                            battery_item.setBackground(QColor(Qt.gray))
-                        else:
-                            battery_failing: bool = device.get("battery failing") or not self.device_info.get(ip_selected, True)
-                            if battery_failing:
-                                battery_item.setText("Pila fallando")
-                                battery_item.setBackground(QColor(Qt.red))
-                            else:
-                                battery_item.setText("Pila funcionando")
-                                battery_item.setBackground(QColor(Qt.green))
-                connection_item.setFlags(connection_item.flags() & ~Qt.ItemIsEditable)
-                self.table_widget.setItem(row, connection_column, connection_item)
-                battery_item.setFlags(battery_item.flags() & ~Qt.ItemIsEditable)
-                self.table_widget.setItem(row, battery_column, battery_item)
-
-            self.adjust_size_to_table()
-
-            self.table_widget.setSortingEnabled(True)
-            self.table_widget.sortByColumn(6, Qt.DescendingOrder)    
-
-            self.deselect_all_rows()
+            self.apply_results(devices_errors or {})
+            self.show_results(6)
             super().op_terminate()
-            self.table_widget.setVisible(True)
         except Exception as e:
             raise BaseErrorWithMessageBox(3500, str(e), parent=self)
\ No newline at end of file
@@ -0,0 +1,277 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import atexit
+import configparser
+import contextlib
+import errno
+import os
+import sys
+import time
+from src.common.utils.errors import BaseError
+from src.common.utils.file_manager import find_root_directory
+from src.utils.threads import native_threading, start_native_thread
+
+WRITE_DELAY = 0.5  # Seconds without changes before they are written, so a burst of changes is written once
+RETRY_DELAY = 5.0  # Seconds before retrying a failed write, e.g. while the file is locked by another process
+LOCK_TIMEOUT = 10.0  # Seconds to wait for another process to release the configuration file
+
+def config_file_path():
+    """
+    Returns the path of the configuration file, in the root directory of the program.
+
+    Returns:
+        (str): The path of `config.ini`.
+    """
+    return os.path.join(find_root_directory(), 'config.ini')
+
+@contextlib.contextmanager
+def config_file_lock(file_path: str, timeout: float = LOCK_TIMEOUT):
+    """
+    Holds an exclusive lock on `{file_path}.lock` across processes, so the program and the service
+    do not read and replace the configuration file at the same time.
+
+    Args:
+        file_path (str): The path of the configuration file.
+        timeout (float, optional): The seconds to wait for the lock. Defaults to `LOCK_TIMEOUT`.
+
+    Raises:
+        OSError: If the lock is still held by another process after `timeout` seconds.
+    """
+    with open(file_path + '.lock', 'a+b') as lock_file:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                _lock_file(lock_file)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(0.05)
+        try:
+            yield
+        finally:
+            _unlock_file(lock_file)
+
+if sys.platform == 'win32':
+    import msvcrt
+
+    def _lock_file(lock_file):
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+
+    def _unlock_file(lock_file):
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+else:
+    import fcntl
+
+    def _lock_file(lock_file):
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+    def _unlock_file(lock_file):
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+def write_config_changes(file_path: str, changes: dict[tuple[str, str], str]):
+    """
+    Writes some options to the configuration file atomically (temporary file plus rename),
+    holding the lock shared with the service (see `config_file_lock`).
+
+    The file is read again right before writing and only the given options are replaced, so the
+    options changed meanwhile by the service, or by another parser of the program, are not lost.
+    If the file cannot be read (missing, locked, unreadable or without sections), nothing is
+    written, since replacing it would drop every other option.
+
+    Args:
+        file_path (str): The path of the configuration file.
+        changes (dict[tuple[str, str], str]): The new value of each option, by section and option.
+
+    Raises:
+        OSError: If the file cannot be read or locked, or the write fails.
+        configparser.Error: If the file cannot be parsed.
+    """
+    with config_file_lock(file_path):
+        parser = configparser.ConfigParser()
+        if not parser.read(file_path) or not parser.sections():
+            raise OSError(errno.EIO, f"No se pudo leer el archivo de configuración, no se reemplaza: {file_path}")
+        for (section, option), value in changes.items():
+            if not parser.has_section(section):
+                parser.add_section(section)
+            parser.set(section, option, value)
+        temp_path = file_path + '.tmp'
+        with open(temp_path, 'w') as config_file:
+            parser.write(config_file)
+        os.replace(temp_path, file_path)
+
+class ConfigStore:
+    def __init__(self, file_path: str = None, delay: float = WRITE_DELAY):
+        """
+        Initializes the ConfigStore instance, which persists the changes to `config.ini`.
+
+        The changes are batched and written by a background thread once no change arrived for
+        `delay` seconds, e.g. while a spinbox is being stepped, and the file is rewritten
+        atomically with only the changed options (see `write_config_changes`).
+
+        Args:
+            file_path (str, optional): The configuration file. Defaults to `config.ini` in the
+                root directory, resolved on each write (see `config_file_path`).
+            delay (float, optional): The seconds without changes before they are written.
+                Defaults to `WRITE_DELAY`.
+        """
+        self.file_path: str = file_path
+        self.delay: float = delay
+        self.pending: dict[tuple[str, str], str] = {}
+        self.deadline: float = 0.0
+        self.writer = None
+        self.condition = native_threading.Condition()
+        # Held while writing, so a read never sees the file without the changes being written
+        self.write_lock = native_threading.Lock()
+        atexit.register(self.flush)
+
+    def get_file_path(self):
+        """
+        Returns the configuration file the changes are written to.
+
+        Returns:
+            (str): The path of the configuration file.
+        """
+        return self.file_path or config_file_path()
+
+    def set(self, section: str, option: str, value, parser: configparser.ConfigParser = None):
+        """
+        Changes an option and schedules its write.
+
+        Args:
+            section (str): The section of the option.
+            option (str): The option.
+            value (Any): The new value, stored as text.
+            parser (configparser.ConfigParser, optional): A parser of the program updated right away,
+                so it shows the new value before it is written. Defaults to None.
+        """
+        value = str(value)
+        if parser is not None:
+            if not parser.has_section(section):
+                parser.add_section(section)
+            parser.set(section, option, value)
+        with self.condition:
+            self.pending[(section, option)] = value
+            self.deadline = time.monotonic() + self.delay
+            if self.writer is None:
+                self.writer = start_native_thread(self.run, name="config_writer")
+            self.condition.notify()
+
+    def read(self, parser: configparser.ConfigParser):
+        """
+        Reads the configuration file into a parser, including the changes not written yet.
+
+        Args:
+            parser (configparser.ConfigParser): The parser to read into.
+
+        Returns:
+            (configparser.ConfigParser): The same parser.
+        """
+        with self.write_lock:
+            parser.read(self.get_file_path())
+            with self.condition:
+                pending = dict(self.pending)
+        for (section, option), value in pending.items():
+            if not parser.has_section(section):
+                parser.add_section(section)
+            parser.set(section, option, value)
+        return parser
+
+    def run(self):
+        """
+        Writes the pending changes once no change arrived for `delay` seconds, until there are none.
+        Runs in the background thread started by `set`.
+        """
+        while True:
+            with self.condition:
+                while self.pending and self.deadline > time.monotonic():
+                    self.condition.wait(self.deadline - time.monotonic())
+                if not self.pending:
+                    self.writer = None
+                    return
+            self.flush()
+
+    def flush(self):
+        """
+        Writes the pending changes right away, e.g. before an operation that reads the file
+        from disk, or when the program exits.
+
+        If the write fails (e.g. the file is locked by another process or could not be read, see
+        `write_config_changes`), the changes are kept pending, without replacing the values set meanwhile, and retried after `RETRY_DELAY`
+        seconds or on the next flush.
+
+        Returns:
+            (bool): True if there was nothing to write or the changes were written, False otherwise.
+        """
+        with self.write_lock:
+            with self.condition:
+                changes, self.pending = self.pending, {}
+            if not changes:
+                return True
+            try:
+                write_config_changes(self.get_file_path(), changes)
+                return True
+            except Exception as e:
+                BaseError(3001, f"No se pudo guardar la configuración: {str(e)}")
+                with self.condition:
+                    for key, value in changes.items():
+                        # A value set while writing is newer than the one that failed
+                        self.pending.setdefault(key, value)
+                    self.deadline = max(self.deadline, time.monotonic() + RETRY_DELAY)
+                    if self.writer is None:
+                        self.writer = start_native_thread(self.run, name="config_writer")
+                    self.condition.notify()
+                return False
+
+config_store = ConfigStore()
+
+def set_config_value(section: str, option: str, value, parser: configparser.ConfigParser = None):
+    """
+    Changes an option of `config.ini`, written in the background (see `ConfigStore.set`).
+
+    Args:
+        section (str): The section of the option.
+        option (str): The option.
+        value (Any): The new value, stored as text.
+        parser (configparser.ConfigParser, optional): A parser of the program updated right away. Defaults to None.
+    """
+    config_store.set(section, option, value, parser)
+
+def read_config(parser: configparser.ConfigParser):
+    """
+    Reads `config.ini` into a parser, including the changes not written yet (see `ConfigStore.read`).
+
+    Args:
+        parser (configparser.ConfigParser): The parser to read into.
+
+    Returns:
+        (configparser.ConfigParser): The same parser.
+    """
+    return config_store.read(parser)
+
+def flush_config():
+    """
+    Writes the pending changes to `config.ini` right away (see `ConfigStore.flush`).
+
+    Returns:
+        (bool): True if there was nothing to write or the changes were written, False otherwise.
+    """
+    return config_store.flush()
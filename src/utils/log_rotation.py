@@ -0,0 +1,357 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import gzip
+import logging
+import logging.handlers
+import os
+import re
+import shutil
+import time
+from datetime import datetime
+from src.common.utils.file_manager import find_root_directory
+from src.utils.threads import start_native_thread
+
+COMPRESSED_SUFFIX = ".gz"
+SIDECAR_SUFFIXES = (".idx", ".tri")  # Indexes of the log viewer (see `LogIndex` and `LogTextIndex`)
+MONTH_FOLDER_PATTERN = re.compile(r"^\d{4}-\d{2}$")  # logs/{año-mes}/
+SEGMENT_PATTERN = re.compile(r"\.\d+(\.gz)?$")  # {log}.{número}[.gz]
+CONSOLE_LOG_NAME = "console_log.txt"
+MIN_IDLE_SECONDS = 3600  # A log of a past month written more recently may still be open by a running process
+DEFAULT_MAX_SIZE_MB = 10
+DEFAULT_RETENTION_MONTHS = 12
+
+class LogRetentionPolicy:
+    def __init__(self, max_size_mb: float = DEFAULT_MAX_SIZE_MB, retention_months: int = DEFAULT_RETENTION_MONTHS,
+                 compress: bool = True):
+        """
+        Initializes the limits applied to the log files.
+
+        Args:
+            max_size_mb (float, optional): The size, in MB, at which a log file is rotated; 0 disables
+                rotation by size. Defaults to 10.
+            retention_months (int, optional): The number of months of logs kept, counting the current
+                one; 0 keeps every month. Defaults to 12.
+            compress (bool, optional): Whether rotated segments and the logs of past months are
+                compressed. Defaults to True.
+        """
+        self.max_bytes: int = int(max_size_mb * 1024 * 1024)
+        self.retention_months: int = retention_months
+        self.compress: bool = compress
+
+    @classmethod
+    def from_config(cls, config):
+        """
+        Reads the policy from the `Program_config` section of `config.ini`
+        (`log_max_size_mb`, `log_retention_months` and `log_compress`).
+
+        Args:
+            config (ConfigParser): The configuration already read from `config.ini`.
+
+        Returns:
+            (LogRetentionPolicy): The policy, with the defaults for missing parameters.
+        """
+        return cls(
+            config.getfloat('Program_config', 'log_max_size_mb', fallback=DEFAULT_MAX_SIZE_MB),
+            config.getint('Program_config', 'log_retention_months', fallback=DEFAULT_RETENTION_MONTHS),
+            config.getboolean('Program_config', 'log_compress', fallback=True)
+        )
+
+    def oldest_month(self, now: datetime = None):
+        """
+        Returns the oldest month kept by the policy.
+
+        Args:
+            now (datetime, optional): The reference date. Defaults to now.
+
+        Returns:
+            (str or None): The month (YYYY-MM), or None if every month is kept.
+        """
+        if self.retention_months <= 0:
+            return None
+        now = now or datetime.now()
+        months = now.year * 12 + now.month - 1 - (self.retention_months - 1)
+        return f"{months // 12:04d}-{months % 12 + 1:02d}"
+
+def segment_number(log_path: str, segment_path: str):
+    """
+    Returns the number of a rotated segment of a log file.
+
+    Args:
+        log_path (str): The path of the log file.
+        segment_path (str): The path of a file next to it.
+
+    Returns:
+        (int or None): The number of the segment, or None if the file is not a segment of the log.
+    """
+    name = os.path.basename(segment_path)
+    prefix = os.path.basename(log_path) + "."
+    if not name.startswith(prefix):
+        return None
+    number = name[len(prefix):]
+    if number.endswith(COMPRESSED_SUFFIX):
+        number = number[:-len(COMPRESSED_SUFFIX)]
+    return int(number) if number.isdigit() else None
+
+def segment_paths(log_path: str):
+    """
+    Returns the rotated segments of a log file, from the oldest to the newest.
+    Segments are numbered in the order they were rotated (`{log}.1.gz`, `{log}.2.gz`, ...),
+    so rotating never renames an existing segment, and the live log comes after all of them.
+
+    Args:
+        log_path (str): The path of the log file.
+
+    Returns:
+        (list[str]): The paths of the segments.
+    """
+    folder_path = os.path.dirname(log_path)
+    try:
+        names = os.listdir(folder_path)
+    except OSError:
+        return []
+    segments = []
+    for name in names:
+        path = os.path.join(folder_path, name)
+        number = segment_number(log_path, path)
+        if number is not None:
+            segments.append((number, path))
+    return [path for _, path in sorted(segments)]
+
+def remove_sidecars(log_path: str):
+    """
+    Removes the log viewer indexes of a log file, which no longer match it once it is rotated.
+
+    Args:
+        log_path (str): The path of the log file.
+    """
+    for suffix in SIDECAR_SUFFIXES:
+        try:
+            os.remove(log_path + suffix)
+        except FileNotFoundError:
+            pass
+
+def rotate_file(log_path: str, compress: bool = True):
+    """
+    Moves a log file to its next segment, compressing it if requested. The log is then
+    started again empty by its writer.
+
+    Args:
+        log_path (str): The path of the log file, which must not be open.
+        compress (bool, optional): Whether to compress the segment. Defaults to True.
+
+    Returns:
+        (str): The path of the new segment.
+    """
+    segments = segment_paths(log_path)
+    number = segment_number(log_path, segments[-1]) + 1 if segments else 1
+    segment_path = f"{log_path}.{number}"
+    os.replace(log_path, segment_path)
+    remove_sidecars(log_path)
+    if not compress:
+        return segment_path
+    # Compressed to a temporary file first, so a segment is never left half written
+    temp_path = segment_path + COMPRESSED_SUFFIX + ".tmp"
+    with open(segment_path, "rb") as source, gzip.open(temp_path, "wb") as target:
+        shutil.copyfileobj(source, target)
+    os.replace(temp_path, segment_path + COMPRESSED_SUFFIX)
+    os.remove(segment_path)
+    return segment_path + COMPRESSED_SUFFIX
+
+class SegmentRotationFilter(logging.Filter):
+    def __init__(self, handler: logging.FileHandler, max_bytes: int, compress: bool = True):
+        """
+        Initializes a filter that rotates the log of a file handler to a new numbered segment
+        (see `rotate_file`) once it reaches `max_bytes`, before the handler writes the next record.
+        It is added to the handler itself, so the handler keeps its class and whatever it adds to
+        `logging.FileHandler`; every record passes the filter.
+
+        Args:
+            handler (logging.FileHandler): The handler writing the log.
+            max_bytes (int): The size at which the log is rotated.
+            compress (bool, optional): Whether to compress the rotated segments. Defaults to True.
+        """
+        super().__init__()
+        self.handler: logging.FileHandler = handler
+        self.max_bytes: int = max_bytes
+        self.compress: bool = compress
+
+    def filter(self, record: logging.LogRecord):
+        with self.handler.lock:
+            stream = self.handler.stream
+            if stream is not None and stream.seek(0, os.SEEK_END) >= self.max_bytes:
+                self.rotate()
+        return True
+
+    def rotate(self):
+        """
+        Closes the log, moves it to its next segment and lets the handler open it again empty
+        on its next write (see `logging.FileHandler.emit`).
+        """
+        self.handler.stream.close()
+        self.handler.stream = None
+        try:
+            rotate_file(self.handler.baseFilename, self.compress)
+        except OSError as e:
+            # Another process may hold the file open; the log keeps growing until the next attempt
+            logging.getLogger(__name__).debug(f"No se pudo rotar el log {self.handler.baseFilename}: {e}")
+
+def config_log_rotation(config):
+    """
+    Adds a `SegmentRotationFilter` to each file handler of the root logger (configured by
+    `config_log`), so each log is rotated once it reaches `log_max_size_mb`. The handlers are kept
+    as they are, whatever `logging.FileHandler` subclass they are, except those that already rotate
+    their file (`logging.handlers.BaseRotatingHandler`). The JSON Lines sink is not a file handler;
+    it rotates its own file with the same policy (see `config_structured_log`). Call it before
+    `config_queue_logging`, which takes the root handlers as they are.
+
+    Args:
+        config (ConfigParser): The configuration already read from `config.ini`.
+
+    Returns:
+        (int): The number of handlers whose log is rotated.
+    """
+    policy = LogRetentionPolicy.from_config(config)
+    if policy.max_bytes <= 0:
+        return 0
+    rotated = 0
+    for handler in logging.getLogger().handlers:
+        if not isinstance(handler, logging.FileHandler) or isinstance(handler, logging.handlers.BaseRotatingHandler) \
+                or any(isinstance(log_filter, SegmentRotationFilter) for log_filter in handler.filters):
+            continue
+        handler.addFilter(SegmentRotationFilter(handler, policy.max_bytes, policy.compress))
+        rotated += 1
+    return rotated
+
+def handler_paths(handlers: list[logging.Handler]):
+    """
+    Returns the files written by a set of log handlers.
+
+    Args:
+        handlers (list[logging.Handler]): The handlers.
+
+    Returns:
+        (set[str]): The absolute paths of the files.
+    """
+    paths = set()
+    for handler in handlers:
+        file_path = getattr(handler, "baseFilename", None) or getattr(getattr(handler, "stream", None), "name", None)
+        if isinstance(file_path, str):
+            paths.add(os.path.normcase(os.path.abspath(file_path)))
+    return paths
+
+def compact_logs(logs_dir: str, policy: LogRetentionPolicy, now: datetime = None, open_paths: set[str] = None):
+    """
+    Applies the retention policy to the log folder:
+
+    - Removes the `{año-mes}` folders older than the retention period.
+    - Compresses the logs of past months as their last segment, unless they may still be written:
+      a process started in a past month (e.g. the service) keeps writing to that month's logs, so
+      the logs open in this process and those modified in the last `MIN_IDLE_SECONDS` are skipped.
+    - Removes the segments of `console_log.txt` older than the retention period.
+
+    Files that cannot be compressed or removed (e.g. still open by another process) are left as
+    they are until the next run.
+
+    Args:
+        logs_dir (str): The folder with the `{año-mes}` log folders.
+        policy (LogRetentionPolicy): The limits to apply.
+        now (datetime, optional): The reference date. Defaults to now.
+        open_paths (set[str], optional): The files written by the log handlers of this process,
+            as returned by `handler_paths`. Defaults to none.
+    """
+    if not os.path.isdir(logs_dir):
+        return
+    now = now or datetime.now()
+    current_month = now.strftime("%Y-%m")
+    oldest_month = policy.oldest_month(now)
+    for folder in sorted(os.listdir(logs_dir)):
+        folder_path = os.path.join(logs_dir, folder)
+        if not MONTH_FOLDER_PATTERN.match(folder) or not os.path.isdir(folder_path):
+            continue
+        if oldest_month and folder < oldest_month:
+            try:
+                shutil.rmtree(folder_path)
+                logging.info(f"Se eliminaron los logs de {folder}")
+            except OSError as e:
+                logging.warning(f"No se pudieron eliminar los logs de {folder}: {e}")
+        elif policy.compress and folder < current_month:
+            for name in os.listdir(folder_path):
+                file_path = os.path.join(folder_path, name)
+                if name.endswith(SIDECAR_SUFFIXES + (".tmp",)) or SEGMENT_PATTERN.search(name) \
+                        or not os.path.isfile(file_path) or os.path.getsize(file_path) == 0:
+                    continue
+                try:
+                    if os.path.normcase(os.path.abspath(file_path)) in (open_paths or ()) or \
+                            now.timestamp() - os.path.getmtime(file_path) < MIN_IDLE_SECONDS:
+                        logging.debug(f"Se omite comprimir el log {file_path}, que puede seguir abierto")
+                        continue
+                    rotate_file(file_path)
+                except OSError as e:
+                    logging.warning(f"No se pudo comprimir el log {file_path}: {e}")
+
+    if oldest_month:
+        console_log_path = os.path.join(logs_dir, CONSOLE_LOG_NAME)
+        for segment_path in segment_paths(console_log_path):
+            try:
+                if datetime.fromtimestamp(os.path.getmtime(segment_path)).strftime("%Y-%m") < oldest_month:
+                    os.remove(segment_path)
+            except OSError as e:
+                logging.warning(f"No se pudo eliminar el log {segment_path}: {e}")
+
+def rotate_console_log(config):
+    """
+    Rotates `console_log.txt` if it reached `log_max_size_mb`. Call it before the file is
+    opened for the standard output and error streams, which keep it open until the program exits.
+
+    Args:
+        config (ConfigParser): The configuration already read from `config.ini`.
+    """
+    policy = LogRetentionPolicy.from_config(config)
+    console_log_path = os.path.join(find_root_directory(), "logs", CONSOLE_LOG_NAME)
+    try:
+        if policy.max_bytes > 0 and os.path.getsize(console_log_path) >= policy.max_bytes:
+            rotate_file(console_log_path, policy.compress)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logging.warning(f"No se pudo rotar el log {console_log_path}: {e}")
+
+def start_log_compaction(config, handlers: list[logging.Handler] = None):
+    """
+    Applies the retention policy of `config.ini` to the log folder (see `compact_logs`)
+    in a background thread, since compressing the logs of a past month may take a while.
+
+    Args:
+        config (ConfigParser): The configuration already read from `config.ini`.
+        handlers (list[logging.Handler], optional): The handlers writing the logs of this process,
+            whose files are never compressed. Defaults to the handlers of the root logger.
+
+    Returns:
+        (Thread): The started thread.
+    """
+    policy = LogRetentionPolicy.from_config(config)
+    logs_dir = os.path.join(find_root_directory(), "logs")
+    open_paths = handler_paths(logging.getLogger().handlers if handlers is None else handlers)
+
+    def compact():
+        started_at = time.perf_counter()
+        compact_logs(logs_dir, policy, open_paths=open_paths)
+        logging.debug(f"Compactación de logs finalizada en {time.perf_counter() - started_at:.2f} s")
+
+    return start_native_thread(compact, name="log_compaction")
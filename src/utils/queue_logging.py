@@ -0,0 +1,168 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import atexit
+import copy
+import logging
+import logging.handlers
+from src.utils.threads import native_queue, native_threading, start_native_thread
+
+DEFAULT_QUEUE_SIZE = 10_000
+RESERVED_FRACTION = 0.1  # Part of the queue kept for warnings and errors when it is almost full
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    def __init__(self, log_queue, reserved: int):
+        """
+        Initializes a handler that only puts records in a bounded queue, without waiting for it.
+
+        The overflow policy favours the most important records: debug and info records are
+        discarded once the queue has less than `reserved` free places, which are kept for
+        warnings and errors; these are only discarded when the queue is full. The discarded
+        records are counted, and `QueueLogListener` logs how many were discarded.
+
+        Args:
+            log_queue (queue.Queue): The bounded queue drained by the listener.
+            reserved (int): The free places kept for records of level WARNING or higher.
+        """
+        super().__init__(log_queue)
+        self.reserved: int = reserved
+        self.dropped: int = 0
+        self.dropped_lock = native_threading.Lock()
+
+    def prepare(self, record: logging.LogRecord):
+        """
+        Prepares a record to be handled later by the listener thread.
+
+        The message is merged with its arguments, which could change before the record is written,
+        but unlike the base class the exception info is kept, so each handler formats it as usual.
+
+        Args:
+            record (logging.LogRecord): The record.
+
+        Returns:
+            (logging.LogRecord): A copy of the record, ready to be queued.
+        """
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        if record.levelno < logging.WARNING and self.queue.qsize() >= self.queue.maxsize - self.reserved:
+            self.count_dropped()
+            return
+        try:
+            self.queue.put_nowait(record)
+        except native_queue.Full:
+            self.count_dropped()
+
+    def count_dropped(self):
+        with self.dropped_lock:
+            self.dropped += 1
+
+    def take_dropped(self):
+        """
+        Returns the number of records discarded since the previous call.
+
+        Returns:
+            (int): The number of discarded records.
+        """
+        with self.dropped_lock:
+            dropped, self.dropped = self.dropped, 0
+        return dropped
+
+class QueueLogListener(logging.handlers.QueueListener):
+    def __init__(self, log_queue, queue_handler: BoundedQueueHandler, *handlers: logging.Handler):
+        """
+        Initializes the listener that writes the queued records with the original handlers.
+
+        Args:
+            log_queue (queue.Queue): The queue filled by `queue_handler`.
+            queue_handler (BoundedQueueHandler): The handler that fills the queue, to report the
+                records it discarded.
+            *handlers (logging.Handler): The handlers that write the records.
+        """
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.queue_handler: BoundedQueueHandler = queue_handler
+
+    def start(self):
+        # The writer must be an OS thread: a green thread would only run while its hub runs
+        self._thread = start_native_thread(self._monitor, name="log_writer")
+
+    def enqueue_sentinel(self):
+        # The queue may be full when stopping, so wait for the writer to make room
+        self.queue.put(self._sentinel)
+
+    def stop(self):
+        """
+        Writes the pending records and stops the writer thread. Does nothing if it is not running.
+        """
+        if self._thread is None:
+            return
+        super().stop()
+        self.report_dropped()
+
+    def handle(self, record: logging.LogRecord):
+        super().handle(record)
+        if self.queue.empty():
+            self.report_dropped()
+
+    def report_dropped(self):
+        """
+        Logs, through the original handlers, how many records were discarded since the previous report.
+        """
+        dropped = self.queue_handler.take_dropped()
+        if dropped:
+            super().handle(logging.makeLogRecord({
+                "name": "root",
+                "levelno": logging.WARNING,
+                "levelname": "WARNING",
+                "msg": f"Se descartaron {dropped} registros de log porque la cola de escritura estaba llena"
+            }))
+
+def config_queue_logging(config):
+    """
+    Moves the handlers of the root logger (configured by `config_log`) behind a bounded
+    in-memory queue, so that logging never waits for file writes: the calling threads only
+    enqueue the records, and a single writer thread (see `QueueLogListener`) writes them.
+    The pending records are written when the program exits.
+
+    The size of the queue is read from `log_queue_size` in the `Program_config` section of
+    `config.ini`; 0 keeps the handlers as they are.
+
+    Args:
+        config (ConfigParser): The configuration already read from `config.ini`.
+
+    Returns:
+        (QueueLogListener or None): The started listener, or None if the queue is disabled.
+    """
+    queue_size = config.getint('Program_config', 'log_queue_size', fallback=DEFAULT_QUEUE_SIZE)
+    root_logger = logging.getLogger()
+    handlers = list(root_logger.handlers)
+    if queue_size <= 0 or not handlers:
+        return None
+
+    log_queue = native_queue.Queue(maxsize=queue_size)
+    queue_handler = BoundedQueueHandler(log_queue, reserved=max(1, int(queue_size * RESERVED_FRACTION)))
+    listener = QueueLogListener(log_queue, queue_handler, *handlers)
+    for handler in handlers:
+        root_logger.removeHandler(handler)
+    root_logger.addHandler(queue_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
@@ -0,0 +1,162 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import json
+import logging
+import os
+import re
+import threading
+from datetime import datetime
+from src.common.utils.file_manager import find_root_directory
+from src.utils.log_rotation import LogRetentionPolicy, rotate_file
+
+CODE_PATTERN = re.compile(r"^\[(\d{4})\]\s*")  # Error code at the start of a `BaseError` message
+IP_PATTERN = re.compile(r"\b(\d{1,3}(?:\.\d{1,3}){3})\b")
+
+class JsonLinesHandler(logging.Handler):
+    def __init__(self, base_name: str, logs_dir: str = None, level: int = logging.DEBUG, max_bytes: int = 0,
+                 compress: bool = True):
+        """
+        Initializes a handler that writes each log record as one JSON object per line, in
+        `logs/{año-mes}/{base_name}.jsonl`, next to the text logs of the same month.
+
+        Each line holds typed fields, so consumers can filter without parsing the text format:
+        "timestamp" (ISO 8601), "level", "code" (int), "ip", "operation", "duration" (seconds),
+        "message", "source" and "thread". The code and IP are taken from the `extra` of the record
+        when given, otherwise from the message; "operation" and "duration" only from the `extra`.
+
+        Args:
+            base_name (str): The name of the log files, as passed to `config_log`.
+            logs_dir (str, optional): The folder with the `{año-mes}` log folders. Defaults to the
+                `logs` folder of the root directory.
+            level (int, optional): The minimum level of the records written. Defaults to DEBUG.
+            max_bytes (int, optional): The size at which the file is rotated to its next segment
+                (see `rotate_file`), as the text logs are; 0 disables rotation. Defaults to 0.
+            compress (bool, optional): Whether to compress the rotated segments. Defaults to True.
+        """
+        super().__init__(level)
+        self.base_name: str = base_name
+        self.logs_dir: str = logs_dir or os.path.join(find_root_directory(), "logs")
+        self.month: str = None
+        self.stream = None
+        self.stream_lock = threading.Lock()
+        self.max_bytes: int = max_bytes
+        self.compress: bool = compress
+
+    def open_month(self, month: str):
+        """
+        Opens the file of a month, closing the one of the previous month.
+
+        Args:
+            month (str): The month (YYYY-MM).
+        """
+        if self.stream is not None:
+            self.stream.close()
+        folder_path = os.path.join(self.logs_dir, month)
+        os.makedirs(folder_path, exist_ok=True)
+        self.stream = open(os.path.join(folder_path, f"{self.base_name}.jsonl"), "a", encoding="utf-8")
+        self.month = month
+
+    def rotate(self):
+        """
+        Moves the file of the current month to its next segment and opens it again empty.
+        """
+        file_path = self.stream.name
+        self.stream.close()
+        try:
+            rotate_file(file_path, self.compress)
+        except OSError:
+            pass  # Another process may hold the file open; it keeps growing until the next attempt
+        self.stream = open(file_path, "a", encoding="utf-8")
+
+    def to_dict(self, record: logging.LogRecord):
+        """
+        Builds the structured fields of a record.
+
+        Args:
+            record (logging.LogRecord): The record.
+
+        Returns:
+            (dict): The fields written as JSON.
+        """
+        message = record.getMessage()
+        code = getattr(record, "code", None)
+        match = CODE_PATTERN.match(message)
+        if match:
+            code = code or match.group(1)
+            message = message[match.end():]
+        ip = getattr(record, "ip", None)
+        if ip is None:
+            match = IP_PATTERN.search(message)
+            ip = match.group(1) if match else None
+        duration = getattr(record, "duration", None)
+        fields = {
+            "timestamp": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "code": int(code) if code is not None else None,
+            "ip": ip,
+            "operation": getattr(record, "operation", None),
+            "duration": round(duration, 3) if duration is not None else None,
+            "message": message,
+            "source": self.base_name,
+            "thread": record.threadName
+        }
+        if record.exc_info:
+            fields["exception"] = logging.Formatter().formatException(record.exc_info)
+        return fields
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            line = json.dumps(self.to_dict(record), ensure_ascii=False)
+            month = datetime.fromtimestamp(record.created).strftime("%Y-%m")
+            with self.stream_lock:
+                if month != self.month:
+                    self.open_month(month)
+                self.stream.write(line + "\n")
+                self.stream.flush()
+                if self.max_bytes > 0 and self.stream.tell() >= self.max_bytes:
+                    self.rotate()
+        except Exception:
+            self.handleError(record)
+
+    def close(self):
+        with self.stream_lock:
+            if self.stream is not None:
+                self.stream.close()
+                self.stream = None
+        super().close()
+
+def config_structured_log(base_name: str, config):
+    """
+    Adds the JSON Lines sink (see `JsonLinesHandler`) to the logging configured by `config_log`,
+    if `structured_log` is enabled in the `Program_config` section of `config.ini`. The sink is
+    rotated with the same policy as the text logs (see `LogRetentionPolicy`).
+
+    Args:
+        base_name (str): The name of the log files, as passed to `config_log`.
+        config (ConfigParser): The configuration already read from `config.ini`.
+
+    Returns:
+        (JsonLinesHandler or None): The added handler, or None if the sink is disabled.
+    """
+    if not config.getboolean('Program_config', 'structured_log', fallback=False):
+        return None
+    policy = LogRetentionPolicy.from_config(config)
+    handler = JsonLinesHandler(base_name, max_bytes=policy.max_bytes, compress=policy.compress)
+    logging.getLogger().addHandler(handler)
+    return handler
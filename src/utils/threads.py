@@ -0,0 +1,49 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+import queue
+import threading
+from typing import Callable
+
+try:
+    # eventlet.monkey_patch() turns threading.Thread into a green thread bound to
+    # the hub of the OS thread that spawned it, which stops running as soon as
+    # that thread (e.g. a finished QThread) returns. Background jobs need a real
+    # OS thread, so fetch the unpatched module when eventlet is available.
+    from eventlet.patcher import original
+    native_threading = original('threading')
+    native_queue = original('queue')
+except ImportError:
+    native_threading = threading
+    native_queue = queue
+
+def start_native_thread(target: Callable, name: str = None, args: tuple = ()):
+    """
+    Starts a daemon OS thread that is not affected by eventlet monkey patching.
+
+    Args:
+        target (Callable): The function to run in the new thread.
+        name (str, optional): The name of the thread, used in logs. Defaults to None.
+        args (tuple, optional): Positional arguments passed to `target`. Defaults to ().
+
+    Returns:
+        (Thread): The started thread.
+    """
+    thread = native_threading.Thread(target=target, name=name, args=args, daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,68 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+from datetime import datetime, timedelta
+from src.business_logic.attendance_batch import AttendanceBatch
+from src.business_logic.cro_parser import parse_lines
+
+NOW = datetime(2024, 3, 5, 12, 0)
+
+class Attendance:
+    def __init__(self, user_id, timestamp, status=1, punch=0):
+        self.user_id = user_id
+        self.timestamp = timestamp
+        self.status = status
+        self.punch = punch
+
+def make_batch():
+    return AttendanceBatch.from_attendances([
+        Attendance("0042", datetime(2024, 3, 5, 8, 15, 30)),
+        Attendance("0042", datetime(2024, 3, 5, 8, 15, 30)),
+        Attendance("A7", datetime(2024, 3, 5, 9, 0), 4, 1),
+        Attendance("7", NOW + timedelta(days=1)),
+        Attendance(None, datetime(2024, 3, 5, 10, 0)),
+        Attendance("7", "sin fecha")
+    ])
+
+def test_records_keep_their_user_ids_and_timestamps():
+    batch = make_batch()
+    assert len(batch) == 6
+    assert batch.user_ids == ["0042", "A7", "7"]
+    assert [batch.user_id_at(index) for index in range(len(batch))] == ["0042", "0042", "A7", "7", None, "7"]
+    assert batch.timestamp_at(0) == datetime(2024, 3, 5, 8, 15, 30)
+    assert batch.timestamp_at(5) is None
+
+def test_partition_leaves_out_repeated_records():
+    valid_indexes, error_indexes = make_batch().partition(NOW)
+    assert valid_indexes == [0, 2]
+    assert error_indexes == [3, 4, 5]
+
+def test_lines_round_trip_through_parse_lines():
+    batch = make_batch()
+    lines = list(batch.iter_lines([0, 2]))
+    assert lines == ["0042 05/03/2024 08:15 1 0\n", "A7 05/03/2024 09:00 4 1\n"]
+    records = parse_lines(lines)
+    assert records.user_ids == ["0042", "A7"]
+    assert records.extras == ["1 0", "4 1"]
+
+def test_select_shares_the_user_ids():
+    batch = make_batch()
+    selected = batch.select([2, 0])
+    assert selected.user_ids is batch.user_ids
+    assert list(selected.iter_lines()) == list(batch.iter_lines([2, 0]))
@@ -0,0 +1,70 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import json
+import os
+import time
+from datetime import date, datetime, timedelta
+from src.business_logic.attendance_count_store import MAX_CHECKED_DAYS, AttendanceCountStore
+
+IP = "10.0.0.1"
+
+def touch(folder, day: date, mtime: float):
+    file_path = os.path.join(folder, f"{IP}_{day:%Y-%m-%d}_file.cro")
+    with open(file_path, "a"):
+        pass
+    os.utime(file_path, (mtime, mtime))
+
+def test_count_is_trusted_while_no_file_was_written_since(tmp_path):
+    today = date.today()
+    recorded_at = time.time() - 3600
+    touch(str(tmp_path), today, recorded_at - 60)
+    entry = {"count": 10, "time": recorded_at, "folder": str(tmp_path)}
+    assert AttendanceCountStore.is_unchanged_since(IP, entry, today)
+
+    touch(str(tmp_path), today, recorded_at + 60)
+    assert not AttendanceCountStore.is_unchanged_since(IP, entry, today)
+
+def test_files_of_the_following_days_are_checked(tmp_path):
+    recorded_at = datetime.now() - timedelta(days=2)
+    entry = {"count": 10, "time": recorded_at.timestamp(), "folder": str(tmp_path)}
+    assert AttendanceCountStore.is_unchanged_since(IP, entry, date.today())
+    touch(str(tmp_path), date.today() - timedelta(days=1), time.time())
+    assert not AttendanceCountStore.is_unchanged_since(IP, entry, date.today())
+
+def test_count_without_folder_or_too_old_is_not_trusted(tmp_path):
+    today = date.today()
+    assert not AttendanceCountStore.is_unchanged_since(IP, {"count": 10, "time": time.time(), "folder": None}, today)
+    assert not AttendanceCountStore.is_unchanged_since(IP, {"count": 10, "time": 0.0, "folder": str(tmp_path)}, today)
+    old = (datetime.now() - timedelta(days=MAX_CHECKED_DAYS + 1)).timestamp()
+    assert not AttendanceCountStore.is_unchanged_since(IP, {"count": 10, "time": old, "folder": str(tmp_path)}, today)
+
+def test_forget_changed_elsewhere_keeps_only_trusted_counts(tmp_path):
+    store_path = tmp_path / "attendance_counts.json"
+    store_path.write_text(json.dumps({"10.0.0.9": 4}))  # Written by an older version
+    store = AttendanceCountStore(str(store_path))
+    assert store.get("10.0.0.9") == 4
+    store.set(IP, 10, str(tmp_path))
+    store.forget_changed_elsewhere()
+    assert store.get(IP) == 10
+    assert store.get("10.0.0.9") is None
+
+    touch(str(tmp_path), date.today(), time.time() + 60)
+    store.forget_changed_elsewhere()
+    assert store.get(IP) is None
@@ -0,0 +1,79 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import csv
+import io
+import json
+import os
+from datetime import date
+from src.business_logic.attendance_export import EXPORT_FIELDS, AttendanceExporter
+
+FILES = {
+    ("Norte", "MB360-Entrada", "10.0.0.1", "2024-03-05"): "1 05/03/2024 08:15 1 0\nroto\n2 05/03/2024 17:30 1 1\n",
+    ("Norte", "MB360-Entrada", "10.0.0.1", "2024-03-06"): "1 06/03/2024 08:10 1 0\n",
+    ("Norte", "K40-Salida", "10.0.0.2", "2024-03-05"): "3 05/03/2024 09:00 1 0\n",
+    ("Sur", "MB360-Entrada", "10.0.0.3", "2024-03-05"): "4 05/03/2024 10:00\n"
+}
+
+def make_devices(tmp_path):
+    devices_path = tmp_path / "devices"
+    for (district, device_folder, ip, file_date), content in FILES.items():
+        folder_path = devices_path / district / device_folder
+        folder_path.mkdir(parents=True, exist_ok=True)
+        (folder_path / f"{ip}_{file_date}_file.cro").write_text(content, encoding="utf-8")
+    (devices_path / "Norte" / "MB360-Entrada" / "notas.txt").write_text("1 05/03/2024 08:15\n")
+    return str(devices_path)
+
+def test_iter_records_reads_every_file_in_order(tmp_path):
+    exporter = AttendanceExporter(make_devices(tmp_path))
+    records = list(exporter.iter_records())
+    assert [(record["district"], record["model"], record["point"], record["ip"], record["user_id"], record["timestamp"])
+            for record in records] == [
+        ("Norte", "K40", "Salida", "10.0.0.2", "3", "2024-03-05T09:00"),
+        ("Norte", "MB360", "Entrada", "10.0.0.1", "1", "2024-03-05T08:15"),
+        ("Norte", "MB360", "Entrada", "10.0.0.1", "2", "2024-03-05T17:30"),
+        ("Norte", "MB360", "Entrada", "10.0.0.1", "1", "2024-03-06T08:10"),
+        ("Sur", "MB360", "Entrada", "10.0.0.3", "4", "2024-03-05T10:00")
+    ]
+    assert records[2]["extra"] == "1 1" and records[4]["extra"] == ""
+    assert exporter.skipped_lines == 1
+
+def test_filters_select_files_by_name(tmp_path):
+    exporter = AttendanceExporter(make_devices(tmp_path))
+    files = list(exporter.iter_files(start_date=date(2024, 3, 6), end_date=date(2024, 3, 6)))
+    assert [(district, ip, file_date) for district, _, _, ip, file_date, _ in files] == [("Norte", "10.0.0.1", "2024-03-06")]
+    assert os.path.isfile(files[0][5])
+
+    records = list(exporter.iter_records(districts=["sur"]))
+    assert [record["ip"] for record in records] == ["10.0.0.3"]
+    records = list(exporter.iter_records(ips=["10.0.0.2"]))
+    assert [record["user_id"] for record in records] == ["3"]
+
+def test_export_writes_csv_and_json_lines(tmp_path):
+    exporter = AttendanceExporter(make_devices(tmp_path))
+    output = io.StringIO()
+    assert exporter.export(output, "csv", districts=["Norte"]) == 4
+    rows = list(csv.DictReader(io.StringIO(output.getvalue())))
+    assert list(rows[0]) == EXPORT_FIELDS and len(rows) == 4
+
+    output = io.StringIO()
+    assert exporter.export(output, "jsonl", end_date=date(2024, 3, 5)) == 4
+    assert [json.loads(line)["timestamp"] for line in output.getvalue().splitlines()] == [
+        "2024-03-05T09:00", "2024-03-05T08:15", "2024-03-05T17:30", "2024-03-05T10:00"
+    ]
@@ -0,0 +1,68 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+from datetime import datetime, timedelta
+import pytest
+from src.business_logic.attendance_validator import (DUPLICATE, FUTURE, MALFORMED, MISSING_USER_ID, OUT_OF_RANGE, VALID,
+                                                     classify, columns_from_attendances, encode_user_ids, partition,
+                                                     to_epoch_seconds)
+
+NOW = datetime(2024, 3, 5, 12, 0)
+
+class Attendance:
+    def __init__(self, user_id, timestamp):
+        self.user_id = user_id
+        self.timestamp = timestamp
+
+def test_encode_user_ids_compares_them_as_written():
+    assert list(encode_user_ids(["0123", "123", "A7", " 123 ", "", None, "0123"])) == [0, 1, 2, 1, MISSING_USER_ID, MISSING_USER_ID, 0]
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_classify_reports_the_first_reason_of_each_record(use_numpy):
+    attendances = [
+        Attendance("1", NOW - timedelta(hours=1)),
+        Attendance("1", NOW - timedelta(hours=1)),
+        Attendance("01", NOW - timedelta(hours=1)),
+        Attendance("2", NOW - timedelta(days=100)),
+        Attendance("2", NOW + timedelta(minutes=5)),
+        Attendance("", NOW - timedelta(hours=1)),
+        Attendance("3", "05/03/2024"),
+        Attendance("4", NOW - timedelta(days=100)),
+        Attendance("4", NOW - timedelta(days=100))
+    ]
+    timestamps, user_ids = columns_from_attendances(attendances)
+    assert list(classify(timestamps, user_ids, NOW, use_numpy=use_numpy)) == [
+        VALID, DUPLICATE, VALID, OUT_OF_RANGE, FUTURE, MALFORMED, MALFORMED, OUT_OF_RANGE, OUT_OF_RANGE
+    ]
+
+def test_numpy_and_pure_classification_agree():
+    timestamps = [to_epoch_seconds(NOW - timedelta(minutes=minutes * 37)) for minutes in range(-50, 5000)]
+    user_ids = [index % 7 for index in range(len(timestamps))]
+    timestamps += timestamps[:300]
+    user_ids += user_ids[:300]
+    assert classify(timestamps, user_ids, NOW, use_numpy=True) == classify(timestamps, user_ids, NOW, use_numpy=False)
+
+def test_classify_rejects_columns_of_different_lengths():
+    with pytest.raises(ValueError):
+        classify([0, 1], [0], NOW)
+
+def test_partition():
+    valid_indexes, errors = partition([VALID, FUTURE, VALID, DUPLICATE])
+    assert valid_indexes == [0, 2]
+    assert errors == {1: "future", 3: "duplicate"}
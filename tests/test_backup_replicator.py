@@ -0,0 +1,79 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import os
+from datetime import date, timedelta
+from src.business_logic.backup_replicator import BackupReplicator
+
+TODAY = date.today()
+
+def write(file_path, content: str, mode: str = "w"):
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    with open(file_path, mode) as file:
+        file.write(content)
+
+def read(file_path):
+    with open(file_path) as file:
+        return file.read()
+
+def test_replicate_copies_only_changed_files(tmp_path):
+    source_dir, backup_dir = str(tmp_path / "devices"), str(tmp_path / "backup")
+    today_file = os.path.join(source_dir, "Norte", "MB360-Entrada", f"10.0.0.1_{TODAY}_file.cro")
+    past_file = os.path.join(source_dir, "Norte", "MB360-Entrada", f"10.0.0.1_{TODAY - timedelta(days=1)}_file.cro")
+    write(today_file, "1 05/03/2024 08:15 1 0\n")
+    write(past_file, "2 04/03/2024 08:15 1 0\n")
+    replicator = BackupReplicator(source_dir, backup_dir)
+
+    assert replicator.replicate() == 2
+    assert replicator.replicate() == 0
+
+    # Today's file is appended by the next download and copied again
+    write(today_file, "3 05/03/2024 09:00 1 0\n", mode="a")
+    assert replicator.replicate() == 1
+    assert read(today_file.replace(source_dir, backup_dir)) == read(today_file)
+    assert read(past_file.replace(source_dir, backup_dir)) == read(past_file)
+
+def test_full_verification_repairs_the_backup(tmp_path):
+    source_dir, backup_dir = str(tmp_path / "devices"), str(tmp_path / "backup")
+    source_file = os.path.join(source_dir, "Norte", "MB360-Entrada", f"10.0.0.1_{TODAY - timedelta(days=3)}_file.cro")
+    write(source_file, "1 05/03/2024 08:15 1 0\n")
+    replicator = BackupReplicator(source_dir, backup_dir)
+    replicator.replicate()
+
+    backup_file = source_file.replace(source_dir, backup_dir)
+    write(backup_file, "9 05/03/2024 08:15 1 0\n")  # Same size, so only a full verification notices it
+    assert replicator.replicate() == 0
+    assert replicator.replicate(verify_all=True) == 1
+    assert read(backup_file) == read(source_file)
+
+def test_only_attendance_files_of_past_days_are_not_appended():
+    today = str(TODAY)
+    assert BackupReplicator.is_appended(f"Norte/MB360-Entrada/10.0.0.1_{today}_file.cro", today) is True
+    assert BackupReplicator.is_appended("Norte/MB360-Entrada/10.0.0.1_2000-01-01_file.cro", today) is False
+    assert BackupReplicator.is_appended("Norte/notas.txt", today) is None
+
+def test_hardlinked_past_files_share_the_source(tmp_path):
+    source_dir, backup_dir = str(tmp_path / "devices"), str(tmp_path / "backup")
+    past_file = os.path.join(source_dir, "Norte", "MB360-Entrada", "10.0.0.1_2000-01-01_file.cro")
+    today_file = os.path.join(source_dir, "Norte", "MB360-Entrada", f"10.0.0.1_{TODAY}_file.cro")
+    write(past_file, "1 01/01/2000 08:15 1 0\n")
+    write(today_file, "1 05/03/2024 08:15 1 0\n")
+    BackupReplicator(source_dir, backup_dir, use_hardlinks=True).replicate()
+    assert os.path.samefile(past_file, past_file.replace(source_dir, backup_dir))
+    assert not os.path.samefile(today_file, today_file.replace(source_dir, backup_dir))
@@ -0,0 +1,77 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import configparser
+import pytest
+from src.utils.config_store import ConfigStore, config_file_lock, write_config_changes
+
+CONFIG = "[Program_config]\nlog_queue_size = 1000\n\n[Network_config]\nretry_connection = 3\n"
+
+def read_options(file_path):
+    parser = configparser.ConfigParser()
+    parser.read(file_path)
+    return {section: dict(parser.items(section)) for section in parser.sections()}
+
+def test_write_config_changes_keeps_the_other_options(tmp_path):
+    file_path = tmp_path / "config.ini"
+    file_path.write_text(CONFIG)
+    write_config_changes(str(file_path), {("Network_config", "retry_connection"): "5", ("Cpu_config", "max_workers"): "4"})
+    assert read_options(str(file_path)) == {
+        "Program_config": {"log_queue_size": "1000"},
+        "Network_config": {"retry_connection": "5"},
+        "Cpu_config": {"max_workers": "4"}
+    }
+
+@pytest.mark.parametrize("content", [None, "", "; sin secciones\n"])
+def test_write_config_changes_refuses_a_file_it_cannot_read(tmp_path, content):
+    file_path = tmp_path / "config.ini"
+    if content is not None:
+        file_path.write_text(content)
+    with pytest.raises(OSError):
+        write_config_changes(str(file_path), {("Network_config", "retry_connection"): "5"})
+    if content is None:
+        assert not file_path.exists()
+    else:
+        assert file_path.read_text() == content
+
+def test_config_file_lock_waits_for_the_holder(tmp_path):
+    file_path = str(tmp_path / "config.ini")
+    with config_file_lock(file_path):
+        with pytest.raises(OSError):
+            with config_file_lock(file_path, timeout=0.1):
+                pass
+    with config_file_lock(file_path, timeout=0.1):
+        pass
+
+def test_failed_flush_keeps_the_changes_pending(tmp_path):
+    file_path = tmp_path / "config.ini"
+    store = ConfigStore(str(file_path), delay=60)
+    parser = configparser.ConfigParser()
+    store.set("Network_config", "retry_connection", 5, parser)
+    assert parser.get("Network_config", "retry_connection") == "5"
+
+    assert not store.flush()  # The file is missing, so it is not replaced
+    assert not file_path.exists()
+    assert store.pending == {("Network_config", "retry_connection"): "5"}
+
+    file_path.write_text(CONFIG)
+    assert store.flush()
+    assert store.pending == {}
+    assert read_options(str(file_path))["Network_config"] == {"retry_connection": "5"}
+    assert store.read(configparser.ConfigParser()).get("Program_config", "log_queue_size") == "1000"
@@ -0,0 +1,66 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+from datetime import datetime
+from src.business_logic.cro_parser import (format_line, format_timestamp, from_datetime, iter_file_records,
+                                           parse_file_name, parse_lines, to_datetime)
+
+def test_format_line_round_trips_through_parse_lines():
+    lines = [
+        format_line("1234", datetime(2024, 3, 5, 8, 15), "1 0"),
+        format_line(7, datetime(1999, 12, 31, 23, 59)),
+        format_line("0042", from_datetime(datetime(2024, 2, 29, 0, 0)), "4 1")
+    ]
+    assert lines == ["1234 05/03/2024 08:15 1 0", "7 31/12/1999 23:59", "0042 29/02/2024 00:00 4 1"]
+
+    records = parse_lines(lines)
+    assert records.user_ids == ["1234", "7", "0042"]
+    assert records.extras == ["1 0", "", "4 1"]
+    assert [to_datetime(timestamp) for timestamp in records.timestamps] == [
+        datetime(2024, 3, 5, 8, 15), datetime(1999, 12, 31, 23, 59), datetime(2024, 2, 29, 0, 0)
+    ]
+    assert [format_line(user_id, timestamp, extra) for user_id, timestamp, extra
+            in zip(records.user_ids, records.timestamps, records.extras)] == lines
+
+def test_from_datetime_drops_seconds():
+    timestamp = datetime(2024, 3, 5, 8, 15, 42, 500)
+    assert from_datetime(timestamp) == from_datetime(datetime(2024, 3, 5, 8, 15))
+    assert format_timestamp(from_datetime(timestamp)) == "2024-03-05T08:15"
+
+def test_parse_lines_lists_malformed_lines():
+    records = parse_lines(["1 05/03/2024 08:15 1 0", "", "2 31/02/2024 08:15", "3 05/03/2024", "4 05/03/2024 25:00"], start=10)
+    assert len(records) == 1
+    assert list(records.line_indexes) == [10]
+    assert list(records.malformed) == [12, 13, 14]
+
+def test_iter_file_records_counts_lines_across_chunks(tmp_path):
+    file_path = tmp_path / "10.0.0.1_2024-03-05_file.cro"
+    lines = [format_line(str(user_id), datetime(2024, 3, 5, 8, user_id % 60), "1 0") for user_id in range(10)]
+    lines.insert(4, "roto")
+    file_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+    chunks = list(iter_file_records(str(file_path), chunk_lines=3))
+    assert len(chunks) == 4
+    assert [index for chunk in chunks for index in chunk.line_indexes] == [0, 1, 2, 3, 5, 6, 7, 8, 9, 10]
+    assert [index for chunk in chunks for index in chunk.malformed] == [4]
+    assert [user_id for chunk in chunks for user_id in chunk.user_ids] == [str(user_id) for user_id in range(10)]
+
+def test_parse_file_name():
+    assert parse_file_name("10.0.0.1_2024-03-05_file.cro") == ("10.0.0.1", "2024-03-05")
+    assert parse_file_name("10.0.0.1_2024-03-05_file.cro.tmp") is None
@@ -0,0 +1,101 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import os
+from src.business_logic.log_index import INDEX_SUFFIX, LogIndex
+
+def entry(second: int, code: int = 3001, message: str = "error"):
+    return f"2024-03-05 10:00:{second:02d},{second:03d} - ERROR - [{code}] - {message}\n"
+
+def write_log(log_path, text: str, mode: str = "a"):
+    with open(log_path, mode, encoding="utf-8") as file:
+        file.write(text)
+
+def test_update_indexes_only_the_appended_lines(tmp_path):
+    log_path = str(tmp_path / "programa_error.log")
+    write_log(log_path, entry(1) + "traceback line\n" + entry(2, 3000))
+    log_index = LogIndex(log_path, "programa")
+    assert log_index.update() == 2
+    assert list(log_index.codes) == [3001, 3000]
+    assert list(log_index.timestamps) == [20240305100001001, 20240305100002002]
+
+    write_log(log_path, entry(3) + entry(4)[:20])  # The last line is still being written
+    assert log_index.update() == 1
+    write_log(log_path, entry(4)[20:])
+    assert log_index.update() == 1
+    assert log_index.update() == 0
+    assert [line for _, line in log_index.read_lines(range(len(log_index)))] == [
+        entry(second, code).strip() for second, code in ((1, 3001), (2, 3000), (3, 3001), (4, 3001))
+    ]
+
+def test_index_is_reloaded_from_its_sidecar(tmp_path):
+    log_path = str(tmp_path / "programa_error.log")
+    write_log(log_path, entry(1) + entry(2))
+    LogIndex(log_path, "programa").update()
+    assert os.path.exists(log_path + INDEX_SUFFIX)
+
+    log_index = LogIndex(log_path, "programa")
+    assert len(log_index) == 2
+    write_log(log_path, entry(3))
+    assert log_index.update() == 1
+    assert log_index.find("2024-03-05", "2024-03-05", ["3001"], first=1) == [1, 2]
+
+def test_replaced_log_is_indexed_again(tmp_path):
+    log_path = str(tmp_path / "programa_error.log")
+    write_log(log_path, entry(1) + entry(2))
+    log_index = LogIndex(log_path, "programa")
+    log_index.update()
+    resets = log_index.resets
+
+    # Same size or larger, but another content at the indexed offsets
+    write_log(log_path, entry(5, message="otro") + entry(6, message="otro") + entry(7), mode="w")
+    assert log_index.update() == 3
+    assert log_index.resets == resets + 1
+    assert list(log_index.timestamps) == [20240305100005005, 20240305100006006, 20240305100007007]
+
+    # Shrunk
+    write_log(log_path, entry(8), mode="w")
+    assert log_index.update() == 1
+    assert log_index.resets == resets + 2
+
+def test_unchanged_log_is_not_indexed_again(tmp_path):
+    log_path = str(tmp_path / "programa_error.log")
+    write_log(log_path, entry(1))
+    log_index = LogIndex(log_path, "programa")
+    log_index.update()
+    resets = log_index.resets
+    write_log(log_path, entry(2))
+    assert log_index.update() == 1
+    assert log_index.resets == resets
+    assert log_index.last_entry_matches()
+
+def test_entry_whose_timestamp_does_not_start_its_line(tmp_path):
+    log_path = str(tmp_path / "programa_error.log")
+    write_log(log_path, entry(1) + "  ñandú " + entry(2) + entry(3))
+    log_index = LogIndex(log_path, "programa")
+    assert log_index.update() == 3
+    assert list(log_index.columns) == [0, 6, 0]
+
+    # The entry is not taken as replaced when the log grows
+    write_log(log_path, "prefijo " + entry(4))
+    resets = log_index.resets
+    assert log_index.update() == 1
+    assert log_index.resets == resets
+    assert log_index.last_entry_matches()
+    assert LogIndex(log_path, "programa").columns == log_index.columns
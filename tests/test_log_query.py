@@ -0,0 +1,126 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import io
+import os
+from datetime import datetime
+from src.business_logic import log_query
+from src.business_logic.log_query import MISSING_ENTRY, ErrorLogQuery, LogResults, error_log_files
+from src.utils.log_rotation import rotate_file
+
+class FixedDatetime(datetime):
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2024, 3, 5, 12, 0)
+
+def entry(index: int, prefix: str = ""):
+    return f"{prefix}2024-03-05 10:{index // 60:02d}:{index % 60:02d},000 - ERROR - [3001] - entrada {index}\n"
+
+def make_logs(tmp_path, entries: int = 300):
+    folder_path = tmp_path / "2024-03"
+    folder_path.mkdir()
+    log_paths = {}
+    for source, log_file in error_log_files().items():
+        log_paths[source] = str(folder_path / log_file)
+        with open(log_paths[source], "w", encoding="utf-8") as file:
+            file.writelines(entry(index, f"{source} " if index % 5 == 0 else "") for index in range(entries))
+    return ErrorLogQuery(str(tmp_path)), log_paths
+
+def query_results(query: ErrorLogQuery, cache_rows: int = 50):
+    results = LogResults(cache_rows)
+    for batch in query.iter_batches("2024-03-05", "2024-03-05"):
+        results.extend(batch)
+    return results
+
+def test_results_read_their_text_when_shown(tmp_path):
+    query, _ = make_logs(tmp_path)
+    expected = query.get_error_logs("2024-03-05", "2024-03-05")
+    results = query_results(query)
+    assert len(results) == len(expected) == 900
+    assert results.log_paths and len(results.sources) == 3
+    assert [results.entry_at(row) for row in range(len(results))] == expected
+    assert len(results.cache) <= 50
+    assert results.entry_at(0) == expected[0]
+
+    output = io.StringIO()
+    assert results.export(output) == 900
+    assert output.getvalue().splitlines() == expected
+    assert results.find_date("2024-03-05") == 0 and results.find_date("2024-03-06") == 900
+
+def test_results_follow_their_log_when_it_is_rotated(tmp_path):
+    query, log_paths = make_logs(tmp_path)
+    expected = query.get_error_logs("2024-03-05", "2024-03-05")
+    results = query_results(query)
+    rotate_file(log_paths["icono"])
+    with open(log_paths["icono"], "w", encoding="utf-8") as file:
+        file.write(entry(3000, "nuevo "))
+    os.remove(log_paths["servicio"])
+
+    entries = results.read_rows(0, len(results))
+    assert [text for text in entries if not text.startswith("servicio")] == \
+        [text for text in expected if not text.startswith("servicio")]
+    assert {text for text in entries if text.startswith("servicio")} == {f"servicio: {MISSING_ENTRY}"}
+
+def test_read_new_entries_continues_from_the_query(tmp_path):
+    month = datetime.now().strftime("%Y-%m")
+    day = datetime.now().strftime("%Y-%m-%d")
+    folder_path = tmp_path / month
+    folder_path.mkdir()
+    log_path = str(folder_path / error_log_files()["programa"])
+
+    def append(first: int, last: int):
+        with open(log_path, "a", encoding="utf-8") as file:
+            file.writelines(f"{day} 10:00:{index:02d},000 - ERROR - [3001] - entrada {index}\n" for index in range(first, last))
+
+    append(0, 3)
+    query = ErrorLogQuery(str(tmp_path))
+    since = {}
+    assert len([entry for batch in query.iter_batches(day, day, snapshot=since) for entry in batch]) == 3
+    assert query.read_new_entries(since, day, day) == []
+
+    append(3, 5)
+    assert [text for _, _, _, text in query.read_new_entries(since, day, day)] == [
+        f"programa: {day} 10:00:03,000 - ERROR - [3001] - entrada 3",
+        f"programa: {day} 10:00:04,000 - ERROR - [3001] - entrada 4"
+    ]
+
+    # Entries written right before a rotation are read from the new segment
+    append(5, 6)
+    rotate_file(log_path)
+    append(6, 7)
+    assert [text.rsplit(" ", 1)[-1] for _, _, _, text in query.read_new_entries(since, day, day)] == ["5", "6"]
+    assert query.read_new_entries(since, day, day) == []
+
+def test_lines_are_read_without_holding_the_lock(tmp_path, monkeypatch):
+    query, _ = make_logs(tmp_path, entries=10)
+    since = {}
+    list(query.iter_batches("2024-03-05", "2024-03-05", snapshot=since))
+    for log_path in since:
+        since[log_path] = 0
+    read_while_locked = []
+    original_read_ranges = log_query.read_ranges
+
+    def read_ranges(log_path, ranges):
+        read_while_locked.append(query.lock.locked())
+        return original_read_ranges(log_path, ranges)
+
+    monkeypatch.setattr(log_query, "read_ranges", read_ranges)
+    monkeypatch.setattr(log_query, "datetime", FixedDatetime)  # The logs of make_logs are those of the current month
+    assert len(query.read_new_entries(since, "2024-03-05", "2024-03-05")) == 30
+    assert read_while_locked == [False, False, False]
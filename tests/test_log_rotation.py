@@ -0,0 +1,107 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import configparser
+import gzip
+import logging
+import os
+import time
+from datetime import datetime
+from src.utils.log_rotation import (LogRetentionPolicy, SegmentRotationFilter, compact_logs, config_log_rotation,
+                                    handler_paths, rotate_file, segment_paths)
+
+def test_rotate_file_numbers_segments_in_order(tmp_path):
+    log_path = str(tmp_path / "programa_error.log")
+    for content in ("uno\n", "dos\n", "tres\n"):
+        with open(log_path, "w") as file:
+            file.write(content)
+        open(log_path + ".idx", "wb").close()
+        rotate_file(log_path, compress=content != "dos\n")
+        assert not os.path.exists(log_path) and not os.path.exists(log_path + ".idx")
+
+    segments = segment_paths(log_path)
+    assert [os.path.basename(path) for path in segments] == [
+        "programa_error.log.1.gz", "programa_error.log.2", "programa_error.log.3.gz"
+    ]
+    with gzip.open(segments[0], "rt") as file:
+        assert file.read() == "uno\n"
+    with gzip.open(segments[2], "rt") as file:
+        assert file.read() == "tres\n"
+
+def test_segment_paths_ignores_other_files(tmp_path):
+    log_path = str(tmp_path / "programa_error.log")
+    for name in ("programa_error.log.10.gz", "programa_error.log.2", "programa_error.log.idx",
+                 "programa_error.log.1.gz.tmp", "otro_error.log.1.gz"):
+        open(tmp_path / name, "w").close()
+    assert [os.path.basename(path) for path in segment_paths(log_path)] == [
+        "programa_error.log.2", "programa_error.log.10.gz"
+    ]
+    assert segment_paths(str(tmp_path / "falta" / "programa_error.log")) == []
+
+def test_config_log_rotation_rotates_every_file_handler(tmp_path):
+    class MonthFileHandler(logging.FileHandler):
+        pass
+
+    root_logger = logging.getLogger()
+    handlers = [MonthFileHandler(str(tmp_path / "a_error.log")), logging.FileHandler(str(tmp_path / "b.log"), delay=True)]
+    previous_handlers, previous_level = root_logger.handlers[:], root_logger.level
+    root_logger.handlers = handlers
+    root_logger.setLevel(logging.INFO)
+    try:
+        config = configparser.ConfigParser()
+        config.read_dict({"Program_config": {"log_max_size_mb": "0.001", "log_compress": "False"}})
+        assert config_log_rotation(config) == 2
+        assert config_log_rotation(config) == 0  # Already rotated
+        for _ in range(60):
+            logging.info("x" * 40)
+    finally:
+        root_logger.handlers = previous_handlers
+        root_logger.setLevel(previous_level)
+        for handler in handlers:
+            handler.close()
+
+    assert type(handlers[0]) is MonthFileHandler
+    assert all(isinstance(handler.filters[0], SegmentRotationFilter) for handler in handlers)
+    for name in ("a_error.log", "b.log"):
+        segments = segment_paths(str(tmp_path / name))
+        assert len(segments) >= 2
+        # Rotated before the write that follows reaching the limit
+        max_bytes = LogRetentionPolicy.from_config(config).max_bytes
+        assert all(max_bytes <= os.path.getsize(path) < max_bytes + 100 for path in segments)
+
+def test_compact_logs_skips_logs_that_may_be_open(tmp_path):
+    now = datetime.now()
+    past_month = f"{now.year - 1}-{now.month:02d}"
+    folder_path = tmp_path / past_month
+    folder_path.mkdir()
+    for name in ("viejo.log", "abierto.log", "reciente.log"):
+        (folder_path / name).write_text("datos\n")
+        if name != "reciente.log":
+            os.utime(folder_path / name, (time.time() - 7200,) * 2)
+
+    open_handler = logging.FileHandler(str(folder_path / "abierto.log"), delay=True)
+    compact_logs(str(tmp_path), LogRetentionPolicy(retention_months=24), now, open_paths=handler_paths([open_handler]))
+    assert sorted(os.listdir(folder_path)) == ["abierto.log", "reciente.log", "viejo.log.1.gz"]
+
+def test_compact_logs_removes_months_out_of_retention(tmp_path):
+    now = datetime(2024, 3, 5)
+    for month in ("2023-02", "2023-04", "2024-03", "otra"):
+        (tmp_path / month).mkdir()
+    compact_logs(str(tmp_path), LogRetentionPolicy(retention_months=12), now)
+    assert sorted(os.listdir(tmp_path)) == ["2023-04", "2024-03", "otra"]
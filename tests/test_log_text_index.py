@@ -0,0 +1,88 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import os
+from src.business_logic.log_index import LogIndex
+from src.business_logic.log_query import ErrorLogQuery, error_log_files
+from src.business_logic.log_text_index import TEXT_INDEX_SUFFIX, LogTextIndex, search_phrase
+
+LINES = [
+    "2024-03-05 10:00:01,000 - ERROR - [3001] - No se pudo leer devices/Norte",
+    "2024-03-05 10:00:02,000 - ERROR - [2000] - 10.0.0.1 - Fallo de conexión",
+    "2024-03-05 10:00:03,000 - ERROR - [3001] - No se pudo guardar el índice"
+]
+
+def make_log(tmp_path, lines=LINES):
+    log_path = str(tmp_path / "programa_error.log")
+    with open(log_path, "w", encoding="utf-8") as file:
+        file.write("\n".join(lines) + "\n")
+    log_index = LogIndex(log_path, "programa")
+    log_index.update()
+    return log_index
+
+def matching(text_index: LogTextIndex, search_text: str):
+    phrase = search_phrase(search_text)
+    candidates = text_index.candidates(phrase)
+    positions = range(len(text_index.log_index)) if candidates is None else sorted(candidates)
+    return [position for position, line in text_index.log_index.read_lines(positions) if phrase in line.lower()]
+
+def test_candidates_narrow_the_search_to_the_entries_with_every_trigram(tmp_path):
+    text_index = LogTextIndex(make_log(tmp_path))
+    assert text_index.update() == 3
+    assert text_index.candidates("no se pudo") == {0, 2}
+    assert text_index.candidates("inexistente") == set()
+    assert text_index.candidates("no") is None
+    assert matching(text_index, "CONEXIÓN") == [1]
+    assert matching(text_index, "[3001]") == [0, 2]  # The code and date are searched too
+    assert matching(text_index, "10:00:03") == [2]
+
+def test_index_is_extended_and_reloaded(tmp_path):
+    log_index = make_log(tmp_path)
+    LogTextIndex(log_index).update()
+    assert os.path.exists(log_index.log_path + TEXT_INDEX_SUFFIX)
+
+    with open(log_index.log_path, "a", encoding="utf-8") as file:
+        file.write("2024-03-05 10:00:04,000 - ERROR - [3001] - Otra conexión\n")
+    log_index.update()
+    text_index = LogTextIndex(log_index)
+    assert text_index.indexed_entries == 3
+    assert text_index.update() == 1
+    assert matching(text_index, "conexión") == [1, 3]
+
+def test_index_of_a_replaced_log_is_built_again(tmp_path):
+    log_index = make_log(tmp_path)
+    text_index = LogTextIndex(log_index)
+    text_index.update()
+    with open(log_index.log_path, "w", encoding="utf-8") as file:
+        file.write("2024-03-06 09:00:00,000 - ERROR - [2000] - Reemplazado\n")
+    log_index.update()
+    assert text_index.is_outdated()
+    assert text_index.update() == 1
+    assert matching(text_index, "reemplazado") == [0]
+    assert matching(text_index, "no se pudo") == []
+
+def test_query_searches_the_whole_line(tmp_path):
+    folder_path = tmp_path / "2024-03"
+    folder_path.mkdir()
+    (folder_path / error_log_files()["programa"]).write_text("\n".join(LINES) + "\n", encoding="utf-8")
+    query = ErrorLogQuery(str(tmp_path))
+    assert query.get_error_logs("2024-03-05", "2024-03-05", search_text="Fallo de CONEXIÓN") == ["programa: " + LINES[1]]
+    assert query.get_error_logs("2024-03-05", "2024-03-05", search_text="- [3001] - no se") == \
+        ["programa: " + LINES[0], "programa: " + LINES[2]]
+    assert query.get_error_logs("2024-03-05", "2024-03-05", selected_errors={"2000"}, search_text="no se") == []
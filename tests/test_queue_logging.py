@@ -0,0 +1,74 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import logging
+import sys
+from src.utils.queue_logging import BoundedQueueHandler, QueueLogListener
+from src.utils.threads import native_queue
+
+def make_record(level: int, msg: str = "mensaje %s", args=("uno",)):
+    return logging.makeLogRecord({"levelno": level, "levelname": logging.getLevelName(level), "msg": msg, "args": args})
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+def test_full_queue_keeps_room_for_warnings():
+    log_queue = native_queue.Queue(maxsize=10)
+    handler = BoundedQueueHandler(log_queue, reserved=3)
+    for _ in range(10):
+        handler.handle(make_record(logging.INFO))
+    assert log_queue.qsize() == 7
+    assert handler.take_dropped() == 3
+
+    for _ in range(4):
+        handler.handle(make_record(logging.ERROR))
+    assert log_queue.qsize() == 10
+    assert handler.take_dropped() == 1
+    assert handler.take_dropped() == 0
+
+def test_records_are_queued_with_their_message_merged():
+    log_queue = native_queue.Queue(maxsize=10)
+    handler = BoundedQueueHandler(log_queue, reserved=1)
+    try:
+        raise ValueError("falla")
+    except ValueError:
+        record = make_record(logging.ERROR)
+        record.exc_info = sys.exc_info()
+    handler.handle(record)
+    queued = log_queue.get_nowait()
+    assert queued.msg == "mensaje uno" and queued.args is None
+    assert queued.exc_info is not None
+
+def test_listener_reports_the_dropped_records():
+    log_queue = native_queue.Queue(maxsize=4)
+    queue_handler = BoundedQueueHandler(log_queue, reserved=1)
+    target = ListHandler()
+    for _ in range(5):
+        queue_handler.handle(make_record(logging.DEBUG))
+    listener = QueueLogListener(log_queue, queue_handler, target)
+    listener.start()
+    listener.stop()
+    messages = [record.getMessage() for record in target.records]
+    assert messages[:3] == ["mensaje uno"] * 3
+    assert messages[3:] == ["Se descartaron 2 registros de log porque la cola de escritura estaba llena"]
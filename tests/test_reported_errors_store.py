@@ -0,0 +1,72 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import os
+from datetime import datetime
+from src.business_logic.reported_errors_store import (SECONDS_PER_DAY, ReportedErrorsStore, device_file_identity,
+                                                      format_error_line, format_file_uri)
+
+NOW = 1_700_000_000
+
+def test_line_read_and_downloaded_attendance_have_the_same_key(tmp_path):
+    devices_path = str(tmp_path / "devices")
+    identity = device_file_identity(devices_path, os.path.join(devices_path, "Norte", "MB360-Entrada", "10.0.0.1_2024-03-05_file.cro"))
+    assert identity == "Norte/MB360-Entrada/10.0.0.1"
+    assert identity == device_file_identity(devices_path, os.path.join(devices_path, "Norte", "MB360-Entrada", "10.0.0.1_2024-03-06_file.cro"))
+
+    downloaded = format_error_line("1234", datetime(2024, 3, 5, 8, 15, 30))
+    assert downloaded == "1234 05/03/2024 08:15"
+    assert ReportedErrorsStore.make_key(identity, "1234 05/03/2024 08:15 1 0\n") == ReportedErrorsStore.make_key(identity, downloaded)
+    assert ReportedErrorsStore.make_key(identity, downloaded) != ReportedErrorsStore.make_key("Sur/MB360-Entrada/10.0.0.1", downloaded)
+    assert format_error_line("1234", "sin fecha") == "1234 sin fecha"
+
+def test_store_is_persisted_and_reloaded(tmp_path):
+    file_path = str(tmp_path / "reported_attendance_errors.dat")
+    store = ReportedErrorsStore(file_path)
+    keys = [ReportedErrorsStore.make_key("Norte/MB360-Entrada/10.0.0.1", f"{user_id} 05/03/2024 08:15") for user_id in range(5)]
+    for key in keys:
+        store.add(key)
+    store.save()
+    assert os.path.getsize(file_path) == 5 * 12
+
+    reloaded = ReportedErrorsStore(file_path)
+    assert len(reloaded) == 5
+    assert all(key in reloaded for key in keys)
+
+def test_unreadable_tail_is_ignored(tmp_path):
+    file_path = tmp_path / "reported_attendance_errors.dat"
+    store = ReportedErrorsStore(str(file_path))
+    store.add(1)
+    store.save()
+    with open(file_path, "ab") as file:
+        file.write(b"\x01\x02\x03")  # Interrupted write
+    assert len(ReportedErrorsStore(str(file_path))) == 1
+
+def test_expire_drops_old_and_excess_errors(tmp_path):
+    store = ReportedErrorsStore(str(tmp_path / "reported_attendance_errors.dat"), max_entries=3, max_age_days=10)
+    store.add(1, NOW - 11 * SECONDS_PER_DAY)
+    for key in range(2, 7):
+        store.add(key, NOW - key)
+    store.add(2, NOW)  # Already reported, keeps its first time
+    store.expire(NOW)
+    assert sorted(store.entries) == [2, 3, 4]
+
+def test_format_file_uri():
+    assert format_file_uri("C:\\devices\\Norte Sur\\10.0.0.1_2024-03-05_file.cro") == \
+        "file:///C%3A/devices/Norte%20Sur/10.0.0.1_2024-03-05_file.cro"
@@ -0,0 +1,66 @@
+# PyZKTecoClocks: GUI for managing ZKTeco clocks, enabling clock 
+# time synchronization and attendance data retrieval.
+# Copyright (C) 2024  Paulo Sebastian Spaciuk (Darukio)
+#
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+
+
+import json
+import logging
+import sys
+from datetime import datetime
+from src.utils.log_rotation import segment_paths
+from src.utils.structured_log import JsonLinesHandler
+
+def make_record(msg: str, level: int = logging.ERROR, **extra):
+    record = logging.makeLogRecord({"msg": msg, "levelno": level, "levelname": logging.getLevelName(level), **extra})
+    record.created = datetime(2024, 3, 5, 10, 0, 1, 250000).timestamp()
+    return record
+
+def read_lines(file_path):
+    with open(file_path, encoding="utf-8") as file:
+        return [json.loads(line) for line in file]
+
+def test_fields_are_taken_from_the_extra_or_the_message(tmp_path):
+    handler = JsonLinesHandler("programa", logs_dir=str(tmp_path))
+    handler.handle(make_record("[2000] 10.0.0.1 - Fallo de conexión"))
+    handler.handle(make_record("Descarga finalizada", logging.INFO, ip="10.0.0.2", operation="obtain_attendances", duration=1.23456))
+    handler.close()
+
+    first, second = read_lines(tmp_path / "2024-03" / "programa.jsonl")
+    assert first["timestamp"] == "2024-03-05T10:00:01.250"
+    assert (first["level"], first["code"], first["ip"], first["message"]) == ("ERROR", 2000, "10.0.0.1", "10.0.0.1 - Fallo de conexión")
+    assert first["operation"] is None and first["duration"] is None and first["source"] == "programa"
+    assert (second["code"], second["ip"], second["operation"], second["duration"]) == (None, "10.0.0.2", "obtain_attendances", 1.235)
+
+def test_exception_is_written_with_the_record(tmp_path):
+    handler = JsonLinesHandler("programa", logs_dir=str(tmp_path))
+    try:
+        raise ValueError("falla")
+    except ValueError:
+        handler.handle(make_record("Error inesperado", exc_info=sys.exc_info()))
+    handler.close()
+    assert "ValueError: falla" in read_lines(tmp_path / "2024-03" / "programa.jsonl")[0]["exception"]
+
+def test_file_is_rotated_at_max_bytes(tmp_path):
+    handler = JsonLinesHandler("programa", logs_dir=str(tmp_path), max_bytes=1000, compress=False)
+    for index in range(30):
+        handler.handle(make_record(f"[3001] entrada {index}"))
+    handler.close()
+    file_path = str(tmp_path / "2024-03" / "programa.jsonl")
+    segments = segment_paths(file_path)
+    assert segments
+    messages = [entry["message"] for path in segments + [file_path] for entry in read_lines(path)]
+    assert messages == [f"entrada {index}" for index in range(30)]